@@ -0,0 +1,19 @@
+-- InsightOps anomaly events written by the fleet-wide sweep
+-- One row per (org, series, date, anomaly type); reruns update rows in place.
+
+CREATE TABLE IF NOT EXISTS io_anomaly_event (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    org_id TEXT NOT NULL,
+    series_kind TEXT NOT NULL,
+    series_key TEXT NOT NULL,
+    anomaly_date DATE NOT NULL,
+    anomaly_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    description TEXT NOT NULL,
+    sweep_id UUID NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_io_anomaly_event_point UNIQUE (org_id, series_kind, series_key, anomaly_date, anomaly_type)
+);
+
+CREATE INDEX IF NOT EXISTS ix_io_anomaly_event_anomaly_date ON io_anomaly_event (anomaly_date);
@@ -0,0 +1,9 @@
+-- InsightOps executive summary keyset index
+-- Summary history pages on (created_at, id) DESC per org/type; including id lets every page
+-- be a single index range scan. Supersedes ix_io_exec_summary_org_type_created.
+-- Uses CONCURRENTLY: run outside a transaction.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_io_exec_summary_org_type_created_id
+    ON io_exec_summary (org_id, summary_type, created_at, id);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_io_exec_summary_org_type_created;
@@ -0,0 +1,21 @@
+-- InsightOps composite series indexes
+-- Hot reads filter on (org_id, key, date range) and only return date + value; the INCLUDE
+-- column makes them index-only scans. CONCURRENTLY avoids blocking writes on large tables,
+-- so run this file outside a transaction (plain `psql -f`, not `psql -1`).
+-- Verify with src/optimization/index_advisor.py (reports any remaining sequential scans).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_io_kpi_daily_org_metric_date
+    ON io_kpi_daily (org_id, metric_key, kpi_date)
+    INCLUDE (metric_value);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_io_engagement_signal_daily_org_signal_date
+    ON io_engagement_signal_daily (org_id, signal_key, signal_date)
+    INCLUDE (signal_value);
+
+-- Exec summary lookups filter on org + summary_type and order by recency
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_io_exec_summary_org_type_created
+    ON io_exec_summary (org_id, summary_type, created_at);
+
+ANALYZE io_kpi_daily;
+ANALYZE io_engagement_signal_daily;
+ANALYZE io_exec_summary;
@@ -0,0 +1,30 @@
+-- InsightOps daily series rollups
+-- SQL-first migration for precomputed per-org/per-key aggregates used by summary endpoints.
+
+CREATE TABLE IF NOT EXISTS io_series_rollup_daily (
+    org_id TEXT NOT NULL,
+    series_kind TEXT NOT NULL,
+    series_key TEXT NOT NULL,
+    rollup_date DATE NOT NULL,
+    day_value NUMERIC(18, 4) NOT NULL,
+    ordinal INTEGER NOT NULL,
+    cum_value NUMERIC(24, 4) NOT NULL,
+    prev_date DATE,
+    prev_value NUMERIC(18, 4),
+    rolling_avg_7d NUMERIC(18, 4) NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (org_id, series_kind, series_key, rollup_date)
+);
+
+CREATE TABLE IF NOT EXISTS io_series_rollup_state (
+    org_id TEXT NOT NULL,
+    series_kind TEXT NOT NULL,
+    series_key TEXT NOT NULL,
+    source_watermark TIMESTAMPTZ,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (org_id, series_kind, series_key)
+);
+
+-- Incremental refresh scans raw rows past each series watermark
+CREATE INDEX IF NOT EXISTS idx_io_kpi_daily_updated_at ON io_kpi_daily (updated_at);
+CREATE INDEX IF NOT EXISTS idx_io_engagement_signal_daily_updated_at ON io_engagement_signal_daily (updated_at);
@@ -0,0 +1,12 @@
+-- InsightOps incremental series statistics
+-- SQL-first migration for per-org/per-key RunningStats state (the lookback window's points and their sum).
+
+CREATE TABLE IF NOT EXISTS io_series_stats_state (
+    org_id TEXT NOT NULL,
+    series_kind TEXT NOT NULL,
+    series_key TEXT NOT NULL,
+    stats_json JSONB NOT NULL,
+    last_date DATE,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (org_id, series_kind, series_key)
+);
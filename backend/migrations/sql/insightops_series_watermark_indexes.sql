@@ -0,0 +1,9 @@
+-- InsightOps per-series watermark indexes
+-- ETags on analytics endpoints validate against MAX(updated_at)/COUNT(*) per (org, key);
+-- these keep that check an index-only lookup. Uses CONCURRENTLY: run outside a transaction.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_io_kpi_daily_org_metric_updated
+    ON io_kpi_daily (org_id, metric_key, updated_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_io_engagement_signal_daily_org_signal_updated
+    ON io_engagement_signal_daily (org_id, signal_key, updated_at);
@@ -0,0 +1,91 @@
+-- Sales DATE column with monthly range partitions
+-- SQL-first migration: builds sales_partitioned (PARTITION BY RANGE (date)); scripts/backfill_sales_dates.py fills it in chunks and swaps it in as `sales`.
+
+-- Shared with the legacy table so ids stay unique across the swap.
+CREATE SEQUENCE IF NOT EXISTS sales_id_seq;
+
+-- Skipped once the backfill has swapped the partitioned table in as `sales`.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('sales')) THEN
+        RETURN;
+    END IF;
+
+    CREATE TABLE IF NOT EXISTS sales_partitioned (
+        id INTEGER NOT NULL DEFAULT nextval('sales_id_seq'),
+        product_id VARCHAR NOT NULL,
+        date DATE NOT NULL,
+        region VARCHAR,
+        units_sold INTEGER NOT NULL DEFAULT 0,
+        revenue DOUBLE PRECISION NOT NULL DEFAULT 0,
+        profit_margin DOUBLE PRECISION,
+        -- A partitioned table's primary key must include the partition key.
+        PRIMARY KEY (id, date)
+    ) PARTITION BY RANGE (date);
+
+    -- Catches rows for months without a partition yet; ensure_sales_partitions moves them out.
+    CREATE TABLE IF NOT EXISTS sales_default PARTITION OF sales_partitioned DEFAULT;
+
+    -- Created on the parent, so every monthly partition gets them.
+    CREATE INDEX IF NOT EXISTS idx_sales_part_date ON sales_partitioned (date);
+    CREATE INDEX IF NOT EXISTS idx_sales_part_product_date ON sales_partitioned (product_id, date);
+    CREATE INDEX IF NOT EXISTS idx_sales_part_region_date ON sales_partitioned (region, date);
+END;
+$$;
+
+-- Legacy `sales.date` is free text: NULL for anything that is not a valid YYYY-MM-DD prefix.
+CREATE OR REPLACE FUNCTION sales_try_date(value TEXT) RETURNS DATE
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    IF value IS NULL OR btrim(value) !~ '^\d{4}-\d{2}-\d{2}' THEN
+        RETURN NULL;
+    END IF;
+    RETURN substring(btrim(value) FROM 1 FOR 10)::date;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$;
+
+-- Creates the monthly partitions sales_yYYYYmMM of `parent` covering [from_month, to_month],
+-- moving any rows already parked in the default partition for those months.
+-- Returns the number of partitions created.
+CREATE OR REPLACE FUNCTION ensure_sales_partitions(parent TEXT, from_month DATE, to_month DATE)
+RETURNS INTEGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_month)::date;
+    last_month DATE := date_trunc('month', to_month)::date;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := format('sales_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format('CREATE TEMP TABLE IF NOT EXISTS sales_default_spill (LIKE %I) ON COMMIT DROP', parent);
+            WITH moved AS (
+                DELETE FROM sales_default
+                WHERE date >= month_start AND date < (month_start + INTERVAL '1 month')::date
+                RETURNING *
+            )
+            INSERT INTO sales_default_spill SELECT * FROM moved;
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, (month_start + INTERVAL '1 month')::date
+            );
+            EXECUTE format('INSERT INTO %I SELECT * FROM sales_default_spill', parent);
+            TRUNCATE sales_default_spill;
+            created := created + 1;
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+
+-- Keep a few months ahead of live inserts; re-run monthly (the backfill also calls this).
+SELECT ensure_sales_partitions(
+    CASE WHEN EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('sales'))
+        THEN 'sales' ELSE 'sales_partitioned' END,
+    date_trunc('month', CURRENT_DATE)::date,
+    (date_trunc('month', CURRENT_DATE) + INTERVAL '3 months')::date
+);
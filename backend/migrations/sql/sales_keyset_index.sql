@@ -0,0 +1,8 @@
+-- Sales keyset pagination index
+-- /sales, /api/sales and /api/sales/export page on (date, id); with id in the index every page
+-- is a single range scan. Supersedes idx_sales_part_date. Apply after
+-- scripts/backfill_sales_dates.py --swap, so the index is built on every monthly partition.
+
+CREATE INDEX IF NOT EXISTS idx_sales_date_id ON sales (date, id);
+
+DROP INDEX IF EXISTS idx_sales_part_date;
@@ -0,0 +1,19 @@
+-- Sales upsert ingest
+-- Conflict target and per-file manifest for POST /api/data/upload?upsert=natural|content.
+-- Apply after scripts/backfill_sales_dates.py --swap so the unique index is built on every
+-- monthly partition (Postgres requires the partition key, date, in it). Rows loaded any
+-- other way keep dedup_key NULL and never conflict.
+
+ALTER TABLE sales ADD COLUMN IF NOT EXISTS dedup_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_sales_dedup_key_date ON sales (dedup_key, date);
+
+-- One row per (file, dedup_key): the content hash last loaded for that key, replaced
+-- when the file brings different values.
+CREATE TABLE IF NOT EXISTS sales_ingest_manifest (
+    source TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    row_hash TEXT NOT NULL,
+    loaded_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (source, dedup_key)
+);
@@ -0,0 +1,61 @@
+"""
+Backfill sales into the monthly-partitioned DATE table (sales_partitioned).
+
+Copies rows in id-ordered chunks and resumes where the last run stopped. Run it until
+`remaining` is 0, then once more with --swap to take the final catch-up under a lock and
+rename the partitioned table to `sales` (the old table stays as `sales_legacy`).
+Apply migrations/sql/sales_date_partitioning.sql first.
+
+    python backend/scripts/backfill_sales_dates.py [--chunk-size 5000] [--max-chunks N]
+    python backend/scripts/backfill_sales_dates.py --swap [--allow-rejects]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.src.app.core import database
+from backend.src.app.services.sales_partitioning import (
+    DEFAULT_CHUNK_SIZE,
+    backfill_sales_dates,
+    swap_sales_tables,
+)
+
+
+async def main(chunk_size: int, max_chunks: int | None, swap: bool, allow_rejects: bool) -> int:
+    if database.AsyncSessionLocal is None:
+        print("DATABASE_URL not set; cannot backfill sales.")
+        return 1
+    async with database.AsyncSessionLocal() as session:
+        if swap:
+            try:
+                result = await swap_sales_tables(session, chunk_size=chunk_size, allow_rejects=allow_rejects)
+            except ValueError as exc:
+                print(f"Swap refused: {exc}")
+                return 2
+            copied = result["catch_up"]["copied"] + result["final"]["copied"]
+            print(f"Swapped sales_partitioned in as sales ({copied} rows caught up, {result['rejected']} rejects left in sales_legacy).")
+            return 0
+        counts = await backfill_sales_dates(session, chunk_size=chunk_size, max_chunks=max_chunks)
+    print(
+        f"Copied {counts['copied']} rows in {counts['chunks']} chunks through id {counts['last_id']} "
+        f"({counts['partitions_created']} partitions created, {counts['rejected']} rejects, "
+        f"~{counts['remaining']} ids remaining)."
+    )
+    if counts["reject_sample_ids"]:
+        print(f"Rejected ids (sample): {counts['reject_sample_ids']}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows copied per committed chunk")
+    parser.add_argument("--max-chunks", type=int, default=None, help="Stop after this many chunks")
+    parser.add_argument("--swap", action="store_true", help="Final catch-up and rename into place")
+    parser.add_argument("--allow-rejects", action="store_true", help="Swap even if some dates could not be parsed")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.chunk_size, args.max_chunks, args.swap, args.allow_rejects)))
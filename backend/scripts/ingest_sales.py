@@ -0,0 +1,54 @@
+"""
+Bulk-load a sales extract (.csv, .ndjson/.jsonl or .json) into the sales table.
+
+Streams the file in committed chunks (COPY on Postgres), the same path as
+`POST /api/data/upload?mode=stream`, so multi-GB extracts load without reading the
+whole file into memory.
+
+    python backend/scripts/ingest_sales.py extract.csv [--chunk-rows 50000] [--upsert natural|content]
+
+With --upsert, reruns of the same file only write rows that are new or changed
+(apply migrations/sql/sales_upsert_ingest.sql first).
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.src.app.core import database
+from backend.src.app.services.sales_ingest import SALES_INGEST_CHUNK_ROWS, UPSERT_KEYS, ingest_sales_file
+
+
+async def main(path: Path, chunk_rows: int, upsert: str | None) -> int:
+    if database.AsyncSessionLocal is None:
+        print("DATABASE_URL not set; cannot load sales.")
+        return 1
+    async with database.AsyncSessionLocal() as session:
+        with path.open("rb") as fileobj:
+            try:
+                report = await ingest_sales_file(session, fileobj, path.name, chunk_rows=chunk_rows, upsert=upsert)
+            except ValueError as exc:
+                print(f"Load failed: {exc}")
+                return 2
+    print(
+        f"Loaded {report.inserted} of {report.rows_read} rows in {report.chunks} chunks via {report.loader} "
+        f"({report.rejected} rejected, {report.elapsed_seconds}s, {report.rows_per_second} rows/s)."
+    )
+    if upsert:
+        print(f"Upsert on {upsert} key: {report.unchanged} unchanged, {report.skipped} skipped as already loaded.")
+    for error in report.errors:
+        print(f"  row {error.row}: {error.error}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", type=Path, help="Extract to load")
+    parser.add_argument("--chunk-rows", type=int, default=SALES_INGEST_CHUNK_ROWS, help="Rows per committed chunk")
+    parser.add_argument("--upsert", choices=UPSERT_KEYS, default=None, help="Idempotent load keyed on this")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.path, args.chunk_rows, args.upsert)))
@@ -0,0 +1,37 @@
+"""
+Refresh InsightOps daily rollups (io_series_rollup_daily).
+
+Incremental by default: only series with raw rows updated since their last refresh are
+rebuilt, from the earliest affected date onward. Schedule it after KPI/engagement loads.
+
+    python backend/scripts/refresh_insightops_rollups.py [--org-id demo_org] [--full]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.src.app.core import database
+from backend.src.app.services.insightops_analytics import refresh_rollups
+
+
+async def main(org_id: str | None, full: bool) -> int:
+    if database.AsyncSessionLocal is None:
+        print("DATABASE_URL not set; cannot refresh rollups.")
+        return 1
+    async with database.AsyncSessionLocal() as session:
+        counts = await refresh_rollups(session, org_id=org_id, full=full)
+    print(f"Refreshed {counts['series']} series ({counts['rows']} rollup rows rewritten).")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--org-id", default=None, help="Limit the refresh to one organization")
+    parser.add_argument("--full", action="store_true", help="Rebuild every series from scratch")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.org_id, args.full)))
@@ -4,12 +4,13 @@ from datetime import date, timedelta
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.database import get_db
+from src.app.core.database import get_db, get_read_session_factory
 from src.app.models.sales import SaleORM
+from src.app.services.csv_export import csv_streaming_response, stream_query_csv
 
 
 router = APIRouter(prefix="/health-intel", tags=["Health Intelligence"])
@@ -20,18 +21,16 @@ async def healthz() -> dict:
     return {"status": "ok"}
 
 
-def _parse_dates(start: Optional[str], end: Optional[str]) -> tuple[str, str]:
-    if not end:
-        end_date = date.today()
-    else:
-        end_date = date.fromisoformat(end)
-    if not start:
-        start_date = end_date - timedelta(days=30)
-    else:
-        start_date = date.fromisoformat(start)
+def _parse_dates(start: Optional[str], end: Optional[str]) -> tuple[date, date]:
+    # Typed bounds so the window only scans the matching monthly sales partitions.
+    try:
+        end_date = date.fromisoformat(end) if end else date.today()
+        start_date = date.fromisoformat(start) if start else end_date - timedelta(days=30)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {exc}")
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="start must be <= end")
-    return (start_date.isoformat(), end_date.isoformat())
+    return (start_date, end_date)
 
 
 @router.get("/products/metrics")
@@ -51,15 +50,14 @@ async def product_metrics(
             func.coalesce(func.sum(SaleORM.revenue), 0.0).label("revenue"),
         )
         .where(SaleORM.product_id == product_id)
-        .where(SaleORM.date >= start_date)
-        .where(SaleORM.date <= end_date)
+        .where(SaleORM.date.between(start_date, end_date))
         .group_by(SaleORM.date)
         .order_by(SaleORM.date.asc())
     )
     res = await db.execute(ts_stmt)
     rows = res.all()
     timeseries = [
-        {"date": d, "units_sold": int(u or 0), "revenue": float(r or 0.0)} for d, u, r in rows
+        {"date": d.isoformat(), "units_sold": int(u or 0), "revenue": float(r or 0.0)} for d, u, r in rows
     ]
 
     # Totals / aggregates
@@ -71,7 +69,7 @@ async def product_metrics(
 
     return {
         "product_id": product_id,
-        "window": {"start": start_date, "end": end_date},
+        "window": {"start": start_date.isoformat(), "end": end_date.isoformat()},
         "totals": {"units_sold": int(total_units), "revenue": float(total_revenue)},
         "aggregates": {
             "avg_daily_units": float(avg_daily_units),
@@ -81,13 +79,14 @@ async def product_metrics(
     }
 
 
-@router.get("/products/metrics.csv", response_class=PlainTextResponse)
+@router.get("/products/metrics.csv")
 async def product_metrics_csv(
     product_id: str = Query(...),
     start: Optional[str] = Query(None),
     end: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db),
-) -> str:
+    gzip: bool = Query(False, description="gzip the stream on the fly"),
+    session_factory=Depends(get_read_session_factory),
+) -> StreamingResponse:
     start_date, end_date = _parse_dates(start, end)
 
     ts_stmt = (
@@ -97,17 +96,14 @@ async def product_metrics_csv(
             func.coalesce(func.sum(SaleORM.revenue), 0.0).label("revenue"),
         )
         .where(SaleORM.product_id == product_id)
-        .where(SaleORM.date >= start_date)
-        .where(SaleORM.date <= end_date)
+        .where(SaleORM.date.between(start_date, end_date))
         .group_by(SaleORM.date)
         .order_by(SaleORM.date.asc())
     )
-    res = await db.execute(ts_stmt)
-    rows = res.all()
-
-    # Build CSV
-    out = ["date,product_id,units_sold,revenue"]
-    for d, u, r in rows:
-        out.append(f"{d},{product_id},{int(u or 0)},{float(r or 0.0)}")
-    return "\n".join(out) + "\n"
-
+    chunks = stream_query_csv(
+        session_factory,
+        ts_stmt,
+        ["date", "product_id", "units_sold", "revenue"],
+        lambda row: (row[0].isoformat(), product_id, int(row[1] or 0), float(row[2] or 0.0)),
+    )
+    return csv_streaming_response(chunks, f"product_metrics_{start_date}_{end_date}.csv", gzip=gzip)
@@ -3,65 +3,68 @@ from __future__ import annotations
 from datetime import date, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.database import get_db
+from src.app.core.database import get_db, get_read_db, get_read_session_factory
 from src.app.models.sales import SaleORM
+from src.app.services.csv_export import csv_streaming_response, stream_query_csv
+from src.app.services.sales_aggregates import sales_aggregates_cache
+from src.app.services.sales_pagination import keyset_page, next_sales_cursor
 
 
 router = APIRouter(prefix="/sales", tags=["Sales Intelligence"])
 
 
-def _parse_dates(start: Optional[str], end: Optional[str]) -> tuple[str, str]:
-    if not end:
-        end_date = date.today()
-    else:
-        end_date = date.fromisoformat(end)
-    if not start:
-        start_date = end_date - timedelta(days=30)
-    else:
-        start_date = date.fromisoformat(start)
+def _parse_dates(start: Optional[str], end: Optional[str]) -> tuple[date, date]:
+    # Typed bounds keep the range filters date comparisons, so Postgres prunes
+    # the monthly sales partitions outside [start, end].
+    try:
+        end_date = date.fromisoformat(end) if end else date.today()
+        start_date = date.fromisoformat(start) if start else end_date - timedelta(days=30)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {exc}")
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="start must be <= end")
-    return (start_date.isoformat(), end_date.isoformat())
+    return (start_date, end_date)
 
 
 @router.get("")
 async def list_sales(
+    response: Response,
     start: Optional[str] = Query(None),
     end: Optional[str] = Query(None),
     region: Optional[str] = Query(None),
     product_id: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both.")
     start_date, end_date = _parse_dates(start, end)
-    conditions = [
-        SaleORM.date >= start_date,
-        SaleORM.date <= end_date,
-    ]
+    conditions = [SaleORM.date.between(start_date, end_date)]
     if region:
         conditions.append(SaleORM.region == region)
     if product_id:
         conditions.append(SaleORM.product_id == product_id)
 
-    stmt = (
-        select(SaleORM)
-        .where(and_(*conditions))
-        .order_by(SaleORM.date.asc())
-        .limit(limit)
-        .offset(offset)
-    )
+    try:
+        stmt = keyset_page(select(SaleORM).where(and_(*conditions)), limit, cursor).offset(offset)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     res = await db.execute(stmt)
     rows = res.scalars().all()
+    next_cursor = next_sales_cursor(rows, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [
         {
             "id": r.id,
-            "date": r.date,
+            "date": r.date.isoformat(),
             "product_id": r.product_id,
             "region": r.region,
             "units_sold": r.units_sold,
@@ -81,19 +84,25 @@ async def create_sale(
     if missing:
         raise HTTPException(status_code=422, detail=f"Missing fields: {', '.join(sorted(missing))}")
 
+    try:
+        sale_date = date.fromisoformat(str(payload.get("date")))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Invalid date: {exc}")
+
     sale = SaleORM(
         product_id=str(payload.get("product_id")),
-        date=str(payload.get("date")),
+        date=sale_date,
         region=str(payload.get("region")) if payload.get("region") is not None else None,
         units_sold=int(payload.get("units_sold")),
         revenue=float(payload.get("revenue")),
     )
     db.add(sale)
     await db.commit()
+    sales_aggregates_cache.invalidate()
     await db.refresh(sale)
     return {
         "id": sale.id,
-        "date": sale.date,
+        "date": sale.date.isoformat(),
         "product_id": sale.product_id,
         "region": sale.region,
         "units_sold": sale.units_sold,
@@ -107,14 +116,11 @@ async def sales_metrics(
     end: Optional[str] = Query(None),
     product_id: Optional[str] = Query(None),
     region: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     start_date, end_date = _parse_dates(start, end)
 
-    conditions = [
-        SaleORM.date >= start_date,
-        SaleORM.date <= end_date,
-    ]
+    conditions = [SaleORM.date.between(start_date, end_date)]
     if product_id:
         conditions.append(SaleORM.product_id == product_id)
     if region:
@@ -134,7 +140,7 @@ async def sales_metrics(
     rows = res.all()
 
     timeseries = [
-        {"date": d, "units_sold": int(u or 0), "revenue": float(r or 0.0)} for d, u, r in rows
+        {"date": d.isoformat(), "units_sold": int(u or 0), "revenue": float(r or 0.0)} for d, u, r in rows
     ]
 
     total_units = sum(int(u or 0) for _, u, _ in rows)
@@ -143,8 +149,8 @@ async def sales_metrics(
 
     return {
         "filters": {
-            "start": start_date,
-            "end": end_date,
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat(),
             "product_id": product_id,
             "region": region,
         },
@@ -157,20 +163,18 @@ async def sales_metrics(
     }
 
 
-@router.get("/metrics.csv", response_class=PlainTextResponse)
+@router.get("/metrics.csv")
 async def sales_metrics_csv(
     start: Optional[str] = Query(None),
     end: Optional[str] = Query(None),
     product_id: Optional[str] = Query(None),
     region: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db),
-) -> str:
+    gzip: bool = Query(False, description="gzip the stream on the fly"),
+    session_factory=Depends(get_read_session_factory),
+) -> StreamingResponse:
     start_date, end_date = _parse_dates(start, end)
 
-    conditions = [
-        SaleORM.date >= start_date,
-        SaleORM.date <= end_date,
-    ]
+    conditions = [SaleORM.date.between(start_date, end_date)]
     if product_id:
         conditions.append(SaleORM.product_id == product_id)
     if region:
@@ -186,11 +190,10 @@ async def sales_metrics_csv(
         .group_by(SaleORM.date)
         .order_by(SaleORM.date.asc())
     )
-    res = await db.execute(ts_stmt)
-    rows = res.all()
-
-    header = "date,units_sold,revenue"
-    out = [header]
-    for d, u, r in rows:
-        out.append(f"{d},{int(u or 0)},{float(r or 0.0)}")
-    return "\n".join(out) + "\n"
+    chunks = stream_query_csv(
+        session_factory,
+        ts_stmt,
+        ["date", "units_sold", "revenue"],
+        lambda row: (row[0].isoformat(), int(row[1] or 0), float(row[2] or 0.0)),
+    )
+    return csv_streaming_response(chunks, f"sales_metrics_{start_date}_{end_date}.csv", gzip=gzip)
@@ -53,6 +53,31 @@ class Settings(BaseSettings):
     PG_URI: Optional[str] = os.getenv("PG_URI")
     DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
 
+    # ---------------------------------------------------
+    # DATABASE POOL
+    # ---------------------------------------------------
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Seconds before a pooled connection is replaced; keep below server/proxy idle timeouts.
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in {"1", "true", "yes", "on"}
+    # asyncpg prepared statements cached per connection (0 disables, e.g. behind pgbouncer
+    # in transaction mode), and SQLAlchemy's compiled-SQL cache that keeps their text stable.
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "1000"))
+
+    # ---------------------------------------------------
+    # READ REPLICAS
+    # ---------------------------------------------------
+    # Comma-separated async URLs; endpoints using get_read_db read from these.
+    DB_READ_REPLICA_URLS: List[str] = [
+        url.strip() for url in os.getenv("DB_READ_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    DB_READ_STRATEGY: str = os.getenv("DB_READ_STRATEGY", "round_robin")
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "10"))
+    DB_REPLICA_LAG_CHECK_SECONDS: float = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "5"))
+
     # ---------------------------------------------------
     # FRONTEND PROXY CONTRACT
     # ---------------------------------------------------
@@ -60,6 +85,17 @@ class Settings(BaseSettings):
         os.getenv("INSIGHTOPS_FRONTEND_PROXY_ENABLED", "true").lower() in {"1", "true", "yes", "on"}
     )
 
+    # ---------------------------------------------------
+    # INSIGHTOPS ROLLUPS
+    # ---------------------------------------------------
+    # Serve KPI/engagement summaries from io_series_rollup_daily when a refreshed rollup exists.
+    INSIGHTOPS_ROLLUPS_ENABLED: bool = (
+        os.getenv("INSIGHTOPS_ROLLUPS_ENABLED", "false").lower() in {"1", "true", "yes", "on"}
+    )
+    # Rows stamped this recently are re-scanned by the next refresh; keep it above the
+    # longest KPI/engagement load transaction (updated_at is stamped when it starts).
+    INSIGHTOPS_ROLLUP_RESCAN_SECONDS: int = int(os.getenv("INSIGHTOPS_ROLLUP_RESCAN_SECONDS", "900"))
+
     # ---------------------------------------------------
     # DATABASE URL BUILDER
     # ---------------------------------------------------
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import os
-from typing import AsyncGenerator, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncGenerator, AsyncIterator, Callable, Optional
+
+from fastapi import Request
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
 
 from .config import get_settings
+from .db_pool import engine_options, pool_stats
+from .read_replicas import ReadReplicaRouter
 
 
 # ---------------------------------------------------------
@@ -31,6 +35,8 @@ if not DATABASE_URL:
 engine = None
 async_engine = None
 AsyncSessionLocal = None
+replica_engines = []
+read_router: Optional[ReadReplicaRouter] = None
 
 # Prevent accidental DB usage in unit tests without a configured database.
 if DATABASE_URL and not DB_LOCKED_FOR_TESTS:
@@ -41,7 +47,7 @@ if DATABASE_URL and not DB_LOCKED_FOR_TESTS:
         DATABASE_URL,
         echo=os.getenv("SQLALCHEMY_ECHO", "false").lower() in {"1", "true", "yes", "on"},
         future=True,
-        poolclass=NullPool if use_null_pool else None,
+        **engine_options(settings, DATABASE_URL, use_null_pool=use_null_pool),
     )
     async_engine = engine  # backward compatibility for tests referencing async_engine
 
@@ -53,6 +59,29 @@ if DATABASE_URL and not DB_LOCKED_FOR_TESTS:
         autocommit=False,
     )
 
+    # Read replicas for endpoints that depend on get_read_db
+    if settings.DB_READ_REPLICA_URLS:
+        _replicas = []
+        for _index, _url in enumerate(settings.DB_READ_REPLICA_URLS):
+            _replica_engine = create_async_engine(
+                _url, future=True, **engine_options(settings, _url, use_null_pool=use_null_pool)
+            )
+            if _replica_engine.dialect.name == "postgresql":
+                _replica_engine = _replica_engine.execution_options(postgresql_readonly=True)
+            replica_engines.append(_replica_engine)
+            _replicas.append(
+                (
+                    f"replica{_index}",
+                    async_sessionmaker(bind=_replica_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False),
+                )
+            )
+        read_router = ReadReplicaRouter(
+            _replicas,
+            strategy=settings.DB_READ_STRATEGY,
+            max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+            lag_check_seconds=settings.DB_REPLICA_LAG_CHECK_SECONDS,
+        )
+
 
 # ---------------------------------------------------------
 # 3. Declarative Base
@@ -73,6 +102,14 @@ def get_engine_or_raise():
     return engine
 
 
+def get_pool_stats() -> dict:
+    """Pool occupancy and checkout wait histogram for the primary engine, plus replica routing."""
+    stats = pool_stats(engine)
+    if read_router is not None:
+        stats["read_replicas"] = read_router.stats()
+    return stats
+
+
 # ---------------------------------------------------------
 # 5. Dependency for FastAPI Routes (yields AsyncSession)
 # ---------------------------------------------------------
@@ -87,6 +124,53 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+PrimaryOpener = Callable[[], AsyncContextManager[Optional[AsyncSession]]]
+
+
+@asynccontextmanager
+async def read_session(open_primary: PrimaryOpener) -> AsyncIterator[Optional[AsyncSession]]:
+    """A replica session when one is healthy; a primary session is opened only otherwise."""
+    if read_router is not None:
+        async with read_router.session() as replica:
+            if replica is not None:
+                yield replica
+                return
+    async with open_primary() as primary:
+        yield primary
+
+
+def primary_opener(request: Request, dependency: Callable = get_db) -> PrimaryOpener:
+    """Open a session dependency (or its override) on demand rather than for every request."""
+    return asynccontextmanager(request.app.dependency_overrides.get(dependency, dependency))
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints; the primary is only connected to as a fallback."""
+    async with read_session(primary_opener(request)) as session:
+        yield session
+
+
+@asynccontextmanager
+async def open_read_session() -> AsyncIterator[AsyncSession]:
+    """A read session (replica when healthy) owned by the caller rather than the request."""
+    async with read_session(AsyncSessionLocal) as session:
+        yield session
+
+
+def get_read_session_factory() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """For streaming response bodies, which run after request dependencies have closed their sessions."""
+    if AsyncSessionLocal is None or DB_LOCKED_FOR_TESTS:
+        _raise_db_disabled()
+    return open_read_session
+
+
+def get_session_factory() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """Like `get_read_session_factory`, for streaming bodies that also write (primary only)."""
+    if AsyncSessionLocal is None or DB_LOCKED_FOR_TESTS:
+        _raise_db_disabled()
+    return AsyncSessionLocal
+
+
 # ---------------------------------------------------------
 # 6. Create All Tables (for Development / Testing)
 # ---------------------------------------------------------
@@ -101,6 +185,7 @@ async def create_all_tables() -> None:
     from ..models import Base as _Base  # noqa: F401
     from ..models import (  # noqa: F401
         SaleORM,
+        SalesIngestManifestORM,
         CampaignORM,
         ConversionORM,
         ProductORM,
@@ -108,6 +193,10 @@ async def create_all_tables() -> None:
         IoKpiDailyORM,
         IoEngagementSignalDailyORM,
         IoExecSummaryORM,
+        IoSeriesRollupDailyORM,
+        IoSeriesRollupStateORM,
+        IoAnomalyEventORM,
+        IoSeriesStatsStateORM,
     )
 
     async with get_engine_or_raise().begin() as conn:
@@ -0,0 +1,137 @@
+"""
+Connection pool configuration and telemetry.
+
+`engine_options` turns the DB_POOL_* / statement cache settings into `create_async_engine`
+keyword arguments. The queue pools used here record how long each checkout waited for
+a connection (including opening a new one under the limit) in a fixed-bucket
+histogram; `pool_stats` reports that together with checked-out and overflow counts so
+pools can be sized against observed concurrency.
+"""
+
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+# Upper bounds in seconds; the last bucket is unbounded.
+WAIT_BUCKETS: Sequence[float] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_in_checkout: ContextVar[bool] = ContextVar("_in_checkout", default=False)
+
+
+class WaitHistogram:
+    def __init__(self, buckets: Sequence[float] = WAIT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound:g}" for bound in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "total_seconds": round(self.total_seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "mean_seconds": round(self.total_seconds / self.count, 6) if self.count else None,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class TimedCheckoutMixin:
+    """Times `_do_get`, the step where a checkout blocks on the pool queue."""
+
+    wait_histogram: WaitHistogram
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = WaitHistogram()
+
+    def recreate(self):
+        # Invalidation rebuilds the pool; keep counting into the same histogram.
+        pool = super().recreate()
+        pool.wait_histogram = self.wait_histogram
+        return pool
+
+    def _do_get(self):
+        if _in_checkout.get():
+            return super()._do_get()  # QueuePool retries by recursing
+        token = _in_checkout.set(True)
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.wait_histogram.timeouts += 1
+            raise
+        finally:
+            self.wait_histogram.observe(time.perf_counter() - started)
+            _in_checkout.reset(token)
+
+
+class TimedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+def engine_options(settings: Any, url: str, use_null_pool: bool = False) -> Dict[str, Any]:
+    """Keyword arguments for `create_async_engine` from the DB_POOL_* settings."""
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    }
+    if use_null_pool:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=TimedAsyncQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if make_url(url).get_driver_name() == "asyncpg":
+        # SQLAlchemy's asyncpg adapter prepares each distinct SQL string once per
+        # connection and keeps it in this LRU; hot series/sales queries are constant SQL.
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
+def pool_stats(engine: Optional[Any]) -> Dict[str, Any]:
+    """Checked-out/overflow counts and the checkout wait histogram for an (async) engine."""
+    if engine is None:
+        return {"enabled": False}
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats: Dict[str, Any] = {"enabled": True, "pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    histogram = getattr(pool, "wait_histogram", None)
+    if histogram is not None:
+        stats["wait"] = histogram.snapshot()
+    return stats
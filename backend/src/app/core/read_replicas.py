@@ -0,0 +1,158 @@
+"""
+Read/write session routing.
+
+`ReadReplicaRouter` hands out sessions on read replicas for endpoints that only read
+(they depend on `get_read_db` instead of `get_db`). Replicas are picked round-robin or
+by fewest in-flight sessions, skipping any whose replication lag is above the limit or
+whose lag probe failed; with no healthy replica the caller falls back to the primary.
+Lag is probed at most once per `lag_check_seconds` per replica.
+
+Routed sessions are read-only: the ORM refuses to flush them, and on Postgres replica
+engines run with `postgresql_readonly`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+READ_STRATEGIES = ("round_robin", "least_connections")
+
+# Zero when the replica has replayed everything it received (an idle primary would
+# otherwise look like growing lag), else the age of the last replayed transaction.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END AS lag_seconds
+"""
+
+logger = logging.getLogger("uvicorn")
+
+LagProbe = Callable[[AsyncSession], Awaitable[Optional[float]]]
+
+
+async def postgres_replica_lag(session: AsyncSession) -> Optional[float]:
+    result = await session.execute(text(REPLICA_LAG_SQL))
+    lag = result.scalar()
+    return float(lag) if lag is not None else None
+
+
+def mark_read_only(session: AsyncSession) -> AsyncSession:
+    session.info["read_only"] = True
+    return session
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    if session.info.get("read_only"):
+        raise RuntimeError("Session is read-only; use get_db for endpoints that write.")
+
+
+class ReplicaTarget:
+    def __init__(self, name: str, session_factory: Callable[[], Any]) -> None:
+        self.name = name
+        self.session_factory = session_factory
+        self.in_flight = 0
+        self.served = 0
+        self.lag_seconds: Optional[float] = None
+        self.healthy = False
+        self.checked_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+
+
+class ReadReplicaRouter:
+    def __init__(
+        self,
+        replicas: Sequence[Tuple[str, Callable[[], Any]]],
+        strategy: str = "round_robin",
+        max_lag_seconds: float = 10.0,
+        lag_check_seconds: float = 5.0,
+        lag_probe: LagProbe = postgres_replica_lag,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not replicas:
+            raise ValueError("At least one replica is required.")
+        if strategy not in READ_STRATEGIES:
+            raise ValueError(f"Unsupported read strategy '{strategy}'. Allowed: {list(READ_STRATEGIES)}")
+        self.targets: List[ReplicaTarget] = [ReplicaTarget(name, factory) for name, factory in replicas]
+        self.strategy = strategy
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self.lag_probe = lag_probe
+        self.clock = clock
+        self.primary_fallbacks = 0
+        self._rotation = itertools.cycle(range(len(self.targets)))
+
+    async def _refresh_lag(self, target: ReplicaTarget) -> None:
+        now = self.clock()
+        if target.checked_at is not None and now - target.checked_at < self.lag_check_seconds:
+            return
+        async with target.lock:
+            if target.checked_at is not None and self.clock() - target.checked_at < self.lag_check_seconds:
+                return  # another request probed while we waited
+            try:
+                async with target.session_factory() as session:
+                    target.lag_seconds = await self.lag_probe(session)
+                target.healthy = target.lag_seconds is not None and target.lag_seconds <= self.max_lag_seconds
+            except Exception as exc:
+                target.lag_seconds = None
+                target.healthy = False
+                logger.warning("Read replica %s lag probe failed: %s", target.name, exc)
+            target.checked_at = self.clock()
+
+    async def choose(self) -> Optional[ReplicaTarget]:
+        """A healthy replica for the next read, or None to use the primary."""
+        for target in self.targets:
+            await self._refresh_lag(target)
+        healthy = [target for target in self.targets if target.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_connections":
+            return min(healthy, key=lambda target: target.in_flight)
+        for _ in range(len(self.targets)):
+            target = self.targets[next(self._rotation)]
+            if target.healthy:
+                return target
+        return None  # pragma: no cover
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Optional[AsyncSession]]:
+        """Yield a read-only replica session, or None when the primary must serve the read."""
+        target = await self.choose()
+        if target is None:
+            self.primary_fallbacks += 1
+            yield None
+            return
+        target.in_flight += 1
+        target.served += 1
+        try:
+            async with target.session_factory() as session:
+                yield mark_read_only(session)
+        finally:
+            target.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [
+                {
+                    "name": target.name,
+                    "healthy": target.healthy,
+                    "lag_seconds": target.lag_seconds,
+                    "in_flight": target.in_flight,
+                    "served": target.served,
+                }
+                for target in self.targets
+            ],
+        }
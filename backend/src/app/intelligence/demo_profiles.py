@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping
 
-from .narratives import build_executive_narrative
 from ..schemas.insightops_analytics import DeltaSummary, EngagementSummary, Anomaly, AnomalyResponse
 def _build_intel_for_profile(kpi_percent_delta: float, engagement_percent_delta: float, anomalies: bool):
     from datetime import date
@@ -30,35 +30,53 @@ def _build_intel_for_profile(kpi_percent_delta: float, engagement_percent_delta:
         )
 
 
-def _base_intelligence(kpi_percent_delta: float, engagement_percent_delta: float, anomalies: bool):
+def _base_intelligence(kpi_percent_delta: float, engagement_percent_delta: float, anomalies: bool, title: str):
+    # The pipeline already carries the narrative; only the top priority is retitled.
     intel = _build_intel_for_profile(kpi_percent_delta, engagement_percent_delta, anomalies)
-    narrative = build_executive_narrative(
-        synthesis=intel["synthesis"],
-        priorities=intel["priorities"],
-        driver=intel["driver"],
-    )
-    return {**intel, "narrative": narrative}
+    priorities = intel["priorities"]
+    retitled = (priorities[0].model_copy(update={"title": title}),) + tuple(priorities[1:])
+    return MappingProxyType({**intel, "priorities": retitled})
 
 
-def EXEC_STABLE_GROWTH() -> Dict[str, object]:
-    intel = _base_intelligence(kpi_percent_delta=0.08, engagement_percent_delta=0.05, anomalies=False)
-    intel["priorities"][0].title = "Stable growth"
-    return intel
+def EXEC_STABLE_GROWTH() -> Mapping[str, object]:
+    return _base_intelligence(kpi_percent_delta=0.08, engagement_percent_delta=0.05, anomalies=False, title="Stable growth")
 
 
-def EXEC_REVENUE_RISK() -> Dict[str, object]:
-    intel = _base_intelligence(kpi_percent_delta=-0.12, engagement_percent_delta=-0.08, anomalies=True)
-    intel["priorities"][0].title = "Revenue at risk"
-    return intel
+def EXEC_REVENUE_RISK() -> Mapping[str, object]:
+    return _base_intelligence(kpi_percent_delta=-0.12, engagement_percent_delta=-0.08, anomalies=True, title="Revenue at risk")
 
 
-def EXEC_ENGAGEMENT_DROP() -> Dict[str, object]:
-    intel = _base_intelligence(kpi_percent_delta=0.0, engagement_percent_delta=-0.15, anomalies=False)
-    intel["priorities"][0].title = "Engagement drop"
-    return intel
+def EXEC_ENGAGEMENT_DROP() -> Mapping[str, object]:
+    return _base_intelligence(kpi_percent_delta=0.0, engagement_percent_delta=-0.15, anomalies=False, title="Engagement drop")
 
 
-def EXEC_ANOMALY_SPIKE() -> Dict[str, object]:
-    intel = _base_intelligence(kpi_percent_delta=-0.05, engagement_percent_delta=0.02, anomalies=True)
-    intel["priorities"][0].title = "Anomaly spike"
-    return intel
+def EXEC_ANOMALY_SPIKE() -> Mapping[str, object]:
+    return _base_intelligence(kpi_percent_delta=-0.05, engagement_percent_delta=0.02, anomalies=True, title="Anomaly spike")
+
+
+DEMO_PROFILES: Dict[str, Callable[[], Mapping[str, object]]] = {
+    "EXEC_STABLE_GROWTH": EXEC_STABLE_GROWTH,
+    "EXEC_REVENUE_RISK": EXEC_REVENUE_RISK,
+    "EXEC_ENGAGEMENT_DROP": EXEC_ENGAGEMENT_DROP,
+    "EXEC_ANOMALY_SPIKE": EXEC_ANOMALY_SPIKE,
+}
+
+_PRECOMPUTED: Dict[str, Mapping[str, object]] = {}
+
+
+def precompute_demo_profiles() -> int:
+    """Build every demo bundle once (called at startup); returns how many are ready."""
+    for name, build in DEMO_PROFILES.items():
+        if name not in _PRECOMPUTED:
+            _PRECOMPUTED[name] = build()
+    return len(_PRECOMPUTED)
+
+
+def get_demo_profile(name: str) -> Mapping[str, object]:
+    """Read-only precomputed bundle for `name`; builds it on first use if startup did not."""
+    if name not in DEMO_PROFILES:
+        raise ValueError(f"Unknown demo profile '{name}'. Allowed: {sorted(DEMO_PROFILES)}")
+    bundle = _PRECOMPUTED.get(name)
+    if bundle is None:
+        bundle = _PRECOMPUTED[name] = DEMO_PROFILES[name]()
+    return bundle
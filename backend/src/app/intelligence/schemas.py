@@ -1,10 +1,15 @@
 from enum import Enum
-from typing import List, Optional
+from typing import Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Intelligence results are memoized and shared between requests, so they are immutable.
+_FROZEN = ConfigDict(frozen=True)
 
 
 class SignalCorrelation(BaseModel):
+    model_config = _FROZEN
+
     kpi_key: str
     signal_key: Optional[str] = None
     anomaly_key: Optional[str] = None
@@ -21,20 +26,26 @@ class PrimaryDriver(str, Enum):
 
 
 class DriverAttribution(BaseModel):
+    model_config = _FROZEN
+
     primary_driver: PrimaryDriver = PrimaryDriver.UNKNOWN
-    supporting_factors: List[str] = Field(default_factory=list)
+    supporting_factors: Tuple[str, ...] = ()
     confidence: float = Field(..., ge=0.0, le=1.0)
 
 
 class PrioritizedInsight(BaseModel):
+    model_config = _FROZEN
+
     title: str
     impact_score: int = Field(..., ge=0, le=100)
     urgency_score: int = Field(..., ge=0, le=100)
     confidence: float = Field(..., ge=0.0, le=1.0)
-    explainability_notes: List[str] = Field(default_factory=list)
+    explainability_notes: Tuple[str, ...] = ()
 
 
 class SynthesisBlock(BaseModel):
+    model_config = _FROZEN
+
     situation: str
     evidence: str
     risk: str
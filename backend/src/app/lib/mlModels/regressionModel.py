@@ -49,10 +49,7 @@ async def linear_regression_forecast(
     y_pred = model.predict(future_idx)
 
     # Start date = day after last observed date
-    try:
-        last_date = datetime.fromisoformat(series[-1][0]).date()
-    except Exception:
-        last_date = datetime.utcnow().date()
+    last_date = series[-1][0]  # SaleORM.date is a DATE column
     start = last_date + timedelta(days=1)
 
     forecast: List[Dict[str, float]] = []
@@ -61,10 +61,7 @@ async def arima_like_forecast(
         last_season = [0.0] * (seasonality or 0)
 
     # Forecast future points using last trend slope and repeating seasonality
-    try:
-        last_date = datetime.fromisoformat(series[-1][0]).date()
-    except Exception:
-        last_date = datetime.utcnow().date()
+    last_date = series[-1][0]  # SaleORM.date is a DATE column
 
     # Approximate slope from last two trend points
     slope = 0.0
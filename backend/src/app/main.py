@@ -192,6 +192,28 @@ def create_app() -> FastAPI:
             logger = logging.getLogger("uvicorn")
             logger.warning("Seed failed: %s", e)
 
+    # Precompute the deterministic demo intelligence bundles once per process
+    @app.on_event("startup")
+    async def warm_demo_profiles():
+        try:
+            from .intelligence.demo_profiles import precompute_demo_profiles
+            precompute_demo_profiles()
+        except Exception as e:
+            import logging
+            logger = logging.getLogger("uvicorn")
+            logger.warning("Demo profile precompute failed: %s", e)
+
+    # Stop sales ingest workers and drop the spool files of jobs that never started
+    @app.on_event("shutdown")
+    async def stop_ingest_jobs():
+        try:
+            from .services.sales_ingest_jobs import ingest_jobs
+            await ingest_jobs.close()
+        except Exception as e:
+            import logging
+            logger = logging.getLogger("uvicorn")
+            logger.warning("Ingest job shutdown failed: %s", e)
+
     monitoring_startup(app)
     telemetry_startup(app)
 
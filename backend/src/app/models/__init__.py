@@ -3,7 +3,7 @@ from __future__ import annotations
 from ..core.database import Base
 
 # Import ORM models so that metadata is populated when this package is imported
-from .sales import SaleORM  # noqa: F401
+from .sales import SaleORM, SalesIngestManifestORM  # noqa: F401
 from .marketing import CampaignORM, ConversionORM  # noqa: F401
 from .products import ProductORM  # noqa: F401
 from .user import UserORM  # noqa: F401
@@ -11,11 +11,16 @@ from .insightops import (  # noqa: F401
     IoEngagementSignalDailyORM,
     IoExecSummaryORM,
     IoKpiDailyORM,
+    IoSeriesRollupDailyORM,
+    IoSeriesRollupStateORM,
+    IoAnomalyEventORM,
+    IoSeriesStatsStateORM,
 )
 
 __all__ = [
     "Base",
     "SaleORM",
+    "SalesIngestManifestORM",
     "CampaignORM",
     "ConversionORM",
     "ProductORM",
@@ -23,5 +28,9 @@ __all__ = [
     "IoKpiDailyORM",
     "IoEngagementSignalDailyORM",
     "IoExecSummaryORM",
+    "IoSeriesRollupDailyORM",
+    "IoSeriesRollupStateORM",
+    "IoAnomalyEventORM",
+    "IoSeriesStatsStateORM",
 ]
 
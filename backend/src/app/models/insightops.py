@@ -4,7 +4,7 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import JSON, Date, DateTime, Numeric, String, Text, func
+from sqlalchemy import JSON, Date, DateTime, Index, Integer, Numeric, String, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -13,6 +13,18 @@ from ..core.database import Base
 
 class IoKpiDailyORM(Base):
     __tablename__ = "io_kpi_daily"
+    # Series reads filter on (org_id, metric_key, date range); INCLUDE lets Postgres answer them index-only.
+    __table_args__ = (
+        Index(
+            "ix_io_kpi_daily_org_metric_date",
+            "org_id",
+            "metric_key",
+            "kpi_date",
+            postgresql_include=["metric_value"],
+        ),
+        # Data watermarks (MAX(updated_at) per org/key) for ETag validation.
+        Index("ix_io_kpi_daily_org_metric_updated", "org_id", "metric_key", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -37,6 +49,16 @@ class IoKpiDailyORM(Base):
 
 class IoEngagementSignalDailyORM(Base):
     __tablename__ = "io_engagement_signal_daily"
+    __table_args__ = (
+        Index(
+            "ix_io_engagement_signal_daily_org_signal_date",
+            "org_id",
+            "signal_key",
+            "signal_date",
+            postgresql_include=["signal_value"],
+        ),
+        Index("ix_io_engagement_signal_daily_org_signal_updated", "org_id", "signal_key", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -60,6 +82,9 @@ class IoEngagementSignalDailyORM(Base):
 
 class IoExecSummaryORM(Base):
     __tablename__ = "io_exec_summary"
+    __table_args__ = (
+        Index("ix_io_exec_summary_org_type_created_id", "org_id", "summary_type", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -77,3 +102,81 @@ class IoExecSummaryORM(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
+
+
+class IoSeriesRollupDailyORM(Base):
+    """Per-org/per-key daily rollup of KPI and engagement series (see insightops_analytics.rollups)."""
+
+    __tablename__ = "io_series_rollup_daily"
+
+    org_id: Mapped[str] = mapped_column(String, primary_key=True)
+    series_kind: Mapped[str] = mapped_column(String, primary_key=True)
+    series_key: Mapped[str] = mapped_column(String, primary_key=True)
+    rollup_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    day_value: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False)
+    ordinal: Mapped[int] = mapped_column(Integer, nullable=False)
+    cum_value: Mapped[Decimal] = mapped_column(Numeric(24, 4), nullable=False)
+    prev_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    prev_value: Mapped[Decimal | None] = mapped_column(Numeric(18, 4), nullable=True)
+    rolling_avg_7d: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
+class IoSeriesRollupStateORM(Base):
+    """Refresh watermark per rolled-up series; its presence marks the rollup as available."""
+
+    __tablename__ = "io_series_rollup_state"
+
+    org_id: Mapped[str] = mapped_column(String, primary_key=True)
+    series_kind: Mapped[str] = mapped_column(String, primary_key=True)
+    series_key: Mapped[str] = mapped_column(String, primary_key=True)
+    source_watermark: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class IoSeriesStatsStateORM(Base):
+    """Persisted `RunningStats` per series, advanced one point at a time."""
+
+    __tablename__ = "io_series_stats_state"
+
+    org_id: Mapped[str] = mapped_column(String, primary_key=True)
+    series_kind: Mapped[str] = mapped_column(String, primary_key=True)
+    series_key: Mapped[str] = mapped_column(String, primary_key=True)
+    stats_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    last_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class IoAnomalyEventORM(Base):
+    """Anomalies recorded by the fleet-wide sweep, one row per series/date/type."""
+
+    __tablename__ = "io_anomaly_event"
+    __table_args__ = (
+        UniqueConstraint(
+            "org_id", "series_kind", "series_key", "anomaly_date", "anomaly_type", name="uq_io_anomaly_event_point"
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    org_id: Mapped[str] = mapped_column(String, nullable=False)
+    series_kind: Mapped[str] = mapped_column(String, nullable=False)
+    series_key: Mapped[str] = mapped_column(String, nullable=False)
+    anomaly_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    anomaly_type: Mapped[str] = mapped_column(String, nullable=False)
+    severity: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    sweep_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
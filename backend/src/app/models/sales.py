@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import Integer, String, Float
+import datetime as dt
+
+from sqlalchemy import Date, DateTime, Float, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.database import Base
@@ -8,11 +10,35 @@ from ..core.database import Base
 
 class SaleORM(Base):
     __tablename__ = "sales"
+    # On Postgres the table is range-partitioned by month on `date` with primary key
+    # (id, date); see migrations/sql/sales_date_partitioning.sql. Ids stay unique
+    # through the shared sequence, so the ORM keeps `id` as its identity.
+    __table_args__ = (
+        # Keyset pages order by (date, id); the index also serves plain date ranges.
+        Index("ix_sales_date_id", "date", "id"),
+        Index("ix_sales_product_date", "product_id", "date"),
+        # Upsert ingest conflict target; includes `date` because Postgres unique indexes
+        # on a partitioned table must contain the partition key.
+        Index("uq_sales_dedup_key_date", "dedup_key", "date", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     product_id: Mapped[str] = mapped_column(String, index=True, nullable=False)
-    date: Mapped[str] = mapped_column(String, nullable=False)
+    date: Mapped[dt.date] = mapped_column(Date, nullable=False)
     region: Mapped[str] = mapped_column(String, nullable=True)
     units_sold: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     revenue: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     profit_margin: Mapped[float] = mapped_column(Float, nullable=True)
+    # Set by upsert ingest (services/sales_ingest.py); NULL for rows loaded any other way.
+    dedup_key: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class SalesIngestManifestORM(Base):
+    """Content hash of the row an upsert ingest last loaded for each dedup_key, per source file."""
+
+    __tablename__ = "sales_ingest_manifest"
+
+    source: Mapped[str] = mapped_column(String, primary_key=True)
+    dedup_key: Mapped[str] = mapped_column(String, primary_key=True)
+    row_hash: Mapped[str] = mapped_column(String, nullable=False)
+    loaded_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
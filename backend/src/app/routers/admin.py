@@ -7,7 +7,7 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from ..core.database import get_db
+from ..core.database import get_db, get_pool_stats
 from ..models.user import UserORM
 from ..models.sales import SaleORM
 from .auth import get_current_user
@@ -89,3 +89,10 @@ async def admin_health_check(
         "role": current_user.role,
     }
 
+
+@router.get("/db-pool")
+async def db_pool_stats(
+    current_user: Annotated[UserORM, Depends(require_admin)] = None,
+):
+    """Connection pool occupancy and checkout wait histogram."""
+    return get_pool_stats()
@@ -3,14 +3,14 @@ from typing import Dict, List, Optional
 import os
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from pydantic import BaseModel
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_db
+from ..core.database import get_db, primary_opener, read_session
 from ..models.sales import SaleORM
-from ..models.marketing import CampaignORM
+from ..services.sales_aggregates import sales_aggregates_cache
 
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
@@ -25,6 +25,12 @@ async def get_db_optional():
         yield None
 
 
+async def get_read_db_optional(request: Request):
+    """Read-replica session (primary fallback, None without a database) for the read-only analytics endpoints."""
+    async with read_session(primary_opener(request, get_db_optional)) as session:
+        yield session
+
+
 def get_processed_data_path() -> Optional[Path]:
     """Get path to processed data, returns None if not available."""
     try:
@@ -90,14 +96,14 @@ class AggregateMetrics(BaseModel):
     total_revenue: float
     avg_roi: float
     orders_count: int
-    revenue_by_day: List[Dict[str, float]]
+    revenue_by_day: List[DayData]
     revenue_growth_pct: float
 
 
 @router.get("/", response_model=AggregateResponse)
 async def get_aggregates(
     use_processed: bool = Query(True, description="Use processed data as fallback"),
-    db: AsyncSession = Depends(get_db_optional)
+    db: AsyncSession = Depends(get_read_db_optional)
 ) -> AggregateResponse:
     """Get aggregate analytics. Falls back to processed data if database is empty and use_processed=true."""
     
@@ -112,22 +118,11 @@ async def get_aggregates(
             revenue_growth_pct=5.0,
         )
     
-    total_q = select(func.coalesce(func.sum(SaleORM.revenue), 0.0))
-    count_q = select(func.count(SaleORM.id))
-    by_day_q = (
-        select(SaleORM.date, func.coalesce(func.sum(SaleORM.revenue), 0.0).label("sales"))
-        .group_by(SaleORM.date)
-        .order_by(SaleORM.date.asc())
-        .limit(7)
-    )
-
-    total_sales = (await db.execute(total_q)).scalar_one()
-    orders_count = (await db.execute(count_q)).scalar_one()
-    by_day_res = await db.execute(by_day_q)
-    by_day = [{"date": d, "sales": float(s)} for d, s in by_day_res.all()]
+    aggregates = await sales_aggregates_cache.get(db)
+    by_day = [{"date": day.date.isoformat(), "sales": day.sales} for day in aggregates.by_day]
 
     # Use processed data fallback if database is empty and flag is set
-    if use_processed and (orders_count == 0 or total_sales == 0):
+    if use_processed and (aggregates.orders_count == 0 or aggregates.total_revenue == 0):
         fallback = get_fallback_analytics()
         return AggregateResponse(
             total_sales=fallback["total_sales"],
@@ -137,28 +132,19 @@ async def get_aggregates(
             revenue_growth_pct=5.0,  # Mock growth percentage
         )
 
-    avg_order_value = float(total_sales) / orders_count if orders_count else 0.0
-
-    # Compute growth percentage from by_day data
-    revenue_growth_pct = 0.0
-    if len(by_day) >= 2 and by_day[0]["sales"] > 0:
-        first = by_day[0]["sales"]
-        last = by_day[-1]["sales"]
-        revenue_growth_pct = ((last - first) / first) * 100.0
-
     return AggregateResponse(
-        total_sales=float(total_sales),
-        avg_order_value=avg_order_value,
-        orders_count=int(orders_count),
+        total_sales=aggregates.total_revenue,
+        avg_order_value=aggregates.avg_order_value,
+        orders_count=aggregates.orders_count,
         by_day=by_day,
-        revenue_growth_pct=revenue_growth_pct,
+        revenue_growth_pct=aggregates.revenue_growth_pct,
     )
 
 
 @router.get("/aggregate", response_model=AggregateMetrics)
 async def analytics_aggregate(
     use_processed: bool = Query(False, description="Use processed data as fallback"),
-    db: AsyncSession = Depends(get_db_optional)
+    db: AsyncSession = Depends(get_read_db_optional)
 ) -> AggregateMetrics:
     """Get aggregate metrics. Falls back to processed data if database is not available."""
     
@@ -173,20 +159,11 @@ async def analytics_aggregate(
             revenue_growth_pct=5.0,
         )
     
-    """Get aggregate metrics. Falls back to processed data if database is empty and use_processed=true."""
-    # Total revenue from sales
-    total_rev_q = select(func.coalesce(func.sum(SaleORM.revenue), 0.0))
-    total_revenue = float((await db.execute(total_rev_q)).scalar_one())
-
-    # Average ROI across campaigns (simple arithmetic mean of ROI column)
-    avg_roi_q = select(func.coalesce(func.avg(CampaignORM.roi), 0.0))
-    avg_roi = float((await db.execute(avg_roi_q)).scalar_one())
-
-    # Orders count (rows in sales)
-    orders_count = int((await db.execute(select(func.count(SaleORM.id)))).scalar_one())
+    # Revenue, order count, campaign ROI and the last 7 days come from one cached query
+    aggregates = await sales_aggregates_cache.get(db)
 
     # Use processed data fallback if database is empty
-    if use_processed and orders_count == 0:
+    if use_processed and aggregates.orders_count == 0:
         fallback = get_fallback_analytics()
         return AggregateMetrics(
             total_revenue=fallback["total_sales"],
@@ -196,30 +173,12 @@ async def analytics_aggregate(
             revenue_growth_pct=5.0,  # Mock growth
         )
 
-    # Revenue by day (last 7 days ascending)
-    by_day_q = (
-        select(SaleORM.date, func.coalesce(func.sum(SaleORM.revenue), 0.0).label("sales"))
-        .group_by(SaleORM.date)
-        .order_by(SaleORM.date.asc())
-        .limit(7)
-    )
-    by_day_res = await db.execute(by_day_q)
-    revenue_by_day = [{"date": d, "sales": float(s)} for d, s in by_day_res.all()]
-
-    # Compute simple growth percent from first to last day
-    if len(revenue_by_day) >= 2 and revenue_by_day[0]["sales"] > 0:
-        first = revenue_by_day[0]["sales"]
-        last = revenue_by_day[-1]["sales"]
-        revenue_growth_pct = ((last - first) / first) * 100.0
-    else:
-        revenue_growth_pct = 0.0
-
     return AggregateMetrics(
-        total_revenue=total_revenue,
-        avg_roi=avg_roi,
-        orders_count=orders_count,
-        revenue_by_day=revenue_by_day,
-        revenue_growth_pct=revenue_growth_pct,
+        total_revenue=aggregates.total_revenue,
+        avg_roi=aggregates.avg_roi,
+        orders_count=aggregates.orders_count,
+        revenue_by_day=[{"date": day.date.isoformat(), "sales": day.sales} for day in aggregates.by_day],
+        revenue_growth_pct=aggregates.revenue_growth_pct,
     )
 
 
@@ -227,7 +186,7 @@ async def analytics_aggregate(
 async def analytics_live(
     window: str = "24h",
     use_processed: bool = Query(False, description="Use processed data as fallback"),
-    db: AsyncSession = Depends(get_db_optional)
+    db: AsyncSession = Depends(get_read_db_optional)
 ) -> Dict[str, float | int]:
     """Get live analytics metrics."""
     
@@ -244,28 +203,30 @@ async def analytics_live(
     
     """Get live analytics metrics.
     
-    Assumes `SaleORM.date` is ISO date string (YYYY-MM-DD). For a production
-    system using TIMESTAMP columns, switch to proper datetime comparisons.
+    `SaleORM.date` is a DATE column; comparing it against a date lets Postgres
+    skip every monthly sales partition before `start`.
     """
     now = datetime.utcnow()
     if window == "7d":
-        start = (now - timedelta(days=7)).date().isoformat()
+        start = (now - timedelta(days=7)).date()
     else:  # default 24h
-        start = (now - timedelta(days=1)).date().isoformat()
+        start = (now - timedelta(days=1)).date()
 
-    # Filter sales by date >= start
-    total_q = select(func.coalesce(func.sum(SaleORM.revenue), 0.0)).where(SaleORM.date >= start)
-    count_q = select(func.count(SaleORM.id)).where(SaleORM.date >= start)
+    # Filter sales by date >= start; revenue and count in one statement
+    live_q = select(
+        func.coalesce(func.sum(SaleORM.revenue), 0.0),
+        func.count(SaleORM.id),
+    ).where(SaleORM.date >= start)
 
-    total_revenue = float((await db.execute(total_q)).scalar_one())
-    orders_count = int((await db.execute(count_q)).scalar_one())
+    total_revenue, orders_count = (await db.execute(live_q)).one()
+    total_revenue, orders_count = float(total_revenue), int(orders_count)
 
     # Use processed data fallback if database is empty
     if use_processed and orders_count == 0:
         fallback = get_fallback_analytics()
         return {
             "window": window,
-            "since": start,
+            "since": start.isoformat(),
             "total_revenue": fallback["total_sales"],
             "orders_count": fallback["orders_count"],
             "avg_order_value": fallback["avg_order_value"],
@@ -275,7 +236,7 @@ async def analytics_live(
 
     return {
         "window": window,
-        "since": start,
+        "since": start.isoformat(),
         "total_revenue": total_revenue,
         "orders_count": orders_count,
         "avg_order_value": avg_order_value,
@@ -286,7 +247,7 @@ async def analytics_live(
 async def get_prediction(
     horizon_days: int = 7,
     use_processed: bool = Query(True, description="Use processed data for forecast"),
-    db: AsyncSession = Depends(get_db_optional)
+    db: AsyncSession = Depends(get_read_db_optional)
 ) -> PredictResponse:
     """Generate sales forecast using simple linear projection."""
         # If database not available, use fallback immediately
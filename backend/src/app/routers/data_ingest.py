@@ -1,6 +1,7 @@
-from typing import Literal
+from datetime import date
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 import csv
 import io
@@ -8,6 +9,9 @@ import json
 
 from ..core.database import get_db
 from ..models.sales import SaleORM
+from ..services.sales_aggregates import sales_aggregates_cache
+from ..services.sales_ingest import ingest_sales_file
+from ..services.sales_ingest_jobs import ingest_jobs
 from sqlalchemy import insert
 
 
@@ -16,15 +20,44 @@ router = APIRouter(prefix="/api/data", tags=["data-ingest"])
 
 @router.post("/upload")
 async def upload_data(
+    response: Response,
     file: UploadFile = File(...),
     type: Literal["sales"] = "sales",
+    mode: Literal["batch", "stream", "async"] = "batch",
+    upsert: Optional[Literal["natural", "content"]] = None,
     db: AsyncSession = Depends(get_db),
 ):
     """Upload CSV or JSON to populate DB tables.
 
     Currently supports type="sales" with columns/keys: product_id, date,
     region, units_sold, revenue, profit_margin.
+
+    mode="stream" loads large extracts (.csv, .ndjson/.jsonl or .json) in
+    committed chunks via COPY on Postgres and reports throughput and rejects.
+    mode="async" spools the file and runs the same load in a background job;
+    poll /api/data/jobs/{id} for progress.
+    upsert="natural" (product_id, date, region) or "content" (whole row) makes
+    reruns idempotent: rows are upserted on that key and rows this file already
+    loaded are skipped. Implies the stream load unless mode="async".
     """
+    if mode == "async":
+        try:
+            job = await ingest_jobs.spool(file.file, file.filename or "", upsert=upsert)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        response.status_code = 202
+        response.headers["Location"] = f"{router.prefix}/jobs/{job.id}"
+        return {"status": "queued", "mode": "async", "job_id": job.id}
+
+    if mode == "stream" or upsert is not None:
+        try:
+            report = await ingest_sales_file(db, file.file, file.filename or "", upsert=upsert)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            sales_aggregates_cache.invalidate()
+        return {"status": "ok", "mode": "stream", "upsert": upsert, **report.summary()}
+
     content = await file.read()
     filename = (file.filename or "").lower()
 
@@ -49,7 +82,7 @@ async def upload_data(
                 batch.append(
                     dict(
                         product_id=str(r.get("product_id")),
-                        date=str(r.get("date")),
+                        date=date.fromisoformat(str(r.get("date"))),
                         region=(r.get("region") or None),
                         units_sold=int(r.get("units_sold", 0)),
                         revenue=float(r.get("revenue", 0.0)),
@@ -64,9 +97,19 @@ async def upload_data(
             stmt = insert(SaleORM).values(batch)
             await db.execute(stmt)
             await db.commit()
+            sales_aggregates_cache.invalidate()
             inserted = len(batch)
     else:
         raise HTTPException(status_code=400, detail="Unsupported type")
 
     return {"status": "ok", "inserted": inserted}
 
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingest_job(job_id: str):
+    """Progress of an async upload: rows processed, rows/sec and ETA."""
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.model_dump(mode="json")
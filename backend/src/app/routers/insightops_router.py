@@ -1,26 +1,44 @@
 from __future__ import annotations
 
+import logging
 from datetime import date, datetime
+from typing import Awaitable
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_db
+from ..core.database import get_db, get_read_db, get_read_session_factory, get_session_factory
 from ..services import (
     insightops_analytics,
     insightops_anomalies,
+    insightops_brief_batch,
+    insightops_brief_cache,
     insightops_engagement,
     insightops_executive_brief,
+    insightops_stream,
+    insightops_watermarks,
 )
 from ..services import insightops_exec_persistence as exec_persistence
 from ..services.insightops import fetch_engagement_signals, fetch_kpis
-from ..schemas.insightops_analytics import Anomaly, AnomalyResponse, DeltaSummary, EngagementSummary, SeriesResponse
-from ..schemas.insightops_executive_brief import ExecutiveBriefResponse
+from ..schemas.insightops_analytics import (
+    Anomaly,
+    AnomalyResponse,
+    DeltaSummary,
+    EngagementSummary,
+    KpiBreakdownResponse,
+    SeriesBatchResponse,
+    SeriesResponse,
+)
+from ..schemas.insightops_executive_brief import ExecutiveBriefBatchRequest, ExecutiveBriefResponse
 
 router = APIRouter(prefix="/api/insightops", tags=["InsightOps"])
 
+logger = logging.getLogger("uvicorn")
+
 
 class KpiDaily(BaseModel):
     id: UUID
@@ -92,6 +110,104 @@ async def get_db_optional():
         yield None
 
 
+async def _safe_watermark(db: AsyncSession, lookup: Awaitable[str]) -> str | None:
+    try:
+        return await lookup
+    except Exception as exc:
+        # ETags are an optimization; without a watermark the request is simply served in full.
+        if isinstance(exc, SQLAlchemyError):
+            await db.rollback()
+        logger.warning("InsightOps watermark lookup failed: %s", exc)
+        return None
+
+
+def _conditional_get(request: Request, response: Response, watermark: str | None) -> str | None:
+    """Set the ETag, or answer 304 before the endpoint runs its query."""
+    if watermark is None:
+        return None
+    etag = insightops_watermarks.make_etag(watermark, request.url.path, request.url.query)
+    if insightops_watermarks.etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
+
+
+def _series_etag(
+    metric_param: str | None = None,
+    metric_default: tuple[str, ...] = (),
+    signal_param: str | None = None,
+    signal_default: tuple[str, ...] = (),
+):
+    """Dependency computing the ETag from the watermark of the series a request reads."""
+
+    async def dependency(request: Request, response: Response, db: AsyncSession = Depends(get_read_db)) -> str | None:
+        params = request.query_params
+        org = _resolve_org_id(params.get("org_id"), params.get("orgId"), insightops_analytics.DEFAULT_ORG_ID)
+        signal_keys = (params.getlist(signal_param) if signal_param else []) or list(signal_default)
+        metric_keys = (params.getlist(metric_param) if metric_param else []) or list(metric_default)
+        if signal_param == "signal_key" and params.get("signal_key"):
+            metric_keys = []  # anomalies: signal_key overrides metric_key
+        watermark = await _safe_watermark(
+            db, insightops_watermarks.get_series_watermark(db, org, metric_keys, signal_keys)
+        )
+        return _conditional_get(request, response, watermark)
+
+    return dependency
+
+
+async def _exec_summary_etag(request: Request, response: Response, db: AsyncSession = Depends(get_read_db)) -> str | None:
+    params = request.query_params
+    org = _resolve_org_id(params.get("org_id"), params.get("orgId"), insightops_analytics.DEFAULT_ORG_ID)
+    watermark = await _safe_watermark(
+        db, insightops_watermarks.get_exec_summary_watermark(db, org, params.get("summary_type", "board"))
+    )
+    return _conditional_get(request, response, watermark)
+
+
+_kpi_etag = _series_etag(metric_param="metric_key", metric_default=("revenue",))
+_signal_etag = _series_etag(signal_param="signal_key", signal_default=("touches",))
+
+
+def _check_series_format(response_format: str) -> None:
+    if response_format not in insightops_analytics.SERIES_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid format. Use one of: " + ", ".join(insightops_analytics.SERIES_FORMATS),
+        )
+
+
+def _arrow_response(encode) -> Response:
+    try:
+        body = encode()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=406, detail=str(exc))
+    return Response(body, media_type=insightops_analytics.ARROW_STREAM_MEDIA_TYPE)
+
+
+async def _formatted_series(
+    db: AsyncSession,
+    kind: str,
+    org_id: str,
+    key: str,
+    start_date: str | None,
+    end_date: str | None,
+    lookback_days: int,
+    response_format: str,
+) -> Response:
+    """Columnar/Arrow series built from raw rows, bypassing per-point SeriesPoint models."""
+    _check_series_format(response_format)
+    try:
+        start, end, rows = await insightops_analytics.load_series_rows(
+            db, kind, org_id, key, start_date, end_date, lookback_days
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if response_format == "columnar":
+        payload = insightops_analytics.columnar_payload(org_id, key, start, end, rows)
+        return Response(insightops_analytics.columnar_json(payload), media_type="application/json")
+    return _arrow_response(lambda: insightops_analytics.series_arrow(org_id, key, start, end, rows))
+
+
 @router.get("/health")
 async def insightops_health() -> dict:
     return {"domain": "insightops-studio", "status": "ok"}
@@ -106,7 +222,7 @@ async def list_kpis(
     start_date: date | None = Query(None, description="Inclusive start date (YYYY-MM-DD)"),
     end_date: date | None = Query(None, description="Inclusive end date (YYYY-MM-DD)"),
     metric_key: str | None = Query(None, description="Filter to a single KPI metric_key"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[KpiDaily]:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
     try:
@@ -127,7 +243,7 @@ async def list_engagement_signals(
     start_date: date | None = Query(None, description="Inclusive start date (YYYY-MM-DD)"),
     end_date: date | None = Query(None, description="Inclusive end date (YYYY-MM-DD)"),
     signal_key: str | None = Query(None, description="Filter to a single engagement signal_key"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[EngagementSignalDaily]:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
     try:
@@ -151,9 +267,20 @@ async def kpi_series(
     lookback_days: int = Query(
         insightops_analytics.DEFAULT_LOOKBACK_DAYS, description="Lookback window if dates not provided"
     ),
-    db: AsyncSession = Depends(get_db),
+    response_format: str = Query(
+        "json", alias="format", description="json, columnar (dates[]/values[] arrays) or arrow (Arrow IPC stream)"
+    ),
+    etag: str | None = Depends(_kpi_etag),
+    db: AsyncSession = Depends(get_read_db),
 ) -> SeriesResponse:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
+    if response_format != "json":
+        formatted = await _formatted_series(
+            db, "kpi", resolved_org_id, metric_key, start_date, end_date, lookback_days, response_format
+        )
+        if etag:
+            formatted.headers["ETag"] = etag
+        return formatted
     try:
         series = await insightops_analytics.get_kpi_series(
             db=db,
@@ -168,6 +295,100 @@ async def kpi_series(
     return series
 
 
+@router.get("/analytics/kpis/series:batch", response_model=SeriesBatchResponse)
+async def kpi_series_batch(
+    org_id: str | None = Query(
+        None, description="Organization identifier to filter KPIs and signals", alias="org_id"
+    ),
+    orgId: str | None = Query(None, include_in_schema=False),
+    metric_keys: list[str] = Query(["revenue"], description="KPI metric keys (repeat the parameter)"),
+    signal_keys: list[str] = Query([], description="Engagement signal keys (repeat the parameter)"),
+    start_date: str | None = Query(None, description="Inclusive start date (YYYY-MM-DD)"),
+    end_date: str | None = Query(None, description="Inclusive end date (YYYY-MM-DD)"),
+    lookback_days: int = Query(
+        insightops_analytics.DEFAULT_LOOKBACK_DAYS, description="Lookback window if dates not provided"
+    ),
+    response_format: str = Query(
+        "json", alias="format", description="json, columnar (dates[]/values[] arrays) or arrow (Arrow IPC stream)"
+    ),
+    etag: str | None = Depends(_series_etag(metric_param="metric_keys", metric_default=("revenue",), signal_param="signal_keys")),
+    db: AsyncSession = Depends(get_read_db),
+) -> SeriesBatchResponse:
+    resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
+    if response_format != "json":
+        _check_series_format(response_format)
+        try:
+            start, end, kpi_rows, signal_rows = await insightops_analytics.load_series_batch_rows(
+                db, resolved_org_id, metric_keys, signal_keys, start_date, end_date, lookback_days
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        if response_format == "columnar":
+            payload = insightops_analytics.batch_columnar_payload(resolved_org_id, start, end, kpi_rows, signal_rows)
+            formatted = Response(insightops_analytics.columnar_json(payload), media_type="application/json")
+        else:
+            formatted = _arrow_response(
+                lambda: insightops_analytics.batch_arrow(resolved_org_id, start, end, kpi_rows, signal_rows)
+            )
+        if etag:
+            formatted.headers["ETag"] = etag
+        return formatted
+    try:
+        batch = await insightops_analytics.get_series_batch(
+            db=db,
+            org_id=resolved_org_id,
+            metric_keys=metric_keys,
+            signal_keys=signal_keys,
+            start_date=start_date,
+            end_date=end_date,
+            lookback_days=lookback_days,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return batch
+
+
+@router.get("/analytics/kpis/breakdown", response_model=KpiBreakdownResponse)
+async def kpi_breakdown(
+    org_id: str | None = Query(
+        None, description="Organization identifier to filter KPIs", alias="org_id"
+    ),
+    orgId: str | None = Query(None, include_in_schema=False),
+    metric_key: str = Query("revenue", description="KPI metric key"),
+    group_by: list[str] = Query([], description="Dimensions to group on (repeat the parameter)"),
+    aggregation: str = Query("sum", description="sum, avg or last (value on the latest date)"),
+    granularity: str = Query("total", description="total for one row per group, day for one row per group and date"),
+    region: list[str] = Query([], description="Only include these regions"),
+    segment: list[str] = Query([], description="Only include these segments"),
+    channel: list[str] = Query([], description="Only include these channels"),
+    product: list[str] = Query([], description="Only include these products"),
+    start_date: str | None = Query(None, description="Inclusive start date (YYYY-MM-DD)"),
+    end_date: str | None = Query(None, description="Inclusive end date (YYYY-MM-DD)"),
+    lookback_days: int = Query(
+        insightops_analytics.DEFAULT_LOOKBACK_DAYS, description="Lookback window if dates not provided"
+    ),
+    etag: str | None = Depends(_kpi_etag),
+    db: AsyncSession = Depends(get_read_db),
+) -> KpiBreakdownResponse:
+    resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
+    try:
+        breakdown = await insightops_analytics.get_kpi_breakdown(
+            db=db,
+            org_id=resolved_org_id,
+            metric_key=metric_key,
+            group_by=group_by,
+            filters={"region": region, "segment": segment, "channel": channel, "product": product},
+            aggregation=aggregation,
+            granularity=granularity,
+            start_date=start_date,
+            end_date=end_date,
+            lookback_days=lookback_days,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return breakdown
+
+
 @router.get("/analytics/kpis/summary", response_model=DeltaSummary)
 async def kpi_summary(
     org_id: str | None = Query(
@@ -180,10 +401,16 @@ async def kpi_summary(
     lookback_days: int = Query(
         insightops_analytics.DEFAULT_LOOKBACK_DAYS, description="Lookback window if dates not provided"
     ),
-    db: AsyncSession = Depends(get_db),
+    etag: str | None = Depends(_kpi_etag),
+    db: AsyncSession = Depends(get_read_db),
 ) -> DeltaSummary:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
     try:
+        rollup = await insightops_analytics.get_rollup_window(
+            db, "kpi", resolved_org_id, metric_key, start_date, end_date, lookback_days
+        )
+        if rollup is not None:
+            return insightops_analytics.compute_kpi_delta([], rollup=rollup)
         series = await insightops_analytics.get_kpi_series(
             db=db,
             org_id=resolved_org_id,
@@ -210,9 +437,20 @@ async def engagement_series(
     lookback_days: int = Query(
         insightops_analytics.DEFAULT_LOOKBACK_DAYS, description="Lookback window if dates not provided"
     ),
-    db: AsyncSession = Depends(get_db),
+    response_format: str = Query(
+        "json", alias="format", description="json, columnar (dates[]/values[] arrays) or arrow (Arrow IPC stream)"
+    ),
+    etag: str | None = Depends(_signal_etag),
+    db: AsyncSession = Depends(get_read_db),
 ) -> SeriesResponse:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
+    if response_format != "json":
+        formatted = await _formatted_series(
+            db, "signal", resolved_org_id, signal_key, start_date, end_date, lookback_days, response_format
+        )
+        if etag:
+            formatted.headers["ETag"] = etag
+        return formatted
     try:
         series = await insightops_engagement.get_signal_series(
             db=db,
@@ -227,6 +465,41 @@ async def engagement_series(
     return series
 
 
+@router.get("/stream")
+async def stream_updates(
+    request: Request,
+    org_id: str | None = Query(
+        None, description="Organization identifier to stream KPI and engagement updates for", alias="org_id"
+    ),
+    orgId: str | None = Query(None, include_in_schema=False),
+    metric_keys: list[str] = Query(["revenue"], description="KPI metric keys (repeat the parameter)"),
+    signal_keys: list[str] = Query([], description="Engagement signal keys (repeat the parameter)"),
+) -> StreamingResponse:
+    """Server-sent events: a `snapshot` per series, then `update` events with only the new points."""
+    resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
+    broadcaster = insightops_stream.stream_broadcaster
+    try:
+        subscription = await broadcaster.subscribe(resolved_org_id, metric_keys=metric_keys, signal_keys=signal_keys)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.warning("InsightOps stream seeding failed for %s: %s", resolved_org_id, exc)
+        raise HTTPException(status_code=503, detail="Series data is unavailable; retry shortly.")
+
+    async def _events():
+        try:
+            async for frame in insightops_stream.sse_events(subscription, request.is_disconnected):
+                yield frame
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/analytics/engagement/summary", response_model=EngagementSummary)
 async def engagement_summary(
     org_id: str | None = Query(
@@ -239,23 +512,30 @@ async def engagement_summary(
     lookback_days: int = Query(
         insightops_analytics.DEFAULT_LOOKBACK_DAYS, description="Lookback window if dates not provided"
     ),
-    db: AsyncSession = Depends(get_db),
+    etag: str | None = Depends(_signal_etag),
+    db: AsyncSession = Depends(get_read_db),
 ) -> EngagementSummary:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
     try:
-        series = await insightops_engagement.get_signal_series(
-            db=db,
-            org_id=resolved_org_id,
-            signal_key=signal_key,
-            start_date=start_date,
-            end_date=end_date,
-            lookback_days=lookback_days,
+        rollup = await insightops_analytics.get_rollup_window(
+            db, "signal", resolved_org_id, signal_key, start_date, end_date, lookback_days
         )
+        points = []
+        if rollup is None:
+            series = await insightops_engagement.get_signal_series(
+                db=db,
+                org_id=resolved_org_id,
+                signal_key=signal_key,
+                start_date=start_date,
+                end_date=end_date,
+                lookback_days=lookback_days,
+            )
+            points = series.points
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    aggregates = insightops_engagement.aggregate_signals(series.points)
-    health = insightops_engagement.compute_engagement_health(series.points)
+    aggregates = insightops_engagement.aggregate_signals(points, rollup=rollup)
+    health = insightops_engagement.compute_engagement_health(points, rollup=rollup)
 
     return EngagementSummary(
         total=aggregates.total,
@@ -278,7 +558,8 @@ async def analytics_anomalies(
     lookback_days: int = Query(
         insightops_analytics.DEFAULT_LOOKBACK_DAYS, description="Lookback window if dates not provided"
     ),
-    db: AsyncSession = Depends(get_db),
+    etag: str | None = Depends(_series_etag(metric_param="metric_key", metric_default=("revenue",), signal_param="signal_key")),
+    db: AsyncSession = Depends(get_read_db),
 ) -> AnomalyResponse:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
     metric_to_use = None if signal_key else metric_key
@@ -310,6 +591,10 @@ async def executive_brief(
     summary_type: str = Query("board", description="Summary type label to persist"),
     demo_mode: bool = Query(False, description="Use deterministic demo intelligence"),
     demo_profile: str | None = Query(None, description="Demo profile preset"),
+    fan_out: bool = Query(False, description="Run KPI, engagement and anomaly loads concurrently on pooled sessions"),
+    snapshot: bool = Query(
+        False, description="Serve a stored snapshot while the org's KPI/engagement data is unchanged"
+    ),
     db: AsyncSession | None = Depends(get_db_optional),
 ) -> ExecutiveBriefResponse:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
@@ -317,14 +602,29 @@ async def executive_brief(
         valid_profiles = {"EXEC_STABLE_GROWTH", "EXEC_REVENUE_RISK", "EXEC_ENGAGEMENT_DROP", "EXEC_ANOMALY_SPIKE"}
         if demo_profile and demo_profile not in valid_profiles:
             raise HTTPException(status_code=400, detail="Invalid demo_profile. Use one of: " + ", ".join(sorted(valid_profiles)))
-    try:
-        brief = await insightops_executive_brief.build_executive_brief(
+
+    async def _build() -> ExecutiveBriefResponse:
+        return await insightops_executive_brief.build_executive_brief(
             db=db,
             org_id=resolved_org_id,
             window_days=window_days,
             demo_mode=demo_mode,
             demo_profile=demo_profile,
+            fan_out=fan_out,
         )
+
+    try:
+        if snapshot and not demo_mode and db is not None:
+            brief = await insightops_brief_cache.get_or_build_brief(
+                db,
+                org_id=resolved_org_id,
+                window_days=window_days,
+                metric_keys=insightops_executive_brief.DEFAULT_METRIC_KEYS,
+                signal_keys=insightops_executive_brief.DEFAULT_SIGNAL_KEYS,
+                build=_build,
+            )
+        else:
+            brief = await _build()
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
@@ -340,6 +640,51 @@ async def executive_brief(
     return brief
 
 
+@router.post("/executive-brief:batch")
+async def executive_brief_batch(
+    request: ExecutiveBriefBatchRequest,
+    read_session_factory=Depends(get_read_session_factory),
+    write_session_factory=Depends(get_session_factory),
+) -> StreamingResponse:
+    """Stream one executive brief per org as NDJSON, in request order."""
+    # The body runs after request dependencies close, so the stream opens its own sessions.
+    briefs = insightops_brief_batch.stream_executive_briefs(
+        write_session_factory if request.persist else read_session_factory,
+        org_ids=request.org_ids,
+        window_days=request.window_days,
+        metric_keys=request.metric_keys,
+        signal_keys=request.signal_keys,
+        persist=request.persist,
+        summary_type=request.summary_type,
+    )
+    # Pull the first brief eagerly so invalid input is a 400 rather than a broken stream.
+    try:
+        first = await anext(briefs)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    async def _ndjson():
+        yield first.model_dump_json() + "\n"
+        async for brief in briefs:
+            yield brief.model_dump_json() + "\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
+@router.post("/executive-brief/invalidate")
+async def invalidate_executive_brief_snapshots(
+    org_id: str | None = Query(
+        None, description="Organization whose brief snapshots should be dropped", alias="org_id"
+    ),
+    orgId: str | None = Query(None, include_in_schema=False),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Call after loading KPI/engagement rows so the next brief is rebuilt."""
+    resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
+    removed = await insightops_brief_cache.invalidate_brief_snapshots(resolved_org_id, db=db)
+    return {"org_id": resolved_org_id, "removed": removed}
+
+
 @router.get("/executive-summaries/latest", response_model=ExecSummary)
 async def latest_executive_summary(
     org_id: str | None = Query(
@@ -348,7 +693,8 @@ async def latest_executive_summary(
     orgId: str | None = Query(None, include_in_schema=False),
     summary_type: str = Query("board", description="Summary type label"),
     include_payload: bool = Query(False, description="Include stored payload_json if available"),
-    db: AsyncSession = Depends(get_db),
+    etag: str | None = Depends(_exec_summary_etag),
+    db: AsyncSession = Depends(get_read_db),
 ) -> ExecSummary:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
     record = await exec_persistence.get_latest_exec_summary(
@@ -364,6 +710,7 @@ async def latest_executive_summary(
 
 @router.get("/executive-summaries", response_model=list[ExecSummary])
 async def list_executive_summaries(
+    response: Response,
     org_id: str | None = Query(
         None, description="Organization identifier to filter summaries", alias="org_id"
     ),
@@ -371,14 +718,22 @@ async def list_executive_summaries(
     summary_type: str = Query("board", description="Summary type label"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of summaries to return"),
     include_payload: bool = Query(False, description="Include stored payload_json if available"),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[ExecSummary]:
     resolved_org_id = _resolve_org_id(org_id, orgId, insightops_analytics.DEFAULT_ORG_ID)
-    records = await exec_persistence.list_exec_summaries(
-        db=db,
-        org_id=resolved_org_id,
-        summary_type=summary_type,
-        limit=limit,
-        include_payload=include_payload,
-    )
+    try:
+        records = await exec_persistence.list_exec_summaries(
+            db=db,
+            org_id=resolved_org_id,
+            summary_type=summary_type,
+            limit=limit,
+            include_payload=include_payload,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if len(records) == limit:
+        last = records[-1]
+        response.headers["X-Next-Cursor"] = exec_persistence.encode_summary_cursor(last.created_at, last.id)
     return records
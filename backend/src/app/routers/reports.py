@@ -3,14 +3,13 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession
-import csv
 import io
-from datetime import datetime
+from datetime import date, datetime
 
-from ..core.database import get_db
+from ..core.database import get_read_session_factory
 from ..models.sales import SaleORM
 from ..models.marketing import CampaignORM
+from ..services.csv_export import csv_streaming_response, encode_csv_rows, stream_row_chunks
 
 
 router = APIRouter(prefix="/api/reports", tags=["reports"])
@@ -19,17 +18,22 @@ router = APIRouter(prefix="/api/reports", tags=["reports"])
 @router.get("/generate")
 async def generate_report(
     fmt: str = Query("csv", regex="^(csv|pdf)$"),
-    start_date: str | None = None,
-    end_date: str | None = None,
-    db: AsyncSession = Depends(get_db),
+    start_date: date | None = None,
+    end_date: date | None = None,
+    gzip: bool = Query(False, description="gzip the CSV stream on the fly"),
+    session_factory=Depends(get_read_session_factory),
 ):
     """Compile aggregated DB data into a downloadable CSV or PDF.
 
     Aggregates include:
       - Sales by day (date, total_revenue, orders)
       - Campaign ROI summary (avg_roi)
-    Date filters apply to sales by `SaleORM.date` (ISO string).
+    Date filters apply to sales by `SaleORM.date` (ISO dates); a bounded range such as
+    one year only reads the monthly sales partitions inside it.
     """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be <= end_date")
+
     # Sales by day
     sales_q = select(
         SaleORM.date.label("date"),
@@ -42,31 +46,28 @@ async def generate_report(
         sales_q = sales_q.where(SaleORM.date <= end_date)
     sales_q = sales_q.order_by(SaleORM.date.asc())
 
-    sales_res = await db.execute(sales_q)
-    sales_rows = [(d, float(rev), int(cnt)) for d, rev, cnt in sales_res.all()]
-
     # Marketing avg ROI
-    avg_roi = float((await db.execute(select(func.coalesce(func.avg(CampaignORM.roi), 0.0)))).scalar_one())
+    avg_roi_q = select(func.coalesce(func.avg(CampaignORM.roi), 0.0))
 
     generated_at = datetime.utcnow().isoformat() + "Z"
 
     if fmt == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["generated_at", generated_at])
-        writer.writerow([])
-        writer.writerow(["Sales By Day"]) 
-        writer.writerow(["date", "total_revenue", "orders"]) 
-        for d, rev, cnt in sales_rows:
-            writer.writerow([d, f"{rev:.2f}", cnt])
-        writer.writerow([])
-        writer.writerow(["Marketing Summary"]) 
-        writer.writerow(["avg_roi"]) 
-        writer.writerow([f"{avg_roi:.2f}"])
-
-        mem = io.BytesIO(output.getvalue().encode("utf-8"))
+        # Streamed: the sales section is written chunk by chunk from a server-side cursor
+        async def _report_chunks():
+            yield encode_csv_rows([["generated_at", generated_at], [], ["Sales By Day"], ["date", "total_revenue", "orders"]])
+            async with session_factory() as session:
+                async for rows in stream_row_chunks(session, sales_q):
+                    yield encode_csv_rows([d, f"{float(rev):.2f}", int(cnt)] for d, rev, cnt in rows)
+                avg_roi = float((await session.execute(avg_roi_q)).scalar_one())
+            yield encode_csv_rows([[], ["Marketing Summary"], ["avg_roi"], [f"{avg_roi:.2f}"]])
+
         filename = f"report_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-        return StreamingResponse(mem, media_type="text/csv", headers={"Content-Disposition": f"attachment; filename={filename}"})
+        return csv_streaming_response(_report_chunks(), filename, gzip=gzip)
+
+    async with session_factory() as session:
+        sales_res = await session.execute(sales_q)
+        sales_rows = [(d, float(rev), int(cnt)) for d, rev, cnt in sales_res.all()]
+        avg_roi = float((await session.execute(avg_roi_q)).scalar_one())
 
     # Minimal PDF generation (plain text) if reportlab/jspdf not available
     try:
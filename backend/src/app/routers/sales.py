@@ -1,11 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from datetime import date
 from pydantic import BaseModel
 from typing import List, Optional
 from sqlalchemy import select, insert, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_db
+from ..core.database import get_db, get_read_session_factory
 from ..models.sales import SaleORM
+from ..services.sales_aggregates import sales_aggregates_cache
+from ..services.sales_pagination import (
+    decode_sales_cursor,
+    keyset_page,
+    next_sales_cursor,
+    stream_sales_ndjson,
+)
 
 
 router = APIRouter(prefix="/api/sales", tags=["sales"])
@@ -14,35 +23,51 @@ router = APIRouter(prefix="/api/sales", tags=["sales"])
 class Sale(BaseModel):
     id: int
     product_id: str
-    date: str
+    date: date
     region: Optional[str] = None
     units_sold: int
     revenue: float
     profit_margin: Optional[float] = None
 
 
+def _sale_filters(start_date: Optional[date], end_date: Optional[date], region: Optional[str]) -> list:
+    conditions = []
+    if start_date:
+        conditions.append(SaleORM.date >= start_date)
+    if end_date:
+        conditions.append(SaleORM.date <= end_date)
+    if region:
+        conditions.append(SaleORM.region == region)
+    return conditions
+
+
 @router.get("/", response_model=List[Sale])
 async def list_sales(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     region: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     db: AsyncSession = Depends(get_db),
 ) -> List[Sale]:
+    """Newest sales first. Follow `X-Next-Cursor` for further pages; `offset` is kept for old clients."""
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both.")
     stmt = select(SaleORM)
-    conditions = []
-    if start_date:
-        conditions.append(SaleORM.date >= start_date)
-    if end_date:
-        conditions.append(SaleORM.date <= end_date)
-    if region:
-        conditions.append(SaleORM.region == region)
+    conditions = _sale_filters(start_date, end_date, region)
     if conditions:
         stmt = stmt.where(and_(*conditions))
-    stmt = stmt.order_by(SaleORM.date.desc()).limit(limit).offset(offset)
+    try:
+        stmt = keyset_page(stmt, limit, cursor, descending=True).offset(offset)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     res = await db.execute(stmt)
     rows = res.scalars().all()
+    next_cursor = next_sales_cursor(rows, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [
         Sale(
             id=r.id,
@@ -57,6 +82,25 @@ async def list_sales(
     ]
 
 
+# Declared before /{sale_id} so "export" is not parsed as an id.
+@router.get("/export")
+async def export_sales(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    region: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Start after this X-Next-Cursor position"),
+    session_factory=Depends(get_read_session_factory),
+) -> StreamingResponse:
+    """Every matching sale as NDJSON (one object per line), oldest first."""
+    if cursor:
+        try:
+            decode_sales_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    chunks = stream_sales_ndjson(session_factory, _sale_filters(start_date, end_date, region), cursor=cursor)
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+
 @router.get("/{sale_id}", response_model=Sale)
 async def get_sale(sale_id: int, db: AsyncSession = Depends(get_db)) -> Sale:
     stmt = select(SaleORM).where(SaleORM.id == sale_id)
@@ -77,7 +121,7 @@ async def get_sale(sale_id: int, db: AsyncSession = Depends(get_db)) -> Sale:
 
 class NewSale(BaseModel):
     product_id: str
-    date: str
+    date: date
     region: Optional[str] = None
     units_sold: int
     revenue: float
@@ -100,6 +144,7 @@ async def create_sale(payload: NewSale, db: AsyncSession = Depends(get_db)) -> S
     )
     res = await db.execute(stmt)
     await db.commit()
+    sales_aggregates_cache.invalidate()
     r = res.scalar_one()
     return Sale(
         id=r.id,
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List
+from typing import Any, Dict, List
 
 from pydantic import BaseModel, ConfigDict
 
@@ -23,6 +23,31 @@ class SeriesResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class SeriesBatchResponse(BaseModel):
+    org_id: str
+    start_date: date
+    end_date: date
+    kpis: Dict[str, SeriesResponse]
+    signals: Dict[str, SeriesResponse]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class KpiBreakdownResponse(BaseModel):
+    """Columnar breakdown: `columns` holds one equal-length array per group_by dimension,
+    plus `date` (daily granularity), `value` and `rows` (source rows aggregated)."""
+
+    org_id: str
+    metric_key: str
+    start_date: date
+    end_date: date
+    aggregation: str
+    granularity: str
+    group_by: List[str]
+    filters: Dict[str, List[str]]
+    columns: Dict[str, List[Any]]
+
+
 class DeltaSummary(BaseModel):
     latest_value: float | None
     previous_value: float | None
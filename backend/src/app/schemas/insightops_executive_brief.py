@@ -54,3 +54,12 @@ class ExecutiveBriefResponse(BaseModel):
     priority_focus: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ExecutiveBriefBatchRequest(BaseModel):
+    org_ids: List[str]
+    window_days: int = 14
+    metric_keys: Optional[List[str]] = None
+    signal_keys: Optional[List[str]] = None
+    persist: bool = False
+    summary_type: str = "board"
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
-from typing import Sequence
+from typing import Dict, List, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,7 +11,8 @@ from ..models.insightops import (
     IoExecSummaryORM,
     IoKpiDailyORM,
 )
-from .insightops_analytics import DEFAULT_LOOKBACK_DAYS, DEFAULT_ORG_ID
+from .insightops_analytics import DEFAULT_LOOKBACK_DAYS, DEFAULT_ORG_ID, SeriesCache, get_rollup_window
+from .insightops_analytics.batch import get_series_batch as _get_series_batch
 from .insightops_analytics.kpis import compute_kpi_delta as _compute_kpi_delta
 from .insightops_analytics.kpis import get_kpi_series as _get_kpi_series
 from .insightops_anomalies import get_anomalies as _get_anomalies
@@ -24,6 +25,7 @@ from .insightops_interpretation.anomaly_interpreter import interpret_anomalies
 from .insightops_interpretation.engagement_interpreter import interpret_engagement
 from .insightops_interpretation.kpi_interpreter import interpret_kpi
 from .insightops_interpretation.scoring import compute_priority_score
+from ..schemas.insightops_analytics import DeltaSummary, EngagementSummary
 
 DEFAULT_WINDOW_DAYS = 14
 
@@ -75,6 +77,7 @@ async def get_kpi_series(
     start_date: str | None = None,
     end_date: str | None = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: SeriesCache | None = None,
 ):
     return await _get_kpi_series(
         db=db,
@@ -83,6 +86,7 @@ async def get_kpi_series(
         start_date=start_date,
         end_date=end_date,
         lookback_days=lookback_days,
+        cache=cache,
     )
 
 
@@ -93,7 +97,11 @@ async def get_kpi_summary(
     start_date: str | None = None,
     end_date: str | None = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: SeriesCache | None = None,
 ):
+    rollup = await get_rollup_window(db, "kpi", org_id, metric_key, start_date, end_date, lookback_days)
+    if rollup is not None:
+        return _compute_kpi_delta([], rollup=rollup)
     series = await get_kpi_series(
         db=db,
         org_id=org_id,
@@ -101,6 +109,7 @@ async def get_kpi_summary(
         start_date=start_date,
         end_date=end_date,
         lookback_days=lookback_days,
+        cache=cache,
     )
     return _compute_kpi_delta(series.points)
 
@@ -112,6 +121,7 @@ async def get_engagement_series(
     start_date: str | None = None,
     end_date: str | None = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: SeriesCache | None = None,
 ):
     return await _get_signal_series(
         db=db,
@@ -120,6 +130,7 @@ async def get_engagement_series(
         start_date=start_date,
         end_date=end_date,
         lookback_days=lookback_days,
+        cache=cache,
     )
 
 
@@ -130,7 +141,13 @@ async def get_engagement_summary(
     start_date: str | None = None,
     end_date: str | None = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: SeriesCache | None = None,
 ):
+    rollup = await get_rollup_window(db, "signal", org_id, signal_key, start_date, end_date, lookback_days)
+    if rollup is not None:
+        aggregates = _aggregate_signals([], rollup=rollup)
+        health = _compute_engagement_health([], rollup=rollup)
+        return aggregates.model_copy(update={"health_score": health})
     series = await get_engagement_series(
         db=db,
         org_id=org_id,
@@ -138,6 +155,7 @@ async def get_engagement_summary(
         start_date=start_date,
         end_date=end_date,
         lookback_days=lookback_days,
+        cache=cache,
     )
     aggregates = _aggregate_signals(series.points)
     health = _compute_engagement_health(series.points)
@@ -152,6 +170,7 @@ async def get_anomalies(
     start_date: str | None = None,
     end_date: str | None = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: SeriesCache | None = None,
 ):
     metric_to_use = None if signal_key else metric_key
     return await _get_anomalies(
@@ -162,9 +181,75 @@ async def get_anomalies(
         start_date=start_date,
         end_date=end_date,
         lookback_days=lookback_days,
+        cache=cache,
     )
 
 
+async def get_series_batch(
+    db: AsyncSession,
+    org_id: str = DEFAULT_ORG_ID,
+    metric_keys: Sequence[str] | None = None,
+    signal_keys: Sequence[str] | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+):
+    return await _get_series_batch(
+        db=db,
+        org_id=org_id,
+        metric_keys=metric_keys,
+        signal_keys=signal_keys,
+        start_date=start_date,
+        end_date=end_date,
+        lookback_days=lookback_days,
+    )
+
+
+async def get_kpi_summaries(
+    db: AsyncSession,
+    org_id: str = DEFAULT_ORG_ID,
+    metric_keys: Sequence[str] = ("revenue",),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> Dict[str, DeltaSummary]:
+    """Delta summaries for several KPIs from a single batched series query."""
+    batch = await get_series_batch(
+        db=db,
+        org_id=org_id,
+        metric_keys=metric_keys,
+        start_date=start_date,
+        end_date=end_date,
+        lookback_days=lookback_days,
+    )
+    return {key: _compute_kpi_delta(series.points) for key, series in batch.kpis.items()}
+
+
+async def get_engagement_summaries(
+    db: AsyncSession,
+    org_id: str = DEFAULT_ORG_ID,
+    signal_keys: Sequence[str] = ("touches",),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> Dict[str, EngagementSummary]:
+    """Engagement summaries for several signals from a single batched series query."""
+    batch = await get_series_batch(
+        db=db,
+        org_id=org_id,
+        signal_keys=signal_keys,
+        start_date=start_date,
+        end_date=end_date,
+        lookback_days=lookback_days,
+    )
+    summaries: Dict[str, EngagementSummary] = {}
+    for key, series in batch.signals.items():
+        aggregates = _aggregate_signals(series.points)
+        health = _compute_engagement_health(series.points)
+        summaries[key] = aggregates.model_copy(update={"health_score": health})
+    return summaries
+
+
 async def fetch_engagement_signals(
     db: AsyncSession,
     org_id: str,
@@ -225,6 +310,7 @@ async def get_interpreted_kpi_summary(
     start_date: str | None = None,
     end_date: str | None = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: SeriesCache | None = None,
 ):
     base_summary = await get_kpi_summary(
         db=db,
@@ -233,6 +319,7 @@ async def get_interpreted_kpi_summary(
         start_date=start_date,
         end_date=end_date,
         lookback_days=lookback_days,
+        cache=cache,
     )
     interpretation = interpret_kpi(
         base_summary.latest_value,
@@ -248,6 +335,39 @@ async def get_interpreted_kpi_summary(
     return {"summary": base_summary, "interpretation": interpretation, "priority": priority}
 
 
+async def get_interpreted_kpi_summaries(
+    db: AsyncSession,
+    org_id: str = DEFAULT_ORG_ID,
+    metric_keys: Sequence[str] = ("revenue",),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> List[dict]:
+    base_summaries = await get_kpi_summaries(
+        db=db,
+        org_id=org_id,
+        metric_keys=metric_keys,
+        start_date=start_date,
+        end_date=end_date,
+        lookback_days=lookback_days,
+    )
+    interpreted = []
+    for key, base_summary in base_summaries.items():
+        interpretation = interpret_kpi(
+            base_summary.latest_value,
+            base_summary.previous_value,
+            base_summary.percent_delta,
+            base_summary.rolling_avg_7d_latest,
+        )
+        priority = compute_priority_score(
+            kpi_sev=interpretation["severity"],
+            engagement_sev=0,
+            anomaly_sev=0,
+        )
+        interpreted.append({"key": key, "summary": base_summary, "interpretation": interpretation, "priority": priority})
+    return interpreted
+
+
 async def get_interpreted_engagement_summary(
     db: AsyncSession,
     org_id: str = DEFAULT_ORG_ID,
@@ -255,6 +375,7 @@ async def get_interpreted_engagement_summary(
     start_date: str | None = None,
     end_date: str | None = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: SeriesCache | None = None,
 ):
     base_summary = await get_engagement_summary(
         db=db,
@@ -263,6 +384,7 @@ async def get_interpreted_engagement_summary(
         start_date=start_date,
         end_date=end_date,
         lookback_days=lookback_days,
+        cache=cache,
     )
     interpretation = interpret_engagement(
         base_summary.health_score,
@@ -285,6 +407,7 @@ async def get_interpreted_anomaly_summary(
     start_date: str | None = None,
     end_date: str | None = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: SeriesCache | None = None,
 ):
     anomaly_response = await get_anomalies(
         db=db,
@@ -294,6 +417,7 @@ async def get_interpreted_anomaly_summary(
         start_date=start_date,
         end_date=end_date,
         lookback_days=lookback_days,
+        cache=cache,
     )
     interpretation = interpret_anomalies(anomaly_response.anomalies)
     priority = compute_priority_score(
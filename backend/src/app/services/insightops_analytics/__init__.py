@@ -10,8 +10,33 @@ from .constants import (  # noqa: F401
     ALLOWED_SIGNAL_KEYS,
     DEFAULT_LOOKBACK_DAYS,
     DEFAULT_ORG_ID,
+    KPI_DIMENSIONS,
+    RATIO_KPI_KEYS,
 )
-from .db import fetch_kpi_series, fetch_signal_series  # noqa: F401
+from .batch import get_series_batch  # noqa: F401
+from .breakdown import get_kpi_breakdown, kpi_breakdown_statement  # noqa: F401
+from .cache import SeriesCache, series_from_rows  # noqa: F401
+from .columnar import (  # noqa: F401
+    ARROW_STREAM_MEDIA_TYPE,
+    SERIES_FORMATS,
+    batch_arrow,
+    batch_columnar_payload,
+    columnar_json,
+    columnar_payload,
+    load_series_batch_rows,
+    load_series_rows,
+    series_arrow,
+)
+from .db import fetch_kpi_series, fetch_series_batch, fetch_series_for_orgs, fetch_signal_series  # noqa: F401
+from .rollups import (  # noqa: F401
+    build_rollup_rows,
+    fetch_rollup_window,
+    get_rollup_window,
+    refresh_rollups,
+    refresh_series_rollup,
+    window_from_rollups,
+)
+from .running_stats import RunningStats, load_running_stats, save_running_stats  # noqa: F401
 from .kpis import compute_kpi_delta, compute_rolling_average, get_kpi_series  # noqa: F401
-from .time import default_window, parse_date  # noqa: F401
-from .types import DateWindow, MetricSeriesPoint, SeriesResponse  # noqa: F401
+from .time import default_window, parse_date, resolve_window  # noqa: F401
+from .types import DateWindow, MetricSeriesPoint, RollupWindow, SeriesResponse  # noqa: F401
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .constants import DEFAULT_LOOKBACK_DAYS, DEFAULT_ORG_ID
+from .cache import series_from_rows
+from .db import fetch_series_batch
+from .time import resolve_window
+from ...schemas.insightops_analytics import SeriesBatchResponse
+
+
+def _unique(keys: Optional[Sequence[str]]) -> List[str]:
+    return list(dict.fromkeys(keys or []))
+
+
+async def get_series_batch(
+    db: AsyncSession,
+    org_id: str = DEFAULT_ORG_ID,
+    metric_keys: Optional[Sequence[str]] = None,
+    signal_keys: Optional[Sequence[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> SeriesBatchResponse:
+    """Fetch several KPI and engagement series with one query and split them per key."""
+    metric_keys = _unique(metric_keys)
+    signal_keys = _unique(signal_keys)
+    window_start, window_end = resolve_window(start_date, end_date, lookback_days)
+
+    kpi_rows, signal_rows = await fetch_series_batch(
+        db=db,
+        org_id=org_id,
+        metric_keys=metric_keys,
+        signal_keys=signal_keys,
+        start_date=window_start,
+        end_date=window_end,
+    )
+
+    return SeriesBatchResponse(
+        org_id=org_id,
+        start_date=window_start,
+        end_date=window_end,
+        kpis={key: series_from_rows(org_id, key, window_start, window_end, rows) for key, rows in kpi_rows.items()},
+        signals={key: series_from_rows(org_id, key, window_start, window_end, rows) for key, rows in signal_rows.items()},
+    )
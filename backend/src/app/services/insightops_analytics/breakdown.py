@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .constants import (
+    ALLOWED_KPI_KEYS,
+    BREAKDOWN_AGGREGATIONS,
+    BREAKDOWN_GRANULARITIES,
+    DEFAULT_LOOKBACK_DAYS,
+    DEFAULT_ORG_ID,
+    KPI_DIMENSIONS,
+)
+from .time import resolve_window
+from ...models.insightops import IoKpiDailyORM
+from ...schemas.insightops_analytics import KpiBreakdownResponse
+
+
+def _validate_breakdown(
+    metric_key: str,
+    group_by: Sequence[str],
+    filters: Mapping[str, Sequence[str]],
+    aggregation: str,
+    granularity: str,
+) -> None:
+    if metric_key not in ALLOWED_KPI_KEYS:
+        raise ValueError(f"Unsupported metric_key '{metric_key}'. Allowed: {sorted(ALLOWED_KPI_KEYS)}")
+    for dimension in [*group_by, *filters]:
+        if dimension not in KPI_DIMENSIONS:
+            raise ValueError(f"Unsupported dimension '{dimension}'. Allowed: {list(KPI_DIMENSIONS)}")
+    if len(set(group_by)) != len(group_by):
+        raise ValueError("group_by dimensions must be unique.")
+    if aggregation not in BREAKDOWN_AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation '{aggregation}'. Allowed: {list(BREAKDOWN_AGGREGATIONS)}")
+    if granularity not in BREAKDOWN_GRANULARITIES:
+        raise ValueError(f"Unsupported granularity '{granularity}'. Allowed: {list(BREAKDOWN_GRANULARITIES)}")
+
+
+def kpi_breakdown_statement(
+    org_id: str,
+    metric_key: str,
+    start_date,
+    end_date,
+    group_by: Sequence[str],
+    filters: Mapping[str, Sequence[str]],
+    aggregation: str,
+    granularity: str,
+):
+    """
+    One GROUP BY over io_kpi_daily. `last` sums the rows on each group's latest date in
+    the window (found with a window MAX), so at daily granularity it equals `sum`.
+    """
+    table = IoKpiDailyORM.__table__
+    conditions = [
+        table.c.org_id == org_id,
+        table.c.metric_key == metric_key,
+        table.c.kpi_date.between(start_date, end_date),
+    ]
+    for dimension, values in filters.items():
+        conditions.append(table.c[dimension].in_(list(values)))
+
+    group_cols = [table.c[dimension] for dimension in group_by]
+    if granularity == "day":
+        group_cols.append(table.c.kpi_date)
+
+    if aggregation == "last":
+        latest_date = func.max(table.c.kpi_date).over(partition_by=group_cols or None).label("latest_date")
+        ranked = select(*group_cols, table.c.metric_value, latest_date)
+        if granularity != "day":
+            ranked = ranked.add_columns(table.c.kpi_date)
+        ranked = ranked.where(*conditions).subquery()
+        group_cols = [ranked.c[col.name] for col in group_cols]
+        value = func.sum(case((ranked.c.kpi_date == ranked.c.latest_date, ranked.c.metric_value)))
+        stmt = select(*group_cols, value.label("value"), func.count().label("rows"))
+    else:
+        aggregate = func.sum if aggregation == "sum" else func.avg
+        stmt = select(*group_cols, aggregate(table.c.metric_value).label("value"), func.count().label("rows"))
+        stmt = stmt.where(*conditions)
+    return stmt.group_by(*group_cols).order_by(*group_cols)
+
+
+async def get_kpi_breakdown(
+    db: AsyncSession,
+    org_id: str = DEFAULT_ORG_ID,
+    metric_key: str = "revenue",
+    group_by: Optional[Sequence[str]] = None,
+    filters: Optional[Mapping[str, Sequence[str]]] = None,
+    aggregation: str = "sum",
+    granularity: str = "total",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> KpiBreakdownResponse:
+    """Filter and group a KPI by its dimension columns with the aggregation done in SQL."""
+    group_by = list(group_by or [])
+    filters = {dimension: list(values) for dimension, values in (filters or {}).items() if values}
+    _validate_breakdown(metric_key, group_by, filters, aggregation, granularity)
+    window_start, window_end = resolve_window(start_date, end_date, lookback_days)
+
+    stmt = kpi_breakdown_statement(
+        org_id, metric_key, window_start, window_end, group_by, filters, aggregation, granularity
+    )
+    result = await db.execute(stmt)
+
+    names = [*group_by, *(["date"] if granularity == "day" else [])]
+    columns: Dict[str, List] = {name: [] for name in [*names, "value", "rows"]}
+    source_names = [*group_by, *(["kpi_date"] if granularity == "day" else [])]
+    for row in result.mappings().all():
+        if not row["rows"]:
+            continue  # an ungrouped aggregate over no rows still returns one row
+        for name, source in zip(names, source_names):
+            columns[name].append(row[source])
+        columns["value"].append(float(row["value"]) if row["value"] is not None else None)
+        columns["rows"].append(int(row["rows"]))
+
+    return KpiBreakdownResponse(
+        org_id=org_id,
+        metric_key=metric_key,
+        start_date=window_start,
+        end_date=window_end,
+        aggregation=aggregation,
+        granularity=granularity,
+        group_by=group_by,
+        filters=filters,
+        columns=columns,
+    )
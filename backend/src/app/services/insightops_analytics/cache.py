@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from typing import Any, Dict, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .db import fetch_kpi_series, fetch_series_batch, fetch_signal_series
+from ...schemas.insightops_analytics import SeriesPoint, SeriesResponse
+
+SeriesCacheKey = Tuple[str, str, str, date, date]
+
+
+def series_from_rows(org_id: str, key: str, start_date: date, end_date: date, rows) -> SeriesResponse:
+    """Convert `{date, value}` rows into a `SeriesResponse`."""
+    points = [SeriesPoint(date=row["date"], value=float(row["value"])) for row in rows]
+    return SeriesResponse(org_id=org_id, key=key, start_date=start_date, end_date=end_date, points=points)
+
+
+class SeriesCache:
+    """
+    Request-scoped cache of KPI/signal series keyed by (kind, org, key, window).
+
+    Create one per request and pass it as `cache=` to the series loaders; each series
+    is then queried and converted to `SeriesPoint` once. Concurrent callers asking for
+    a series that is already loading wait on the in-flight load instead of querying.
+    Not meant to outlive the request: there is no eviction or invalidation.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[SeriesCacheKey, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_kpi_series(
+        self, db: AsyncSession, org_id: str, metric_key: str, start_date: date, end_date: date
+    ) -> SeriesResponse:
+        return await self._get(db, "kpi", org_id, metric_key, start_date, end_date)
+
+    async def get_signal_series(
+        self, db: AsyncSession, org_id: str, signal_key: str, start_date: date, end_date: date
+    ) -> SeriesResponse:
+        return await self._get(db, "signal", org_id, signal_key, start_date, end_date)
+
+    async def prefill(
+        self,
+        db: AsyncSession,
+        org_id: str,
+        metric_keys: Sequence[str],
+        signal_keys: Sequence[str],
+        start_date: date,
+        end_date: date,
+    ) -> None:
+        """Load several series in one `fetch_series_batch` round trip; later gets are hits."""
+        missing = {
+            kind: [k for k in dict.fromkeys(keys) if (kind, org_id, k, start_date, end_date) not in self._entries]
+            for kind, keys in (("kpi", metric_keys), ("signal", signal_keys))
+        }
+        if not missing["kpi"] and not missing["signal"]:
+            return
+        kpi_rows, signal_rows = await fetch_series_batch(
+            db=db,
+            org_id=org_id,
+            metric_keys=missing["kpi"],
+            signal_keys=missing["signal"],
+            start_date=start_date,
+            end_date=end_date,
+        )
+        loop = asyncio.get_running_loop()
+        for kind, rows_by_key in (("kpi", kpi_rows), ("signal", signal_rows)):
+            for key, rows in rows_by_key.items():
+                entry = loop.create_future()
+                entry.set_result(series_from_rows(org_id, key, start_date, end_date, rows))
+                self._entries[(kind, org_id, key, start_date, end_date)] = entry
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "series": len(self._entries)}
+
+    async def _get(
+        self, db: AsyncSession, kind: str, org_id: str, key: str, start_date: date, end_date: date
+    ) -> SeriesResponse:
+        cache_key = (kind, org_id, key, start_date, end_date)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            try:
+                series = await asyncio.shield(entry)
+            except asyncio.CancelledError:
+                if not entry.cancelled():
+                    raise
+                # The loading caller was cancelled (e.g. timed out); load it ourselves.
+            else:
+                self.hits += 1
+                return series
+
+        self.misses += 1
+        entry = asyncio.get_running_loop().create_future()
+        self._entries[cache_key] = entry
+        fetch = fetch_kpi_series if kind == "kpi" else fetch_signal_series
+        key_arg = "metric_key" if kind == "kpi" else "signal_key"
+        try:
+            rows = await fetch(db=db, org_id=org_id, start_date=start_date, end_date=end_date, **{key_arg: key})
+        except BaseException as exc:
+            # Drop the failed entry so a later caller can retry; waiters get the same error.
+            self._entries.pop(cache_key, None)
+            if isinstance(exc, asyncio.CancelledError):
+                entry.cancel()
+            else:
+                entry.set_exception(exc)
+                entry.exception()  # mark retrieved; avoids "never retrieved" noise when nobody waits
+            raise
+
+        series = series_from_rows(org_id, key, start_date, end_date, rows)
+        entry.set_result(series)
+        return series
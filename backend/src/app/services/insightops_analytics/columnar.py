@@ -0,0 +1,170 @@
+"""
+Columnar encodings of KPI/engagement series, built straight from DB rows.
+
+`SeriesResponse` validates and serializes one `SeriesPoint` per day; these helpers skip
+the per-point models: `columnar_payload` returns `dates[]`/`values[]` arrays (serialized
+with orjson by `columnar_json`) and `arrow_stream` writes an Arrow IPC stream with a
+`date` (date32) and `value` (float64) column. Arrow needs the optional `pyarrow` package.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .constants import DEFAULT_LOOKBACK_DAYS
+from .db import fetch_kpi_series, fetch_series_batch, fetch_signal_series
+from .time import resolve_window
+
+try:
+    import pyarrow as pa
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+SERIES_FORMATS = ("json", "columnar", "arrow")
+
+Rows = Iterable[Mapping[str, Any]]
+
+
+def _split(rows: Rows) -> Tuple[List[date], List[float]]:
+    dates: List[date] = []
+    values: List[float] = []
+    for row in rows:
+        dates.append(row["date"])
+        values.append(float(row["value"]))
+    return dates, values
+
+
+def columnar_payload(org_id: str, key: str, start_date: date, end_date: date, rows: Rows) -> Dict[str, Any]:
+    dates, values = _split(rows)
+    return {
+        "org_id": org_id,
+        "key": key,
+        "start_date": start_date,
+        "end_date": end_date,
+        "dates": dates,
+        "values": values,
+    }
+
+
+def batch_columnar_payload(
+    org_id: str,
+    start_date: date,
+    end_date: date,
+    kpi_rows: Mapping[str, list],
+    signal_rows: Mapping[str, list],
+) -> Dict[str, Any]:
+    def _arrays(rows: Rows) -> Dict[str, list]:
+        dates, values = _split(rows)
+        return {"dates": dates, "values": values}
+
+    return {
+        "org_id": org_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "kpis": {key: _arrays(rows) for key, rows in kpi_rows.items()},
+        "signals": {key: _arrays(rows) for key, rows in signal_rows.items()},
+    }
+
+
+def columnar_json(payload: Dict[str, Any]) -> bytes:
+    # orjson encodes date objects as ISO strings natively.
+    return orjson.dumps(payload)
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("Arrow output requires the pyarrow package")
+
+
+def series_table(rows: Rows, metadata: Optional[Mapping[str, str]] = None, **constant_columns: str):
+    """Arrow table of `date`/`value`, plus any string columns repeated for every row (e.g. key)."""
+    _require_pyarrow()
+    dates, values = _split(rows)
+    columns = {name: pa.array([value] * len(dates), type=pa.string()) for name, value in constant_columns.items()}
+    columns["date"] = pa.array(dates, type=pa.date32())
+    columns["value"] = pa.array(values, type=pa.float64())
+    return pa.table(columns, metadata=dict(metadata or {}))
+
+
+def arrow_stream(table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def series_arrow(org_id: str, key: str, start_date: date, end_date: date, rows: Rows) -> bytes:
+    metadata = {
+        "org_id": org_id,
+        "key": key,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+    }
+    return arrow_stream(series_table(rows, metadata=metadata))
+
+
+def batch_arrow(
+    org_id: str,
+    start_date: date,
+    end_date: date,
+    kpi_rows: Mapping[str, list],
+    signal_rows: Mapping[str, list],
+) -> bytes:
+    """One long table (kind, key, date, value) for a batch of series."""
+    _require_pyarrow()
+    tables = [
+        series_table(rows, kind=kind, key=key)
+        for kind, by_key in (("kpi", kpi_rows), ("signal", signal_rows))
+        for key, rows in by_key.items()
+    ]
+    metadata = {"org_id": org_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+    if not tables:
+        table = series_table([], metadata=metadata, kind="", key="")
+    else:
+        table = pa.concat_tables(tables).replace_schema_metadata(metadata)
+    return arrow_stream(table)
+
+
+async def load_series_rows(
+    db: AsyncSession,
+    kind: str,
+    org_id: str,
+    key: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> Tuple[date, date, List[Dict[str, Any]]]:
+    """Resolve the window like `get_kpi_series`/`get_signal_series` and return raw `{date, value}` rows."""
+    window_start, window_end = resolve_window(start_date, end_date, lookback_days)
+    if kind == "kpi":
+        rows = await fetch_kpi_series(db=db, org_id=org_id, metric_key=key, start_date=window_start, end_date=window_end)
+    else:
+        rows = await fetch_signal_series(db=db, org_id=org_id, signal_key=key, start_date=window_start, end_date=window_end)
+    return window_start, window_end, rows
+
+
+async def load_series_batch_rows(
+    db: AsyncSession,
+    org_id: str,
+    metric_keys: Sequence[str],
+    signal_keys: Sequence[str],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> Tuple[date, date, Dict[str, list], Dict[str, list]]:
+    """Raw-row counterpart of `get_series_batch`."""
+    window_start, window_end = resolve_window(start_date, end_date, lookback_days)
+    kpi_rows, signal_rows = await fetch_series_batch(
+        db=db,
+        org_id=org_id,
+        metric_keys=list(dict.fromkeys(metric_keys)),
+        signal_keys=list(dict.fromkeys(signal_keys)),
+        start_date=window_start,
+        end_date=window_end,
+    )
+    return window_start, window_end, kpi_rows, signal_rows
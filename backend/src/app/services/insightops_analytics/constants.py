@@ -3,3 +3,10 @@ DEFAULT_LOOKBACK_DAYS = 14
 
 ALLOWED_KPI_KEYS = {"revenue", "pipeline", "win_rate"}
 ALLOWED_SIGNAL_KEYS = {"touches", "replies", "meetings"}
+# Ratio KPIs: same-day rows are averaged into the daily point; every other series sums.
+RATIO_KPI_KEYS = frozenset({"win_rate"})
+
+# Dimension columns on io_kpi_daily that breakdowns may filter and group on.
+KPI_DIMENSIONS = ("region", "segment", "channel", "product")
+BREAKDOWN_AGGREGATIONS = ("sum", "avg", "last")
+BREAKDOWN_GRANULARITIES = ("total", "day")
@@ -1,12 +1,87 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence, Tuple
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .constants import ALLOWED_KPI_KEYS, ALLOWED_SIGNAL_KEYS
+from .constants import ALLOWED_KPI_KEYS, ALLOWED_SIGNAL_KEYS, RATIO_KPI_KEYS
+
+
+def daily_value_sql(key_col: str, value_col: str) -> str:
+    """Aggregate for one series' rows on one date: AVG for RATIO_KPI_KEYS, SUM otherwise.
+
+    `key_col` must be grouped on. Shared by the series queries, the rollup refresh and the
+    anomaly sweep so every path sees the same daily points.
+    """
+    ratios = ", ".join(f"'{key}'" for key in sorted(RATIO_KPI_KEYS))
+    return f"CASE WHEN {key_col} IN ({ratios}) THEN AVG({value_col}) ELSE SUM({value_col}) END"
+
+
+_KPI_VALUE = daily_value_sql("metric_key", "metric_value")
+_SIGNAL_VALUE = daily_value_sql("signal_key", "signal_value")
+
+# Hot query shapes, shared with optimization.index_advisor so EXPLAIN runs what production runs.
+# Series are daily: rows for the same date (one per region/segment/channel) become one point
+# (see `daily_value_sql`), which is also what the rollups (rollups.py) store.
+KPI_SERIES_SQL = f"""
+    SELECT kpi_date AS date, {_KPI_VALUE} AS value
+    FROM io_kpi_daily
+    WHERE org_id = :org_id
+      AND metric_key = :metric_key
+      AND kpi_date BETWEEN :start_date AND :end_date
+    GROUP BY metric_key, kpi_date
+    ORDER BY kpi_date ASC
+"""
+
+SIGNAL_SERIES_SQL = f"""
+    SELECT signal_date AS date, {_SIGNAL_VALUE} AS value
+    FROM io_engagement_signal_daily
+    WHERE org_id = :org_id
+      AND signal_key = :signal_key
+      AND signal_date BETWEEN :start_date AND :end_date
+    GROUP BY signal_key, signal_date
+    ORDER BY signal_date ASC
+"""
+
+KPI_BATCH_SELECT_SQL = f"""
+    SELECT 'kpi' AS kind, metric_key AS key, kpi_date AS date, {_KPI_VALUE} AS value
+    FROM io_kpi_daily
+    WHERE org_id = :org_id
+      AND metric_key IN :metric_keys
+      AND kpi_date BETWEEN :start_date AND :end_date
+    GROUP BY metric_key, kpi_date
+"""
+
+SIGNAL_BATCH_SELECT_SQL = f"""
+    SELECT 'signal' AS kind, signal_key AS key, signal_date AS date, {_SIGNAL_VALUE} AS value
+    FROM io_engagement_signal_daily
+    WHERE org_id = :org_id
+      AND signal_key IN :signal_keys
+      AND signal_date BETWEEN :start_date AND :end_date
+    GROUP BY signal_key, signal_date
+"""
+
+KPI_ORGS_BATCH_SELECT_SQL = f"""
+    SELECT org_id, 'kpi' AS kind, metric_key AS key, kpi_date AS date, {_KPI_VALUE} AS value
+    FROM io_kpi_daily
+    WHERE org_id IN :org_ids
+      AND metric_key IN :metric_keys
+      AND kpi_date BETWEEN :start_date AND :end_date
+    GROUP BY org_id, metric_key, kpi_date
+"""
+
+SIGNAL_ORGS_BATCH_SELECT_SQL = f"""
+    SELECT org_id, 'signal' AS kind, signal_key AS key, signal_date AS date, {_SIGNAL_VALUE} AS value
+    FROM io_engagement_signal_daily
+    WHERE org_id IN :org_ids
+      AND signal_key IN :signal_keys
+      AND signal_date BETWEEN :start_date AND :end_date
+    GROUP BY org_id, signal_key, signal_date
+"""
+
+OrgSeriesRows = Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]
 
 
 async def fetch_kpi_series(
@@ -19,16 +94,7 @@ async def fetch_kpi_series(
     if metric_key not in ALLOWED_KPI_KEYS:
         raise ValueError(f"Unsupported metric_key '{metric_key}'. Allowed: {sorted(ALLOWED_KPI_KEYS)}")
 
-    stmt = text(
-        """
-        SELECT kpi_date AS date, metric_value AS value
-        FROM io_kpi_daily
-        WHERE org_id = :org_id
-          AND metric_key = :metric_key
-          AND kpi_date BETWEEN :start_date AND :end_date
-        ORDER BY kpi_date ASC
-        """
-    )
+    stmt = text(KPI_SERIES_SQL)
     result = await db.execute(
         stmt,
         {
@@ -51,16 +117,7 @@ async def fetch_signal_series(
     if signal_key not in ALLOWED_SIGNAL_KEYS:
         raise ValueError(f"Unsupported signal_key '{signal_key}'. Allowed: {sorted(ALLOWED_SIGNAL_KEYS)}")
 
-    stmt = text(
-        """
-        SELECT signal_date AS date, signal_value AS value
-        FROM io_engagement_signal_daily
-        WHERE org_id = :org_id
-          AND signal_key = :signal_key
-          AND signal_date BETWEEN :start_date AND :end_date
-        ORDER BY signal_date ASC
-        """
-    )
+    stmt = text(SIGNAL_SERIES_SQL)
     result = await db.execute(
         stmt,
         {
@@ -71,3 +128,96 @@ async def fetch_signal_series(
         },
     )
     return [dict(row) for row in result.mappings().all()]
+
+
+def _validate_keys(metric_keys: Sequence[str], signal_keys: Sequence[str]) -> None:
+    unknown_metrics = sorted(set(metric_keys) - ALLOWED_KPI_KEYS)
+    if unknown_metrics:
+        raise ValueError(f"Unsupported metric_key '{unknown_metrics[0]}'. Allowed: {sorted(ALLOWED_KPI_KEYS)}")
+    unknown_signals = sorted(set(signal_keys) - ALLOWED_SIGNAL_KEYS)
+    if unknown_signals:
+        raise ValueError(f"Unsupported signal_key '{unknown_signals[0]}'. Allowed: {sorted(ALLOWED_SIGNAL_KEYS)}")
+    if not metric_keys and not signal_keys:
+        raise ValueError("At least one metric_key or signal_key is required.")
+
+
+async def fetch_series_batch(
+    db: AsyncSession,
+    org_id: str,
+    metric_keys: Sequence[str],
+    signal_keys: Sequence[str],
+    start_date: date,
+    end_date: date,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Fetch several KPI and engagement series for one org/window in a single round trip.
+
+    Returns (kpi_rows_by_key, signal_rows_by_key); every requested key is present, with
+    rows shaped like `fetch_kpi_series` / `fetch_signal_series` output.
+    """
+    _validate_keys(metric_keys, signal_keys)
+
+    selects: List[str] = []
+    params: Dict[str, Any] = {"org_id": org_id, "start_date": start_date, "end_date": end_date}
+    bind_keys = []
+    if metric_keys:
+        selects.append(KPI_BATCH_SELECT_SQL)
+        params["metric_keys"] = list(metric_keys)
+        bind_keys.append(bindparam("metric_keys", expanding=True))
+    if signal_keys:
+        selects.append(SIGNAL_BATCH_SELECT_SQL)
+        params["signal_keys"] = list(signal_keys)
+        bind_keys.append(bindparam("signal_keys", expanding=True))
+
+    stmt = text(" UNION ALL ".join(selects) + " ORDER BY kind, key, date ASC").bindparams(*bind_keys)
+    result = await db.execute(stmt, params)
+
+    kpi_rows: Dict[str, List[Dict[str, Any]]] = {key: [] for key in metric_keys}
+    signal_rows: Dict[str, List[Dict[str, Any]]] = {key: [] for key in signal_keys}
+    for row in result.mappings().all():
+        target = kpi_rows if row["kind"] == "kpi" else signal_rows
+        target[row["key"]].append({"date": row["date"], "value": row["value"]})
+    return kpi_rows, signal_rows
+
+
+async def fetch_series_for_orgs(
+    db: AsyncSession,
+    org_ids: Sequence[str],
+    metric_keys: Sequence[str],
+    signal_keys: Sequence[str],
+    start_date: date,
+    end_date: date,
+) -> Dict[str, OrgSeriesRows]:
+    """
+    Set-based variant of `fetch_series_batch` for many orgs in one round trip.
+
+    Returns {org_id: (kpi_rows_by_key, signal_rows_by_key)} with every requested org and
+    key present, so orgs without data still get (empty) series.
+    """
+    _validate_keys(metric_keys, signal_keys)
+    if not org_ids:
+        return {}
+
+    selects: List[str] = []
+    params: Dict[str, Any] = {"org_ids": list(org_ids), "start_date": start_date, "end_date": end_date}
+    bind_keys = [bindparam("org_ids", expanding=True)]
+    if metric_keys:
+        selects.append(KPI_ORGS_BATCH_SELECT_SQL)
+        params["metric_keys"] = list(metric_keys)
+        bind_keys.append(bindparam("metric_keys", expanding=True))
+    if signal_keys:
+        selects.append(SIGNAL_ORGS_BATCH_SELECT_SQL)
+        params["signal_keys"] = list(signal_keys)
+        bind_keys.append(bindparam("signal_keys", expanding=True))
+
+    stmt = text(" UNION ALL ".join(selects) + " ORDER BY org_id, kind, key, date ASC").bindparams(*bind_keys)
+    result = await db.execute(stmt, params)
+
+    by_org: Dict[str, OrgSeriesRows] = {
+        org_id: ({key: [] for key in metric_keys}, {key: [] for key in signal_keys}) for org_id in org_ids
+    }
+    for row in result.mappings().all():
+        kpi_rows, signal_rows = by_org[row["org_id"]]
+        target = kpi_rows if row["kind"] == "kpi" else signal_rows
+        target[row["key"]].append({"date": row["date"], "value": row["value"]})
+    return by_org
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .constants import ALLOWED_KPI_KEYS, DEFAULT_LOOKBACK_DAYS, DEFAULT_ORG_ID
 from .db import fetch_kpi_series
+from .rollups import ROLLING_WINDOW
 from .time import default_window, parse_date
+from .types import RollupWindow
 from ...schemas.insightops_analytics import DeltaSummary, SeriesPoint, SeriesResponse
 
+if TYPE_CHECKING:
+    from .cache import SeriesCache
+    from .running_stats import RunningStats
+
 
 async def get_kpi_series(
     db: AsyncSession,
@@ -18,8 +24,9 @@ async def get_kpi_series(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: Optional["SeriesCache"] = None,
 ) -> SeriesResponse:
-    """Fetch KPI series for an org/metric with safe defaults."""
+    """Fetch KPI series for an org/metric with safe defaults (via `cache` when given)."""
     if metric_key not in ALLOWED_KPI_KEYS:
         raise ValueError(f"Unsupported metric_key '{metric_key}'. Allowed: {sorted(ALLOWED_KPI_KEYS)}")
 
@@ -31,6 +38,9 @@ async def get_kpi_series(
         window_start = parsed_start
         window_end = parsed_end or parsed_start
 
+    if cache is not None:
+        return await cache.get_kpi_series(db, org_id, metric_key, window_start, window_end)
+
     rows = await fetch_kpi_series(
         db=db,
         org_id=org_id,
@@ -43,8 +53,17 @@ async def get_kpi_series(
     return SeriesResponse(org_id=org_id, key=metric_key, start_date=window_start, end_date=window_end, points=points)
 
 
-def compute_kpi_delta(points: List[SeriesPoint], rolling_avg_window: int = 7) -> DeltaSummary:
-    """Compute latest vs previous deltas from a time-ordered series."""
+def compute_kpi_delta(
+    points: List[SeriesPoint],
+    rolling_avg_window: int = 7,
+    rollup: Optional[RollupWindow] = None,
+    stats: Optional["RunningStats"] = None,
+) -> DeltaSummary:
+    """Compute latest vs previous deltas from a time-ordered series, or from a rollup window or running stats when given."""
+    if rollup is not None:
+        return _delta_from_rollup(rollup, rolling_avg_window)
+    if stats is not None:
+        points = stats.recent(max(rolling_avg_window, 2))
     if not points:
         return DeltaSummary(
             latest_value=None,
@@ -72,10 +91,32 @@ def compute_kpi_delta(points: List[SeriesPoint], rolling_avg_window: int = 7) ->
     )
 
 
-def compute_rolling_average(points: List[SeriesPoint], window: int = 7) -> Optional[float]:
+def _delta_from_rollup(rollup: RollupWindow, rolling_avg_window: int) -> DeltaSummary:
+    if rolling_avg_window != ROLLING_WINDOW:
+        raise ValueError(f"Rollups carry {ROLLING_WINDOW}-point averages; pass points for other windows.")
+    latest = rollup.latest_value
+    previous = rollup.previous_value
+    absolute_delta = latest - previous if latest is not None and previous is not None else None
+    percent_delta = None
+    if absolute_delta is not None and previous != 0:
+        percent_delta = (absolute_delta / previous) * 100  # type: ignore[operator]
+    return DeltaSummary(
+        latest_value=latest,
+        previous_value=previous,
+        absolute_delta=absolute_delta,
+        percent_delta=percent_delta,
+        rolling_avg_7d_latest=rollup.rolling_avg_7d,
+    )
+
+
+def compute_rolling_average(
+    points: List[SeriesPoint], window: int = 7, stats: Optional["RunningStats"] = None
+) -> Optional[float]:
     """Return trailing average over the given window size."""
     if window <= 0:
         raise ValueError("window must be positive")
+    if stats is not None:
+        points = stats.recent(window)
     if not points:
         return None
     window_points = points[-window:] if len(points) >= window else points
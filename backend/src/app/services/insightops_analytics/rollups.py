@@ -0,0 +1,344 @@
+"""
+Daily rollups for InsightOps KPI and engagement series.
+
+Each `io_series_rollup_daily` row holds the day's value (raw rows summed per date, or
+averaged for ratio KPIs; see `daily_value_sql`) together with running aggregates: the
+day's ordinal within the series, the cumulative sum, the previous day with data and the
+trailing 7-point average. Any window summary then needs only two rows: the last day
+inside the window and the last day before it.
+
+Refresh is incremental. Raw rows whose `updated_at` is past the series watermark mark
+the earliest affected date; rollup rows from that date on are rebuilt, seeded from the
+rows just before it. Deleted raw rows are not detected; pass `full=True` to rebuild.
+
+`updated_at` is stamped when the writing transaction starts (Postgres `now()`), so a long
+load can commit rows stamped behind a watermark a refresh already stored. The stored
+watermark therefore never passes `INSIGHTOPS_ROLLUP_RESCAN_SECONDS` before the refresh:
+rows stamped inside that window are re-scanned on the next run, so nothing from a load
+shorter than the window is missed. Reads double-check: a series with any raw row past its
+stored watermark (late rows, loads since the refresh, and so also rows from the last
+rescan window) is served from raw rows until a later refresh covers them.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, DateTime, String, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .constants import ALLOWED_KPI_KEYS, ALLOWED_SIGNAL_KEYS, DEFAULT_LOOKBACK_DAYS
+from .db import daily_value_sql
+from .time import resolve_window
+from .types import RollupWindow
+from ...core.config import get_settings
+from ...models.insightops import IoSeriesRollupDailyORM, IoSeriesRollupStateORM
+
+ROLLING_WINDOW = 7
+
+# kind -> (source table, date column, key column, value column)
+ROLLUP_SOURCES: Dict[str, Tuple[str, str, str, str]] = {
+    "kpi": ("io_kpi_daily", "kpi_date", "metric_key", "metric_value"),
+    "signal": ("io_engagement_signal_daily", "signal_date", "signal_key", "signal_value"),
+}
+
+_ROLLUP_COLUMNS = "rollup_date, day_value, ordinal, cum_value, prev_date, prev_value, rolling_avg_7d"
+
+ROLLUP_WINDOW_SQL = f"""
+    SELECT 'latest' AS slot, {_ROLLUP_COLUMNS} FROM (
+        SELECT {_ROLLUP_COLUMNS}
+        FROM io_series_rollup_daily
+        WHERE org_id = :org_id AND series_kind = :kind AND series_key = :key
+          AND rollup_date BETWEEN :start_date AND :end_date
+        ORDER BY rollup_date DESC
+        LIMIT 1
+    ) latest
+    UNION ALL
+    SELECT 'before' AS slot, {_ROLLUP_COLUMNS} FROM (
+        SELECT {_ROLLUP_COLUMNS}
+        FROM io_series_rollup_daily
+        WHERE org_id = :org_id AND series_kind = :kind AND series_key = :key
+          AND rollup_date < :start_date
+        ORDER BY rollup_date DESC
+        LIMIT 1
+    ) before_start
+    UNION ALL
+    SELECT 'state' AS slot, NULL, NULL, NULL, NULL, NULL, NULL, NULL
+    FROM io_series_rollup_state s
+    WHERE s.org_id = :org_id AND s.series_kind = :kind AND s.series_key = :key
+      AND NOT EXISTS (
+        SELECT 1 FROM {{table}} r
+        WHERE r.org_id = s.org_id AND r.{{key_col}} = s.series_key
+          AND (s.source_watermark IS NULL OR r.updated_at > s.source_watermark)
+      )
+"""
+
+
+def _kind_source(kind: str) -> Tuple[str, str, str, str]:
+    if kind not in ROLLUP_SOURCES:
+        raise ValueError(f"Unsupported rollup kind '{kind}'. Allowed: {sorted(ROLLUP_SOURCES)}")
+    return ROLLUP_SOURCES[kind]
+
+
+def _as_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def build_rollup_rows(
+    org_id: str,
+    kind: str,
+    key: str,
+    daily: Sequence[Tuple[date, float]],
+    seed: Sequence[Mapping[str, Any]] = (),
+) -> List[Dict[str, Any]]:
+    """
+    Build rollup rows for ascending `(date, value)` daily totals.
+
+    `seed` holds the existing rollup rows immediately before the first date (ascending,
+    at most `ROLLING_WINDOW - 1` needed) so running aggregates continue from them.
+    """
+    recent: List[float] = [float(row["day_value"]) for row in seed][-(ROLLING_WINDOW - 1):]
+    last = seed[-1] if seed else None
+    ordinal = int(last["ordinal"]) if last else 0
+    cum_value = float(last["cum_value"]) if last else 0.0
+    prev_date = last["rollup_date"] if last else None
+    prev_value = float(last["day_value"]) if last else None
+
+    rows: List[Dict[str, Any]] = []
+    for day, value in daily:
+        value = float(value)
+        ordinal += 1
+        cum_value += value
+        recent.append(value)
+        recent = recent[-ROLLING_WINDOW:]
+        rows.append(
+            {
+                "org_id": org_id,
+                "series_kind": kind,
+                "series_key": key,
+                "rollup_date": day,
+                "day_value": value,
+                "ordinal": ordinal,
+                "cum_value": cum_value,
+                "prev_date": prev_date,
+                "prev_value": prev_value,
+                "rolling_avg_7d": sum(recent) / len(recent),
+            }
+        )
+        prev_date, prev_value = day, value
+    return rows
+
+
+def window_from_rollups(
+    start_date: date,
+    end_date: date,
+    latest: Optional[Mapping[str, Any]],
+    before: Optional[Mapping[str, Any]],
+) -> RollupWindow:
+    """Derive window aggregates from the last rollup row in the window and the last one before it."""
+    if latest is None:
+        return RollupWindow(start_date=start_date, end_date=end_date, days=0, total=0.0)
+
+    before_ordinal = int(before["ordinal"]) if before else 0
+    before_cum = float(before["cum_value"]) if before else 0.0
+    days = int(latest["ordinal"]) - before_ordinal
+    total = float(latest["cum_value"]) - before_cum
+    if days >= ROLLING_WINDOW:
+        rolling = _as_float(latest["rolling_avg_7d"])
+    else:
+        rolling = total / days
+
+    return RollupWindow(
+        start_date=start_date,
+        end_date=end_date,
+        days=days,
+        total=total,
+        latest_date=latest["rollup_date"],
+        latest_value=_as_float(latest["day_value"]),
+        previous_value=_as_float(latest["prev_value"]) if days >= 2 else None,
+        rolling_avg_7d=rolling,
+    )
+
+
+async def fetch_rollup_window(
+    db: AsyncSession,
+    kind: str,
+    org_id: str,
+    key: str,
+    start_date: date,
+    end_date: date,
+) -> Optional[RollupWindow]:
+    """Return window aggregates from rollups, or None when the series has not been rolled up
+    or has raw rows the last refresh did not cover."""
+    table, _, key_col, _ = _kind_source(kind)
+    result = await db.execute(
+        text(ROLLUP_WINDOW_SQL.format(table=table, key_col=key_col)),
+        {"org_id": org_id, "kind": kind, "key": key, "start_date": start_date, "end_date": end_date},
+    )
+    slots = {row["slot"]: row for row in result.mappings().all()}
+    if "state" not in slots:
+        return None
+    return window_from_rollups(start_date, end_date, slots.get("latest"), slots.get("before"))
+
+
+async def get_rollup_window(
+    db: AsyncSession,
+    kind: str,
+    org_id: str,
+    key: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> Optional[RollupWindow]:
+    """
+    Resolve a summary window from rollups when INSIGHTOPS_ROLLUPS_ENABLED is set.
+
+    Returns None when rollups are disabled, or the series has not been rolled up yet or
+    changed since, in which case callers fall back to loading the raw series.
+    """
+    allowed = ALLOWED_KPI_KEYS if kind == "kpi" else ALLOWED_SIGNAL_KEYS
+    if key not in allowed:
+        label = "metric_key" if kind == "kpi" else "signal_key"
+        raise ValueError(f"Unsupported {label} '{key}'. Allowed: {sorted(allowed)}")
+    if not get_settings().INSIGHTOPS_ROLLUPS_ENABLED:
+        return None
+    window_start, window_end = resolve_window(start_date, end_date, lookback_days)
+    return await fetch_rollup_window(db, kind, org_id, key, window_start, window_end)
+
+
+async def _dirty_series(db: AsyncSession, kind: str, org_id: Optional[str], full: bool) -> List[Dict[str, Any]]:
+    table, date_col, key_col, _ = _kind_source(kind)
+    watermark_filter = "TRUE" if full else "(s.source_watermark IS NULL OR r.updated_at > s.source_watermark)"
+    org_filter = "AND r.org_id = :org_id" if org_id else ""
+    stmt = text(
+        f"""
+        SELECT r.org_id AS org_id, r.{key_col} AS series_key,
+               MIN(r.{date_col}) AS min_date, MAX(r.updated_at) AS watermark
+        FROM {table} r
+        LEFT JOIN io_series_rollup_state s
+          ON s.org_id = r.org_id AND s.series_kind = :kind AND s.series_key = r.{key_col}
+        WHERE {watermark_filter} {org_filter}
+        GROUP BY r.org_id, r.{key_col}
+        """
+    ).columns(org_id=String, series_key=String, min_date=Date, watermark=DateTime(timezone=True))
+    result = await db.execute(stmt, {"kind": kind, "org_id": org_id})
+    return [dict(row) for row in result.mappings().all()]
+
+
+async def refresh_series_rollup(
+    db: AsyncSession,
+    kind: str,
+    org_id: str,
+    key: str,
+    from_date: date,
+    watermark: Optional[datetime],
+) -> int:
+    """Rebuild one series' rollup rows from `from_date` onward and advance its watermark."""
+    table, date_col, key_col, value_col = _kind_source(kind)
+    scope = {"org_id": org_id, "kind": kind, "key": key, "from_date": from_date}
+
+    seed_result = await db.execute(
+        text(
+            """
+            SELECT rollup_date, day_value, ordinal, cum_value
+            FROM io_series_rollup_daily
+            WHERE org_id = :org_id AND series_kind = :kind AND series_key = :key
+              AND rollup_date < :from_date
+            ORDER BY rollup_date DESC
+            LIMIT :seed_limit
+            """
+        ).columns(rollup_date=Date),
+        {**scope, "seed_limit": ROLLING_WINDOW - 1},
+    )
+    seed = list(reversed(seed_result.mappings().all()))
+
+    daily_result = await db.execute(
+        text(
+            f"""
+            SELECT {date_col} AS date, {daily_value_sql(key_col, value_col)} AS value
+            FROM {table}
+            WHERE org_id = :org_id AND {key_col} = :key AND {date_col} >= :from_date
+            GROUP BY {key_col}, {date_col}
+            ORDER BY {date_col} ASC
+            """
+        ).columns(date=Date),
+        scope,
+    )
+    daily = [(row["date"], row["value"]) for row in daily_result.mappings().all()]
+    rows = build_rollup_rows(org_id, kind, key, daily, seed)
+
+    await db.execute(
+        text(
+            """
+            DELETE FROM io_series_rollup_daily
+            WHERE org_id = :org_id AND series_kind = :kind AND series_key = :key
+              AND rollup_date >= :from_date
+            """
+        ),
+        scope,
+    )
+    if rows:
+        await db.execute(insert(IoSeriesRollupDailyORM), rows)
+
+    await db.execute(
+        text("DELETE FROM io_series_rollup_state WHERE org_id = :org_id AND series_kind = :kind AND series_key = :key"),
+        scope,
+    )
+    await db.execute(
+        insert(IoSeriesRollupStateORM),
+        [
+            {
+                "org_id": org_id,
+                "series_kind": kind,
+                "series_key": key,
+                "source_watermark": watermark,
+                "refreshed_at": datetime.now(timezone.utc),
+            }
+        ],
+    )
+    await db.commit()
+    return len(rows)
+
+
+def _held_back(watermark: Optional[datetime], settled: datetime) -> Optional[datetime]:
+    """The watermark to store: at most `settled`, so recent rows are re-scanned next time."""
+    if watermark is None:
+        return None
+    if watermark.tzinfo is None:
+        watermark = watermark.replace(tzinfo=timezone.utc)
+    return min(watermark, settled)
+
+
+async def refresh_rollups(
+    db: AsyncSession,
+    org_id: Optional[str] = None,
+    kinds: Sequence[str] = ("kpi", "signal"),
+    full: bool = False,
+    rescan_seconds: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Incrementally refresh rollups for every series with rows past its watermark.
+
+    `rescan_seconds` defaults to `INSIGHTOPS_ROLLUP_RESCAN_SECONDS`.
+
+    Returns counts of refreshed series and rewritten rollup rows. Each series commits on
+    its own so a long refresh makes progress and readers never see a half-built series.
+    """
+    series_count = 0
+    row_count = 0
+    if rescan_seconds is None:
+        rescan_seconds = get_settings().INSIGHTOPS_ROLLUP_RESCAN_SECONDS
+    settled = datetime.now(timezone.utc) - timedelta(seconds=rescan_seconds)
+    for kind in kinds:
+        for dirty in await _dirty_series(db, kind, org_id, full):
+            row_count += await refresh_series_rollup(
+                db,
+                kind=kind,
+                org_id=dirty["org_id"],
+                key=dirty["series_key"],
+                from_date=dirty["min_date"],
+                watermark=_held_back(dirty["watermark"], settled),
+            )
+            series_count += 1
+    return {"series": series_count, "rows": row_count}
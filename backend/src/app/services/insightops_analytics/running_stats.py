@@ -0,0 +1,130 @@
+"""
+Incremental statistics for one KPI/engagement series.
+
+`RunningStats` keeps the points of the last `lookback_days` (the same window as
+`default_window(latest date, lookback_days)`) and their running sum. Pushing a point
+adds it and evicts the points that fell out of the window, subtracting them from the
+sum, so the state always describes the window the full-series summaries read.
+That is everything `compute_kpi_delta`, `compute_rolling_average`, `aggregate_signals`,
+`compute_engagement_health` and the spike/collapse/flatline rules read from a series,
+so each of them accepts `stats=` in place of the full point list.
+
+States are persisted per (org, kind, key) in `io_series_stats_state` as JSON.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .constants import ALLOWED_KPI_KEYS, ALLOWED_SIGNAL_KEYS, DEFAULT_LOOKBACK_DAYS
+from ...models.insightops import IoSeriesStatsStateORM
+from ...schemas.insightops_analytics import SeriesPoint
+
+
+class RunningStats(BaseModel):
+    lookback_days: int = Field(DEFAULT_LOOKBACK_DAYS, gt=0)
+    total: float = 0.0
+    dates: List[date] = Field(default_factory=list)
+    values: List[float] = Field(default_factory=list)
+
+    @classmethod
+    def from_points(cls, points: Iterable[SeriesPoint], lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> "RunningStats":
+        stats = cls(lookback_days=lookback_days)
+        for point in points:
+            stats.push(point.date, point.value)
+        return stats
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    def push(self, point_date: date, value: float) -> None:
+        """Add the next point; points must arrive in date order (equal dates are allowed)."""
+        if self.dates and point_date < self.dates[-1]:
+            raise ValueError(f"Out-of-order point {point_date} after {self.dates[-1]}; rebuild the stats.")
+        value = float(value)
+        self.total += value
+        self.dates.append(point_date)
+        self.values.append(value)
+        self.evict_before(point_date - timedelta(days=self.lookback_days))
+
+    def evict_before(self, cutoff: date) -> int:
+        """Drop points dated before `cutoff` (e.g. the start of today's window); returns how many went."""
+        evicted = 0
+        while self.dates and self.dates[0] < cutoff:
+            self.total -= self.values[0]
+            del self.dates[0], self.values[0]
+            evicted += 1
+        if not self.values:
+            self.total = 0.0
+        return evicted
+
+    @property
+    def latest(self) -> Optional[SeriesPoint]:
+        if not self.values:
+            return None
+        return SeriesPoint(date=self.dates[-1], value=self.values[-1])
+
+    @property
+    def previous(self) -> Optional[SeriesPoint]:
+        if len(self.values) < 2:
+            return None
+        return SeriesPoint(date=self.dates[-2], value=self.values[-2])
+
+    def recent(self, count: int) -> List[SeriesPoint]:
+        """The last `count` points in the window (fewer if the window holds fewer)."""
+        pairs = list(zip(self.dates, self.values))[-count:] if count > 0 else []
+        return [SeriesPoint(date=d, value=v) for d, v in pairs]
+
+    def baseline_mean(self) -> Optional[float]:
+        """Mean of the window's points before the latest (the spike/collapse baseline)."""
+        if self.count < 2:
+            return None
+        return (self.total - self.values[-1]) / (self.count - 1)
+
+
+def _validate_series(kind: str, key: str) -> None:
+    allowed = {"kpi": ALLOWED_KPI_KEYS, "signal": ALLOWED_SIGNAL_KEYS}.get(kind)
+    if allowed is None:
+        raise ValueError(f"Unsupported series kind '{kind}'.")
+    if key not in allowed:
+        raise ValueError(f"Unsupported {kind} key '{key}'. Allowed: {sorted(allowed)}")
+
+
+async def load_running_stats(db: AsyncSession, kind: str, org_id: str, key: str) -> Optional[RunningStats]:
+    _validate_series(kind, key)
+    result = await db.execute(
+        select(IoSeriesStatsStateORM.stats_json).where(
+            IoSeriesStatsStateORM.org_id == org_id,
+            IoSeriesStatsStateORM.series_kind == kind,
+            IoSeriesStatsStateORM.series_key == key,
+        )
+    )
+    payload = result.scalar_one_or_none()
+    return RunningStats.model_validate(payload) if payload is not None else None
+
+
+async def save_running_stats(db: AsyncSession, kind: str, org_id: str, key: str, stats: RunningStats) -> None:
+    """Upsert the state for (org, kind, key); the caller commits."""
+    _validate_series(kind, key)
+    latest = stats.latest
+    values = {
+        "org_id": org_id,
+        "series_kind": kind,
+        "series_key": key,
+        "stats_json": stats.model_dump(mode="json"),
+        "last_date": latest.date if latest else None,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    stmt = pg_insert(IoSeriesStatsStateORM).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["org_id", "series_kind", "series_key"],
+        set_={name: stmt.excluded[name] for name in ("stats_json", "last_date", "updated_at")},
+    )
+    await db.execute(stmt)
@@ -28,3 +28,15 @@ def default_window(end_date: date | None, lookback_days: int) -> tuple[date, dat
         raise ValueError("start_date cannot be after end_date")
 
     return start_date, effective_end
+
+
+def resolve_window(start_date: str | None, end_date: str | None, lookback_days: int) -> tuple[date, date]:
+    """
+    Resolve optional ISO start/end strings into a concrete window, falling back to a
+    lookback window ending at `end_date` (or today) when no start is given.
+    """
+    parsed_start = parse_date(start_date)
+    parsed_end = parse_date(end_date)
+    if parsed_start is None:
+        return default_window(parsed_end, lookback_days)
+    return parsed_start, parsed_end or parsed_start
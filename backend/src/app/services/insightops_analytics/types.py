@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
@@ -26,3 +26,16 @@ class SeriesResponse(BaseModel):
     points: List[MetricSeriesPoint]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RollupWindow(BaseModel):
+    """Window aggregates derived from two rollup rows instead of a scan of raw points."""
+
+    start_date: date
+    end_date: date
+    days: int
+    total: float
+    latest_date: Optional[date] = None
+    latest_value: Optional[float] = None
+    previous_value: Optional[float] = None
+    rolling_avg_7d: Optional[float] = None
@@ -5,7 +5,7 @@ from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..schemas.insightops_analytics import Anomaly, AnomalyResponse, SeriesPoint
-from .insightops_analytics import ALLOWED_KPI_KEYS, ALLOWED_SIGNAL_KEYS, DEFAULT_LOOKBACK_DAYS, DEFAULT_ORG_ID, default_window, fetch_kpi_series, fetch_signal_series, parse_date
+from .insightops_analytics import ALLOWED_KPI_KEYS, ALLOWED_SIGNAL_KEYS, DEFAULT_LOOKBACK_DAYS, DEFAULT_ORG_ID, RunningStats, SeriesCache, default_window, fetch_kpi_series, fetch_signal_series, parse_date
 
 # Thresholds
 SPIKE_THRESHOLD_PCT = 0.30  # 30% deviation
@@ -21,6 +21,7 @@ async def _load_kpi_points(
     start_date: Optional[str],
     end_date: Optional[str],
     lookback_days: int,
+    cache: Optional[SeriesCache] = None,
 ) -> List[SeriesPoint]:
     parsed_start = parse_date(start_date)
     parsed_end = parse_date(end_date)
@@ -30,6 +31,10 @@ async def _load_kpi_points(
         window_start = parsed_start
         window_end = parsed_end or parsed_start
 
+    if cache is not None:
+        series = await cache.get_kpi_series(db, org_id, metric_key, window_start, window_end)
+        return series.points
+
     rows = await fetch_kpi_series(
         db=db,
         org_id=org_id,
@@ -47,6 +52,7 @@ async def _load_signal_points(
     start_date: Optional[str],
     end_date: Optional[str],
     lookback_days: int,
+    cache: Optional[SeriesCache] = None,
 ) -> List[SeriesPoint]:
     parsed_start = parse_date(start_date)
     parsed_end = parse_date(end_date)
@@ -56,6 +62,10 @@ async def _load_signal_points(
         window_start = parsed_start
         window_end = parsed_end or parsed_start
 
+    if cache is not None:
+        series = await cache.get_signal_series(db, org_id, signal_key, window_start, window_end)
+        return series.points
+
     rows = await fetch_signal_series(
         db=db,
         org_id=org_id,
@@ -103,7 +113,20 @@ def _maybe_add_gap_anomaly(anomalies: List[dict], points: List[SeriesPoint]) ->
             )
 
 
-def compute_kpi_anomalies(points: List[SeriesPoint]) -> List[dict]:
+def _baseline_pair(stats: RunningStats) -> List[SeriesPoint]:
+    # Spike/collapse compare the latest point with the mean of the earlier points in the
+    # window, and the gap rule with the previous date; a stand-in previous point carrying
+    # that mean gives the list-based rules the same inputs for the latest point.
+    if stats.count < 2:
+        return [stats.latest] if stats.latest else []
+    previous, latest = stats.previous, stats.latest
+    return [SeriesPoint(date=previous.date, value=stats.baseline_mean()), latest]
+
+
+def compute_kpi_anomalies(points: List[SeriesPoint], stats: Optional[RunningStats] = None) -> List[dict]:
+    """Scan a series; with `stats`, score only its latest point from the running state."""
+    if stats is not None:
+        points = _baseline_pair(stats)
     anomalies: List[dict] = []
     if not points:
         return anomalies
@@ -112,11 +135,7 @@ def compute_kpi_anomalies(points: List[SeriesPoint]) -> List[dict]:
     return anomalies
 
 
-def compute_engagement_anomalies(points: List[SeriesPoint]) -> List[dict]:
-    anomalies: List[dict] = []
-    if not points:
-        return anomalies
-
+def _maybe_add_flatline_anomaly(anomalies: List[dict], points: List[SeriesPoint]) -> None:
     # Flatline: last N days all zero
     tail = points[-FLATLINE_DAYS:] if len(points) >= FLATLINE_DAYS else points
     if len(tail) >= FLATLINE_DAYS and all(p.value == 0 for p in tail):
@@ -129,6 +148,8 @@ def compute_engagement_anomalies(points: List[SeriesPoint]) -> List[dict]:
             }
         )
 
+
+def _maybe_add_collapse_anomaly(anomalies: List[dict], points: List[SeriesPoint]) -> None:
     # Sudden collapse: last value < 50% of prior average
     if len(points) >= 2:
         baseline_points = points[:-1]
@@ -146,6 +167,18 @@ def compute_engagement_anomalies(points: List[SeriesPoint]) -> List[dict]:
                 }
             )
 
+
+def compute_engagement_anomalies(points: List[SeriesPoint], stats: Optional[RunningStats] = None) -> List[dict]:
+    """Scan a series; with `stats`, score only its latest point from the running state."""
+    anomalies: List[dict] = []
+    if stats is not None:
+        _maybe_add_flatline_anomaly(anomalies, stats.recent(FLATLINE_DAYS))
+        _maybe_add_collapse_anomaly(anomalies, _baseline_pair(stats))
+        return anomalies
+    if not points:
+        return anomalies
+    _maybe_add_flatline_anomaly(anomalies, points)
+    _maybe_add_collapse_anomaly(anomalies, points)
     return anomalies
 
 
@@ -157,6 +190,7 @@ async def get_anomalies(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: Optional[SeriesCache] = None,
 ) -> AnomalyResponse:
     if metric_key and signal_key:
         raise ValueError("Provide either metric_key or signal_key, not both.")
@@ -170,6 +204,7 @@ async def get_anomalies(
             start_date=start_date,
             end_date=end_date,
             lookback_days=lookback_days,
+            cache=cache,
         )
         return AnomalyResponse(
             org_id=org_id, anomalies=[Anomaly.model_validate(a) for a in compute_engagement_anomalies(points)]
@@ -184,6 +219,7 @@ async def get_anomalies(
             start_date=start_date,
             end_date=end_date,
             lookback_days=lookback_days,
+            cache=cache,
         )
         return AnomalyResponse(org_id=org_id, anomalies=[Anomaly.model_validate(a) for a in compute_kpi_anomalies(points)])
     raise ValueError("metric_key or signal_key is required to compute anomalies.")
@@ -0,0 +1,199 @@
+"""
+Vectorized anomaly scoring for many InsightOps series at once.
+
+Series are laid out on a shared daily calendar as a 2D float array (one row per series,
+one column per day, NaN where a day has no data). Every rule is evaluated for every
+point in one NumPy pass:
+
+- deviation of each point from its baseline (mean of the prior points in the window, or
+  of the prior `baseline_days` calendar days), flagged as a spike/drop at
+  SPIKE_THRESHOLD_PCT
+- gaps: days since the previous observed point, flagged above KPI_GAP_THRESHOLD_DAYS
+- flatlines: runs of observed zeros reaching FLATLINE_DAYS
+- collapses: points at or below (1 - COLLAPSE_THRESHOLD_PCT) of a positive baseline
+
+With the default expanding baseline, the rules at each series' last point reproduce
+`compute_kpi_anomalies` / `compute_engagement_anomalies` for one point per day.
+Several raw rows on the same date are summed into that day.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .insightops_anomalies import (
+    COLLAPSE_THRESHOLD_PCT,
+    FLATLINE_DAYS,
+    KPI_GAP_THRESHOLD_DAYS,
+    SPIKE_THRESHOLD_PCT,
+)
+
+
+def build_series_matrix(
+    series: Mapping[str, Iterable[Tuple[date, float]]],
+    start_date: date,
+    end_date: date,
+) -> Tuple[List[str], np.ndarray]:
+    """Lay `(date, value)` pairs per key onto a `[start_date, end_date]` daily grid.
+
+    Returns the row keys and a `(len(keys), n_days)` array; days without data are NaN.
+    Points outside the window are ignored.
+    """
+    if start_date > end_date:
+        raise ValueError("start_date cannot be after end_date")
+    keys = list(series)
+    n_days = (end_date - start_date).days + 1
+    values = np.full((len(keys), n_days), np.nan)
+    for row, key in enumerate(keys):
+        pairs = [(d, v) for d, v in series[key] if start_date <= d <= end_date]
+        if not pairs:
+            continue
+        cols = np.fromiter(((d - start_date).days for d, _ in pairs), dtype=np.int64, count=len(pairs))
+        vals = np.fromiter((float(v) for _, v in pairs), dtype=float, count=len(pairs))
+        day_totals = np.zeros(n_days)
+        np.add.at(day_totals, cols, vals)
+        seen = np.zeros(n_days, dtype=bool)
+        seen[cols] = True
+        values[row, seen] = day_totals[seen]
+    return keys, values
+
+
+def _shift_right(arr: np.ndarray, fill: Any) -> np.ndarray:
+    shifted = np.empty_like(arr)
+    shifted[:, 0] = fill
+    shifted[:, 1:] = arr[:, :-1]
+    return shifted
+
+
+class AnomalyScan:
+    """Per-point scores and rule masks for a `(n_series, n_days)` value matrix."""
+
+    def __init__(self, values: np.ndarray, baseline_days: Optional[int] = None) -> None:
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError("values must be a 2D array of shape (n_series, n_days)")
+        if baseline_days is not None and baseline_days <= 0:
+            raise ValueError("baseline_days must be positive")
+
+        self.values = values
+        self.observed = ~np.isnan(values)
+        n_days = values.shape[1]
+        filled = np.where(self.observed, values, 0.0)
+
+        # Baseline: mean of observed points strictly before each day (expanding or trailing window).
+        cum_sum = _shift_right(np.cumsum(filled, axis=1), 0.0)
+        cum_count = _shift_right(np.cumsum(self.observed, axis=1), 0)
+        if baseline_days is not None and baseline_days < n_days:
+            cum_sum[:, baseline_days:] -= cum_sum[:, :-baseline_days].copy()
+            cum_count[:, baseline_days:] -= cum_count[:, :-baseline_days].copy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.baseline = np.where(cum_count > 0, cum_sum / np.maximum(cum_count, 1), np.nan)
+            usable = self.observed & ~np.isnan(self.baseline) & (self.baseline != 0)
+            self.deviation = np.where(usable, (values - self.baseline) / self.baseline, np.nan)
+
+        self.spike = usable & (np.abs(self.deviation) >= SPIKE_THRESHOLD_PCT)
+        self.spike_critical = self.spike & (np.abs(self.deviation) >= SPIKE_THRESHOLD_PCT * 2)
+
+        # Gaps: calendar days since the previous observed point.
+        index = np.broadcast_to(np.arange(n_days), values.shape)
+        last_seen = np.maximum.accumulate(np.where(self.observed, index, -1), axis=1)
+        previous_seen = _shift_right(last_seen, -1)
+        self.gap_days = np.where(self.observed & (previous_seen >= 0), index - previous_seen, 0)
+        self.gap = self.gap_days > KPI_GAP_THRESHOLD_DAYS
+
+        # Flatlines: consecutive observed zeros (missing days neither extend nor break a run).
+        zero = self.observed & (filled == 0)
+        zero_count = np.cumsum(zero, axis=1)
+        reset_at = np.maximum.accumulate(np.where(self.observed & ~zero, zero_count, 0), axis=1)
+        self.zero_run = zero_count - reset_at
+        self.flatline = zero & (self.zero_run >= FLATLINE_DAYS)
+
+        positive_baseline = self.observed & (np.nan_to_num(self.baseline) > 0)
+        self.collapse = positive_baseline & (filled <= np.nan_to_num(self.baseline) * (1 - COLLAPSE_THRESHOLD_PCT))
+
+        self.last_observed = np.where(self.observed.any(axis=1), last_seen[:, -1], -1)
+
+    def counts(self) -> Dict[str, int]:
+        """Flagged point totals per rule across all series."""
+        return {
+            "spike": int(self.spike.sum()),
+            "gap": int(self.gap.sum()),
+            "flatline": int(self.flatline.sum()),
+            "collapse": int(self.collapse.sum()),
+        }
+
+    def kpi_anomalies(self, row: int, start_date: date, latest_only: bool = True) -> List[dict]:
+        """Anomaly dicts for one KPI series, shaped like `compute_kpi_anomalies` output.
+
+        `latest_only` limits spike/drop checks to the last observed point (the request-path
+        behaviour); gaps are always reported across the whole window.
+        """
+        anomalies: List[dict] = []
+        for col in self._columns(self.spike[row], row, latest_only):
+            deviation = self.deviation[row, col]
+            direction = "spike" if deviation > 0 else "drop"
+            anomalies.append(
+                {
+                    "type": f"kpi_{direction}",
+                    "severity": "critical" if self.spike_critical[row, col] else "warning",
+                    "description": f"{direction.capitalize()} of {deviation*100:.1f}% vs rolling baseline",
+                    "date": start_date + timedelta(days=int(col)),
+                }
+            )
+        for col in np.flatnonzero(self.gap[row]):
+            gap = int(self.gap_days[row, col])
+            curr = start_date + timedelta(days=int(col))
+            anomalies.append(
+                {
+                    "type": "kpi_missing_data",
+                    "severity": "warning",
+                    "description": f"Gap of {gap} days between {curr - timedelta(days=gap)} and {curr}",
+                    "date": curr,
+                }
+            )
+        return anomalies
+
+    def engagement_anomalies(self, row: int, start_date: date, latest_only: bool = True) -> List[dict]:
+        """Anomaly dicts for one engagement series, shaped like `compute_engagement_anomalies` output."""
+        anomalies: List[dict] = []
+        for col in self._columns(self.flatline[row], row, latest_only):
+            anomalies.append(
+                {
+                    "type": "engagement_flatline",
+                    "severity": "critical",
+                    "description": f"Zero activity for {FLATLINE_DAYS} consecutive days",
+                    "date": start_date + timedelta(days=int(col)),
+                }
+            )
+        for col in self._columns(self.collapse[row], row, latest_only):
+            baseline = self.baseline[row, col]
+            value = self.values[row, col]
+            anomalies.append(
+                {
+                    "type": "engagement_collapse",
+                    "severity": "critical" if value == 0 else "warning",
+                    "description": f"Drop of {((baseline - value) / baseline) * 100:.1f}% vs prior average",
+                    "date": start_date + timedelta(days=int(col)),
+                }
+            )
+        return anomalies
+
+    def _columns(self, mask: np.ndarray, row: int, latest_only: bool) -> Sequence[int]:
+        if not latest_only:
+            return np.flatnonzero(mask)
+        last = self.last_observed[row]
+        return [last] if last >= 0 and mask[last] else []
+
+
+def scan_series(
+    series: Mapping[str, Iterable[Tuple[date, float]]],
+    start_date: date,
+    end_date: date,
+    baseline_days: Optional[int] = None,
+) -> Tuple[List[str], AnomalyScan]:
+    """Build the value matrix for `series` and score it in one pass."""
+    keys, values = build_series_matrix(series, start_date, end_date)
+    return keys, AnomalyScan(values, baseline_days=baseline_days)
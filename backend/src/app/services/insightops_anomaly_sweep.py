@@ -0,0 +1,197 @@
+"""
+Fleet-wide anomaly sweep across every org and every allowed KPI/signal key.
+
+Rows for the window are streamed through one server-side cursor per series kind, ordered
+by (org_id, key, date) so each series arrives contiguously. Series are buffered up to
+`batch_series` at a time, scored together by the vectorized anomaly engine and upserted
+into `io_anomaly_event`. Memory stays bounded by `batch_series x window days`.
+
+Writes go through a separate session: committing on the reading session would close
+its cursor.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import bindparam, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.insightops import IoAnomalyEventORM
+from .insightops_analytics import ALLOWED_KPI_KEYS, ALLOWED_SIGNAL_KEYS
+from .insightops_analytics.db import daily_value_sql
+from .insightops_analytics.rollups import ROLLUP_SOURCES
+from .insightops_anomaly_engine import scan_series
+
+DEFAULT_BATCH_SERIES = 2000
+DEFAULT_FETCH_ROWS = 10000
+
+_ALLOWED_KEYS = {"kpi": ALLOWED_KPI_KEYS, "signal": ALLOWED_SIGNAL_KEYS}
+
+SeriesId = Tuple[str, str]
+
+
+class SweepReport(BaseModel):
+    sweep_id: uuid.UUID
+    start_date: date
+    end_date: date
+    series_scanned: int
+    rows_read: int
+    anomalies_found: int
+    anomalies_written: int
+    elapsed_seconds: float
+    series_per_second: float
+    by_kind: Dict[str, int]
+
+
+def _sweep_statement(kind: str, org_id: Optional[str]):
+    table, date_col, key_col, value_col = ROLLUP_SOURCES[kind]
+    org_filter = "AND org_id = :org_id" if org_id else ""
+    return text(
+        f"""
+        SELECT org_id, {key_col} AS key, {date_col} AS date, {daily_value_sql(key_col, value_col)} AS value
+        FROM {table}
+        WHERE {key_col} IN :keys
+          AND {date_col} BETWEEN :start_date AND :end_date
+          {org_filter}
+        GROUP BY org_id, {key_col}, {date_col}
+        ORDER BY org_id, {key_col}, {date_col}
+        """
+    ).bindparams(bindparam("keys", expanding=True))
+
+
+def _score_batch(
+    kind: str,
+    batch: Dict[SeriesId, List[Tuple[date, float]]],
+    start_date: date,
+    end_date: date,
+    latest_only: bool,
+    sweep_id: uuid.UUID,
+) -> List[Dict[str, Any]]:
+    series_ids, scan = scan_series(batch, start_date, end_date)
+    events: List[Dict[str, Any]] = []
+    for row, (org_id, key) in enumerate(series_ids):
+        if kind == "kpi":
+            anomalies = scan.kpi_anomalies(row, start_date, latest_only=latest_only)
+        else:
+            anomalies = scan.engagement_anomalies(row, start_date, latest_only=latest_only)
+        for anomaly in anomalies:
+            events.append(
+                {
+                    "org_id": org_id,
+                    "series_kind": kind,
+                    "series_key": key,
+                    "anomaly_date": anomaly["date"],
+                    "anomaly_type": anomaly["type"],
+                    "severity": anomaly["severity"],
+                    "description": anomaly["description"],
+                    "sweep_id": sweep_id,
+                }
+            )
+    return events
+
+
+async def write_anomaly_events(db: AsyncSession, events: List[Dict[str, Any]]) -> int:
+    """Upsert sweep events; a rerun over the same window refreshes rows instead of duplicating them."""
+    if not events:
+        return 0
+    stmt = pg_insert(IoAnomalyEventORM)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_io_anomaly_event_point",
+        set_={
+            "severity": stmt.excluded.severity,
+            "description": stmt.excluded.description,
+            "sweep_id": stmt.excluded.sweep_id,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt, events)
+    await db.commit()
+    return len(events)
+
+
+async def run_anomaly_sweep(
+    read_db: AsyncSession,
+    write_db: Optional[AsyncSession],
+    start_date: date,
+    end_date: date,
+    org_id: Optional[str] = None,
+    kinds: Tuple[str, ...] = ("kpi", "signal"),
+    latest_only: bool = False,
+    batch_series: int = DEFAULT_BATCH_SERIES,
+    fetch_rows: int = DEFAULT_FETCH_ROWS,
+) -> SweepReport:
+    """
+    Scan every (org, key) series in the window and record anomalies.
+
+    `latest_only=False` (default) records anomalies at every point of the window; True
+    mirrors `get_anomalies`, which only checks each series' last point. Pass
+    `write_db=None` for a dry run that only reports counts.
+    """
+    if start_date > end_date:
+        raise ValueError("start_date cannot be after end_date")
+    if batch_series <= 0:
+        raise ValueError("batch_series must be positive")
+
+    sweep_id = uuid.uuid4()
+    started = time.perf_counter()
+    series_scanned = rows_read = found = written = 0
+    by_kind: Dict[str, int] = {}
+
+    for kind in kinds:
+        if kind not in ROLLUP_SOURCES:
+            raise ValueError(f"Unsupported sweep kind '{kind}'. Allowed: {sorted(ROLLUP_SOURCES)}")
+        params: Dict[str, Any] = {
+            "keys": sorted(_ALLOWED_KEYS[kind]),
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        if org_id:
+            params["org_id"] = org_id
+        stmt = _sweep_statement(kind, org_id).execution_options(yield_per=fetch_rows)
+        result = await read_db.stream(stmt, params)
+
+        batch: Dict[SeriesId, List[Tuple[date, float]]] = {}
+        kind_found = 0
+
+        async def _flush() -> None:
+            nonlocal found, written, kind_found
+            events = _score_batch(kind, batch, start_date, end_date, latest_only, sweep_id)
+            found += len(events)
+            kind_found += len(events)
+            if write_db is not None:
+                written += await write_anomaly_events(write_db, events)
+            batch.clear()
+
+        async for row in result.mappings():
+            rows_read += 1
+            series_id = (row["org_id"], row["key"])
+            if series_id not in batch:
+                # Rows are ordered by series, so a full batch never splits a series across flushes.
+                if len(batch) >= batch_series:
+                    await _flush()
+                batch[series_id] = []
+                series_scanned += 1
+            batch[series_id].append((row["date"], float(row["value"])))
+        if batch:
+            await _flush()
+        by_kind[kind] = kind_found
+
+    elapsed = time.perf_counter() - started
+    return SweepReport(
+        sweep_id=sweep_id,
+        start_date=start_date,
+        end_date=end_date,
+        series_scanned=series_scanned,
+        rows_read=rows_read,
+        anomalies_found=found,
+        anomalies_written=written,
+        elapsed_seconds=elapsed,
+        series_per_second=series_scanned / elapsed if elapsed > 0 else 0.0,
+        by_kind=by_kind,
+    )
@@ -0,0 +1,116 @@
+"""
+Executive briefs for many orgs in one call (board packs).
+
+Orgs are processed in chunks: each chunk's KPI and engagement series are loaded with a
+single set-based query (`fetch_series_for_orgs`), summaries, anomalies, interpretation
+and intelligence are computed in memory, and briefs are optionally persisted with one
+multi-row insert per chunk. Briefs are yielded as soon as they are ready so callers can
+stream them (the router emits NDJSON); each chunk opens its own session from
+`session_factory`, so nothing is held open while the client reads.
+"""
+
+from __future__ import annotations
+
+from typing import AsyncContextManager, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..schemas.insightops_analytics import Anomaly, AnomalyResponse, SeriesPoint
+from ..schemas.insightops_executive_brief import ExecutiveBriefResponse
+from . import insightops_exec_persistence as exec_persistence
+from .insightops_analytics import compute_kpi_delta, fetch_series_for_orgs
+from .insightops_analytics.time import default_window
+from .insightops_anomalies import compute_kpi_anomalies
+from .insightops_engagement import aggregate_signals, compute_engagement_health
+from .insightops_executive_brief import DEFAULT_METRIC_KEYS, DEFAULT_SIGNAL_KEYS, compose_executive_brief
+
+MAX_BATCH_ORGS = 1000
+ORGS_PER_QUERY = 250
+# The single-org brief scans revenue for anomalies regardless of the requested metrics.
+ANOMALY_METRIC_KEY = "revenue"
+
+
+def _points(rows) -> List[SeriesPoint]:
+    return [SeriesPoint(date=row["date"], value=float(row["value"])) for row in rows]
+
+
+def inputs_from_rows(
+    org_id: str,
+    kpi_rows: Dict[str, list],
+    signal_rows: Dict[str, list],
+    metric_keys: Sequence[str],
+    signal_key: str,
+) -> Dict[str, object]:
+    """Build the same inputs `_load_brief_inputs` produces, from preloaded series rows."""
+    signal_points = _points(signal_rows.get(signal_key, []))
+    engagement = aggregate_signals(signal_points)
+    anomalies = compute_kpi_anomalies(_points(kpi_rows.get(ANOMALY_METRIC_KEY, [])))
+    return {
+        "kpi_summaries": {key: compute_kpi_delta(_points(kpi_rows.get(key, []))) for key in metric_keys},
+        "engagement_summary": engagement.model_copy(
+            update={"health_score": compute_engagement_health(signal_points)}
+        ),
+        "anomalies": AnomalyResponse(org_id=org_id, anomalies=[Anomaly.model_validate(a) for a in anomalies]),
+        "notes": [],
+    }
+
+
+def _unique_orgs(org_ids: Sequence[str]) -> List[str]:
+    orgs = list(dict.fromkeys(org_id for org_id in org_ids if org_id))
+    if not orgs:
+        raise ValueError("At least one org_id is required.")
+    if len(orgs) > MAX_BATCH_ORGS:
+        raise ValueError(f"At most {MAX_BATCH_ORGS} org_ids per batch.")
+    return orgs
+
+
+async def stream_executive_briefs(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    org_ids: Sequence[str],
+    window_days: int = 14,
+    metric_keys: Optional[List[str]] = None,
+    signal_keys: Optional[List[str]] = None,
+    persist: bool = False,
+    summary_type: str = "board",
+    orgs_per_query: Optional[int] = None,
+) -> AsyncIterator[ExecutiveBriefResponse]:
+    """Yield one brief per org (input order, duplicates dropped); invalid input raises ValueError on first iteration."""
+    orgs = _unique_orgs(org_ids)
+    orgs_per_query = orgs_per_query or ORGS_PER_QUERY
+    if orgs_per_query <= 0:
+        raise ValueError("orgs_per_query must be positive")
+    metric_keys = metric_keys or DEFAULT_METRIC_KEYS
+    signal_keys = signal_keys or DEFAULT_SIGNAL_KEYS
+    signal_key = signal_keys[0]
+    load_metric_keys = list(dict.fromkeys([*metric_keys, ANOMALY_METRIC_KEY]))
+    start_date, end_date = default_window(None, window_days)
+
+    for offset in range(0, len(orgs), orgs_per_query):
+        chunk = orgs[offset : offset + orgs_per_query]
+        async with session_factory() as db:
+            rows_by_org = await fetch_series_for_orgs(
+                db,
+                org_ids=chunk,
+                metric_keys=load_metric_keys,
+                signal_keys=[signal_key],
+                start_date=start_date,
+                end_date=end_date,
+            )
+            briefs = [
+                compose_executive_brief(
+                    org_id,
+                    window_days,
+                    metric_keys,
+                    signal_key,
+                    inputs_from_rows(org_id, *rows_by_org[org_id], metric_keys=metric_keys, signal_key=signal_key),
+                )
+                for org_id in chunk
+            ]
+            if persist:
+                ids = await exec_persistence.save_exec_briefs(db, briefs, summary_type=summary_type)
+                briefs = [
+                    brief.model_copy(update={"saved": True, "summary_id": str(summary_id), "summary_type": summary_type})
+                    for brief, summary_id in zip(briefs, ids)
+                ]
+        for brief in briefs:
+            yield brief
@@ -0,0 +1,189 @@
+"""
+Snapshot cache for executive briefs.
+
+A snapshot is keyed by (org_id, window_days, metric keys, signal keys, as-of date, data
+watermark); the watermark only covers the brief's series inside its window. The hot tier
+is an in-process LRU; the durable tier is `io_exec_summary`, written through
+`save_exec_brief` with `summary_type="snapshot:<scope>:<version>"`, so other workers and
+restarts reuse a brief until those rows change. A new watermark produces a new version;
+writing it deletes the older versions of the same scope, and `invalidate_brief_snapshots`
+drops an org's snapshots explicitly after a load.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from datetime import date
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.insightops import IoExecSummaryORM
+from ..schemas.insightops_executive_brief import ExecutiveBriefResponse
+from . import insightops_exec_persistence as exec_persistence
+from .insightops_analytics import resolve_window
+from .insightops_watermarks import get_series_watermark
+
+SNAPSHOT_SUMMARY_PREFIX = "snapshot:"
+BRIEF_CACHE_SIZE = int(os.getenv("INSIGHTOPS_BRIEF_CACHE_SIZE", "256"))
+
+logger = logging.getLogger("uvicorn")
+
+SnapshotKey = Tuple[str, int, Tuple[str, ...], Tuple[str, ...], str, str]
+
+
+class BriefSnapshotCache:
+    """Bounded LRU of executive briefs keyed by snapshot key."""
+
+    def __init__(self, max_entries: int = BRIEF_CACHE_SIZE) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, ExecutiveBriefResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[ExecutiveBriefResponse]:
+        brief = self._entries.get(key)
+        if brief is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return brief
+
+    def put(self, key: Hashable, brief: ExecutiveBriefResponse) -> None:
+        self._entries[key] = brief
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, org_id: Optional[str] = None) -> int:
+        """Drop every entry, or only those for `org_id`; returns how many were removed."""
+        if org_id is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        stale = [key for key in self._entries if key[0] == org_id]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+brief_snapshot_cache = BriefSnapshotCache()
+
+
+def snapshot_key(
+    org_id: str,
+    window_days: int,
+    metric_keys: Sequence[str],
+    signal_keys: Sequence[str],
+    watermark: str,
+    as_of: Optional[date] = None,
+) -> SnapshotKey:
+    # Windows end today, so the as-of date is part of the key even when data is unchanged.
+    return (
+        org_id,
+        window_days,
+        tuple(metric_keys),
+        tuple(signal_keys),
+        (as_of or date.today()).isoformat(),
+        watermark,
+    )
+
+
+def _digest(parts: Sequence) -> str:
+    return hashlib.sha1(json.dumps(parts, separators=(",", ":")).encode()).hexdigest()[:16]
+
+
+def snapshot_scope_prefix(key: SnapshotKey) -> str:
+    """`summary_type` prefix shared by every version of one (org, window, keys) brief."""
+    return f"{SNAPSHOT_SUMMARY_PREFIX}{_digest(key[:4])}:"
+
+
+def snapshot_summary_type(key: SnapshotKey) -> str:
+    return f"{snapshot_scope_prefix(key)}{_digest(key[4:])}"
+
+
+async def _prune_snapshots(db: AsyncSession, org_id: str, key: SnapshotKey) -> int:
+    """Delete the older versions of this snapshot's scope; returns how many went."""
+    result = await db.execute(
+        delete(IoExecSummaryORM).where(
+            IoExecSummaryORM.org_id == org_id,
+            IoExecSummaryORM.summary_type.like(f"{snapshot_scope_prefix(key)}%"),
+            IoExecSummaryORM.summary_type != snapshot_summary_type(key),
+        )
+    )
+    await db.commit()
+    return result.rowcount or 0
+
+
+async def get_or_build_brief(
+    db: AsyncSession,
+    org_id: str,
+    window_days: int,
+    metric_keys: Sequence[str],
+    signal_keys: Sequence[str],
+    build: Callable[[], Awaitable[ExecutiveBriefResponse]],
+    cache: Optional[BriefSnapshotCache] = None,
+) -> ExecutiveBriefResponse:
+    """Serve the brief from the LRU, then `io_exec_summary`, and only then call `build`."""
+    cache = cache if cache is not None else brief_snapshot_cache
+    window_start, window_end = resolve_window(None, None, window_days)
+    watermark = await get_series_watermark(
+        db, org_id, metric_keys, signal_keys, start_date=window_start, end_date=window_end
+    )
+    key = snapshot_key(org_id, window_days, metric_keys, signal_keys, watermark)
+
+    brief = cache.get(key)
+    if brief is not None:
+        return brief
+
+    summary_type = snapshot_summary_type(key)
+    record = await exec_persistence.get_latest_exec_summary(
+        db=db, org_id=org_id, summary_type=summary_type, include_payload=True
+    )
+    if record is not None and record.payload_json:
+        brief = ExecutiveBriefResponse.model_validate(record.payload_json)
+        cache.put(key, brief)
+        return brief
+
+    brief = await build()
+    try:
+        await exec_persistence.save_exec_brief(db=db, org_id=org_id, brief=brief, summary_type=summary_type)
+        await _prune_snapshots(db, org_id, key)
+    except SQLAlchemyError as exc:
+        # The durable tier is an optimization; a failed write must not fail the request.
+        await db.rollback()
+        logger.warning("Executive brief snapshot write failed for %s: %s", org_id, exc)
+    cache.put(key, brief)
+    return brief
+
+
+async def invalidate_brief_snapshots(
+    org_id: str,
+    db: Optional[AsyncSession] = None,
+    cache: Optional[BriefSnapshotCache] = None,
+) -> Dict[str, int]:
+    """Drop an org's cached briefs; with `db`, also delete its durable snapshot rows."""
+    cache = cache if cache is not None else brief_snapshot_cache
+    removed = {"hot": cache.invalidate(org_id), "durable": 0}
+    if db is not None:
+        result = await db.execute(
+            delete(IoExecSummaryORM).where(
+                IoExecSummaryORM.org_id == org_id,
+                IoExecSummaryORM.summary_type.like(f"{SNAPSHOT_SUMMARY_PREFIX}%"),
+            )
+        )
+        await db.commit()
+        removed["durable"] = result.rowcount or 0
+    return removed
@@ -8,6 +8,9 @@ from .insightops_analytics import (
     ALLOWED_SIGNAL_KEYS,
     DEFAULT_LOOKBACK_DAYS,
     DEFAULT_ORG_ID,
+    RollupWindow,
+    RunningStats,
+    SeriesCache,
     default_window,
     fetch_signal_series,
     parse_date,
@@ -22,6 +25,7 @@ async def get_signal_series(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    cache: Optional[SeriesCache] = None,
 ) -> SeriesResponse:
     if signal_key not in ALLOWED_SIGNAL_KEYS:
         raise ValueError(f"Unsupported signal_key '{signal_key}'. Allowed: {sorted(ALLOWED_SIGNAL_KEYS)}")
@@ -34,6 +38,9 @@ async def get_signal_series(
         window_start = parsed_start
         window_end = parsed_end or parsed_start
 
+    if cache is not None:
+        return await cache.get_signal_series(db, org_id, signal_key, window_start, window_end)
+
     rows = await fetch_signal_series(
         db=db,
         org_id=org_id,
@@ -46,13 +53,29 @@ async def get_signal_series(
     return SeriesResponse(org_id=org_id, key=signal_key, start_date=window_start, end_date=window_end, points=points)
 
 
-def aggregate_signals(points: List[SeriesPoint]) -> EngagementSummary:
-    if not points:
+def aggregate_signals(
+    points: List[SeriesPoint],
+    rollup: Optional[RollupWindow] = None,
+    stats: Optional[RunningStats] = None,
+) -> EngagementSummary:
+    if stats is not None:
+        if stats.count == 0:
+            return EngagementSummary(total=0.0, average_per_day=0.0, last_day_value=None, health_score=0.0)
+        total = stats.total
+        avg = total / stats.count
+        last = stats.latest.value
+    elif rollup is not None:
+        if rollup.days == 0:
+            return EngagementSummary(total=0.0, average_per_day=0.0, last_day_value=None, health_score=0.0)
+        total = rollup.total
+        avg = total / rollup.days
+        last = rollup.latest_value
+    elif not points:
         return EngagementSummary(total=0.0, average_per_day=0.0, last_day_value=None, health_score=0.0)
-
-    total = sum(p.value for p in points)
-    avg = total / len(points)
-    last = points[-1].value
+    else:
+        total = sum(p.value for p in points)
+        avg = total / len(points)
+        last = points[-1].value
 
     return EngagementSummary(
         total=total,
@@ -62,12 +85,19 @@ def aggregate_signals(points: List[SeriesPoint]) -> EngagementSummary:
     )
 
 
-def compute_engagement_health(points: List[SeriesPoint]) -> float:
+def compute_engagement_health(
+    points: List[SeriesPoint],
+    rollup: Optional[RollupWindow] = None,
+    stats: Optional[RunningStats] = None,
+) -> float:
     """Return a deterministic 0-100 health score based on last value vs baseline average."""
-    if not points:
+    if stats is not None:
+        if stats.count == 0:
+            return 0.0
+    elif not points and (rollup is None or rollup.days == 0):
         return 0.0
 
-    totals = aggregate_signals(points)
+    totals = aggregate_signals(points, rollup=rollup, stats=stats)
     baseline = totals.average_per_day
     last_value = totals.last_day_value
 
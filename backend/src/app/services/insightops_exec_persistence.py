@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
-from typing import Any, Optional
+import base64
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, List, Optional, Sequence, Tuple
 
-from sqlalchemy import desc, select
+from sqlalchemy import Row, desc, insert, null, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.insightops import IoExecSummaryORM
@@ -48,7 +50,7 @@ async def save_exec_brief(
         period_start=start,
         period_end=end,
         summary_text=_compose_summary_text(brief),
-        payload_json=brief.model_dump(),
+        payload_json=brief.model_dump(mode="json"),
         model_name=None,
     )
     db.add(record)
@@ -57,26 +59,83 @@ async def save_exec_brief(
     return record
 
 
+async def save_exec_briefs(
+    db: AsyncSession,
+    briefs: Sequence[ExecutiveBriefResponse],
+    summary_type: str = "board",
+) -> List[uuid.UUID]:
+    """Persist many briefs with one multi-row INSERT and one commit; returns ids in input order."""
+    if not briefs:
+        return []
+    rows = []
+    for brief in briefs:
+        start, end = _infer_period(brief, None, None)
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "org_id": brief.org_id,
+                "summary_type": summary_type,
+                "period_start": start,
+                "period_end": end,
+                "summary_text": _compose_summary_text(brief),
+                "payload_json": brief.model_dump(mode="json"),
+                "model_name": None,
+            }
+        )
+    await db.execute(insert(IoExecSummaryORM), rows)
+    await db.commit()
+    return [row["id"] for row in rows]
+
+
+def _summary_columns(include_payload: bool) -> list:
+    """Listing projection; payload_json is only transferred when asked for, else a NULL placeholder."""
+    payload = IoExecSummaryORM.payload_json if include_payload else null().label("payload_json")
+    return [
+        IoExecSummaryORM.id,
+        IoExecSummaryORM.period_start,
+        IoExecSummaryORM.period_end,
+        IoExecSummaryORM.org_id,
+        IoExecSummaryORM.summary_type,
+        IoExecSummaryORM.summary_text,
+        payload,
+        IoExecSummaryORM.model_name,
+        IoExecSummaryORM.created_at,
+        IoExecSummaryORM.updated_at,
+    ]
+
+
+def encode_summary_cursor(created_at: datetime, summary_id: uuid.UUID) -> str:
+    """Opaque cursor pointing just past the given summary in (created_at, id) DESC order."""
+    raw = f"{created_at.isoformat()}|{summary_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_summary_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, summary_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(summary_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
 async def get_latest_exec_summary(
     db: AsyncSession,
     org_id: str,
     summary_type: str = "board",
     include_payload: bool = False,
-) -> IoExecSummaryORM | None:
+) -> Row | None:
     stmt = (
-        select(IoExecSummaryORM)
+        select(*_summary_columns(include_payload))
         .where(
             IoExecSummaryORM.org_id == org_id,
             IoExecSummaryORM.summary_type == summary_type,
         )
-        .order_by(desc(IoExecSummaryORM.created_at))
+        .order_by(desc(IoExecSummaryORM.created_at), desc(IoExecSummaryORM.id))
         .limit(1)
     )
     result = await db.execute(stmt)
-    record = result.scalars().first()
-    if record and not include_payload:
-        record.payload_json = None
-    return record
+    return result.first()
 
 
 async def list_exec_summaries(
@@ -85,19 +144,26 @@ async def list_exec_summaries(
     summary_type: str = "board",
     limit: int = 20,
     include_payload: bool = False,
-) -> list[IoExecSummaryORM]:
+    cursor: Optional[str] = None,
+) -> list[Row]:
+    """
+    Newest-first page of summaries. Pass the cursor of the last row of the previous page
+    (`encode_summary_cursor`) to continue; each page is an index range scan on
+    (org_id, summary_type, created_at, id), so depth does not affect latency.
+    """
     stmt = (
-        select(IoExecSummaryORM)
+        select(*_summary_columns(include_payload))
         .where(
             IoExecSummaryORM.org_id == org_id,
             IoExecSummaryORM.summary_type == summary_type,
         )
-        .order_by(desc(IoExecSummaryORM.created_at))
+        .order_by(desc(IoExecSummaryORM.created_at), desc(IoExecSummaryORM.id))
         .limit(limit)
     )
+    if cursor:
+        created_at, summary_id = decode_summary_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(IoExecSummaryORM.created_at, IoExecSummaryORM.id) < tuple_(created_at, summary_id)
+        )
     result = await db.execute(stmt)
-    records = list(result.scalars().all())
-    if not include_payload:
-        for record in records:
-            record.payload_json = None
-    return records
+    return list(result.all())
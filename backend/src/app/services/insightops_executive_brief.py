@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core import database
+from .insightops_analytics import SeriesCache, resolve_window
+from ..schemas.insightops_analytics import AnomalyResponse, DeltaSummary, EngagementSummary
 from ..schemas.insightops_executive_brief import (
     ExecutiveBriefResponse,
     ExecutiveInsight,
@@ -23,6 +29,178 @@ from .insightops_interpretation.scoring import compute_priority_score
 DEFAULT_METRIC_KEYS = ["revenue", "pipeline", "win_rate"]
 DEFAULT_SIGNAL_KEYS = ["touches"]
 
+# Per-load budget when the brief fans out its queries; a slow load degrades the brief instead of stalling it.
+FANOUT_TIMEOUT_SECONDS = float(os.getenv("INSIGHTOPS_BRIEF_FANOUT_TIMEOUT", "5"))
+
+logger = logging.getLogger("uvicorn")
+
+
+def _empty_kpi_summary() -> DeltaSummary:
+    return DeltaSummary(
+        latest_value=None,
+        previous_value=None,
+        absolute_delta=None,
+        percent_delta=None,
+        rolling_avg_7d_latest=None,
+    )
+
+
+def _empty_engagement_summary() -> EngagementSummary:
+    return EngagementSummary(total=0.0, average_per_day=0.0, last_day_value=None, health_score=0.0)
+
+
+def _label(key: str) -> str:
+    return key.replace("_", " ").title()
+
+
+async def _load_brief_inputs(
+    db: AsyncSession | None,
+    org_id: str,
+    window_days: int,
+    metric_keys: List[str],
+    signal_key: str,
+    cache: SeriesCache | None = None,
+) -> Dict[str, Any]:
+    """Load KPI, engagement and anomaly inputs on a single session.
+
+    Every series is prefetched into `cache` with one batched query, so the per-series
+    loaders below (and the revenue anomaly scan) are served from the cache.
+    """
+    cache = cache if cache is not None else SeriesCache()
+    window_start, window_end = resolve_window(None, None, window_days)
+    try:
+        await cache.prefill(db, org_id, metric_keys, [signal_key], window_start, window_end)
+    except ValueError:
+        raise
+    except Exception as exc:  # the loaders below fetch whatever the batch did not
+        logger.warning("Executive brief series prefetch failed for %s: %s", org_id, exc)
+    kpi_summaries: Dict[str, DeltaSummary] = {}
+    for metric_key in metric_keys:
+        kpi_summaries[metric_key] = await get_kpi_summary(
+            db=db,
+            org_id=org_id,
+            metric_key=metric_key,
+            lookback_days=window_days,
+            cache=cache,
+        )
+    engagement_summary = await get_engagement_summary(
+        db=db,
+        org_id=org_id,
+        signal_key=signal_key,
+        lookback_days=window_days,
+        cache=cache,
+    )
+    anomalies_response = await get_anomalies(
+        db=db,
+        org_id=org_id,
+        metric_key="revenue",
+        signal_key=None,
+        lookback_days=window_days,
+        cache=cache,
+    )
+    return {
+        "kpi_summaries": kpi_summaries,
+        "engagement_summary": engagement_summary,
+        "anomalies": anomalies_response,
+        "notes": [],
+    }
+
+
+async def _call_in_own_session(
+    session_factory: Callable[[], Any],
+    loader: Callable[..., Awaitable[Any]],
+    timeout_seconds: float,
+    **kwargs: Any,
+) -> Any:
+    async def _run() -> Any:
+        async with session_factory() as session:
+            return await loader(db=session, **kwargs)
+
+    return await asyncio.wait_for(_run(), timeout=timeout_seconds)
+
+
+def _partial_note(label: str, exc: BaseException, timeout_seconds: float) -> str:
+    if isinstance(exc, asyncio.TimeoutError):
+        return f"{label} unavailable (timed out after {timeout_seconds:g}s); brief is partial."
+    return f"{label} unavailable ({type(exc).__name__}); brief is partial."
+
+
+async def _load_brief_inputs_fanout(
+    session_factory: Callable[[], Any],
+    org_id: str,
+    window_days: int,
+    metric_keys: List[str],
+    signal_key: str,
+    timeout_seconds: float,
+    cache: SeriesCache | None = None,
+) -> Dict[str, Any]:
+    """
+    Load all brief inputs concurrently, each on its own pooled session.
+
+    Latency tracks the slowest load rather than the sum. Loads that time out or fail
+    fall back to empty summaries and are reported in notes; ValueError still propagates
+    so invalid keys surface as client errors exactly like the sequential path.
+    """
+    kpi_calls = [
+        _call_in_own_session(
+            session_factory,
+            get_kpi_summary,
+            timeout_seconds,
+            org_id=org_id,
+            metric_key=metric_key,
+            lookback_days=window_days,
+            cache=cache,
+        )
+        for metric_key in metric_keys
+    ]
+    engagement_call = _call_in_own_session(
+        session_factory,
+        get_engagement_summary,
+        timeout_seconds,
+        org_id=org_id,
+        signal_key=signal_key,
+        lookback_days=window_days,
+        cache=cache,
+    )
+    anomalies_call = _call_in_own_session(
+        session_factory,
+        get_anomalies,
+        timeout_seconds,
+        org_id=org_id,
+        metric_key="revenue",
+        signal_key=None,
+        lookback_days=window_days,
+        cache=cache,
+    )
+    results = await asyncio.gather(*kpi_calls, engagement_call, anomalies_call, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, ValueError):
+            raise result
+
+    notes: list[str] = []
+    kpi_summaries: Dict[str, DeltaSummary] = {}
+    for metric_key, result in zip(metric_keys, results[: len(metric_keys)]):
+        if isinstance(result, BaseException):
+            notes.append(_partial_note(f"{_label(metric_key)} KPI", result, timeout_seconds))
+            result = _empty_kpi_summary()
+        kpi_summaries[metric_key] = result
+
+    engagement_summary, anomalies_response = results[len(metric_keys):]
+    if isinstance(engagement_summary, BaseException):
+        notes.append(_partial_note(f"{_label(signal_key)} engagement", engagement_summary, timeout_seconds))
+        engagement_summary = _empty_engagement_summary()
+    if isinstance(anomalies_response, BaseException):
+        notes.append(_partial_note("Anomaly scan", anomalies_response, timeout_seconds))
+        anomalies_response = AnomalyResponse(org_id=org_id, anomalies=[])
+
+    return {
+        "kpi_summaries": kpi_summaries,
+        "engagement_summary": engagement_summary,
+        "anomalies": anomalies_response,
+        "notes": notes,
+    }
+
 
 async def build_executive_brief(
     db: AsyncSession | None,
@@ -32,6 +210,10 @@ async def build_executive_brief(
     signal_keys: Optional[List[str]] = None,
     demo_mode: bool = False,
     demo_profile: Optional[str] = None,
+    fan_out: bool = False,
+    session_factory: Optional[Callable[[], Any]] = None,
+    timeout_seconds: float = FANOUT_TIMEOUT_SECONDS,
+    series_cache: SeriesCache | None = None,
 ) -> ExecutiveBriefResponse:
     metric_keys = metric_keys or DEFAULT_METRIC_KEYS
     signal_keys = signal_keys or DEFAULT_SIGNAL_KEYS
@@ -50,14 +232,8 @@ async def build_executive_brief(
     if demo_mode:
         from ..intelligence import demo_profiles
 
-        profile_map = {
-            "EXEC_STABLE_GROWTH": demo_profiles.EXEC_STABLE_GROWTH,
-            "EXEC_REVENUE_RISK": demo_profiles.EXEC_REVENUE_RISK,
-            "EXEC_ENGAGEMENT_DROP": demo_profiles.EXEC_ENGAGEMENT_DROP,
-            "EXEC_ANOMALY_SPIKE": demo_profiles.EXEC_ANOMALY_SPIKE,
-        }
-        demo_fn = profile_map.get(demo_profile or "EXEC_REVENUE_RISK", demo_profiles.EXEC_REVENUE_RISK)
-        intel = demo_fn()
+        profile_name = demo_profile if demo_profile in demo_profiles.DEMO_PROFILES else "EXEC_REVENUE_RISK"
+        intel = demo_profiles.get_demo_profile(profile_name)
         driver_attribution = intel.get("driver")
         prioritized_insights = intel.get("priorities")
         synthesis_block = intel.get("synthesis")
@@ -116,18 +292,58 @@ async def build_executive_brief(
             priority_focus=priority_focus,
         )
 
+    # Engagement insight and risk use the first signal (signals are minimal for CD5)
+    signal_key = signal_keys[0] if signal_keys else "touches"
+
+    # KPI summaries and the anomaly scan both read the revenue series; share loads per request.
+    series_cache = series_cache if series_cache is not None else SeriesCache()
+
+    # Fan-out needs a session per load; without a session factory stay on the shared session.
+    session_factory = session_factory or database.AsyncSessionLocal
+    if fan_out and session_factory is not None:
+        inputs = await _load_brief_inputs_fanout(
+            session_factory,
+            org_id=org_id,
+            window_days=window_days,
+            metric_keys=metric_keys,
+            signal_key=signal_key,
+            timeout_seconds=timeout_seconds,
+            cache=series_cache,
+        )
+    else:
+        inputs = await _load_brief_inputs(
+            db,
+            org_id=org_id,
+            window_days=window_days,
+            metric_keys=metric_keys,
+            signal_key=signal_key,
+            cache=series_cache,
+        )
+    logger.debug("Executive brief series cache for %s: %s", org_id, series_cache.stats())
+
+    return compose_executive_brief(org_id, window_days, metric_keys, signal_key, inputs)
+
+
+def compose_executive_brief(
+    org_id: str,
+    window_days: int,
+    metric_keys: List[str],
+    signal_key: str,
+    inputs: Dict[str, Any],
+) -> ExecutiveBriefResponse:
+    """Interpret loaded inputs (see `_load_brief_inputs`) and add the intelligence layer; no I/O."""
+    insights: list[ExecutiveInsight] = []
+    risks: list[ExecutiveRisk] = []
+    opportunities: list[ExecutiveOpportunity] = []
+    notes: list[str] = list(inputs["notes"])
+
     kpi_interps: list[dict] = []
     primary_kpi_summary = None
     kpi_severity_max = 0
 
     # KPI insights and risks
     for metric_key in metric_keys:
-        summary = await get_kpi_summary(
-            db=db,
-            org_id=org_id,
-            metric_key=metric_key,
-            lookback_days=window_days,
-        )
+        summary = inputs["kpi_summaries"][metric_key]
         interpretation = interpret_kpi(
             summary.latest_value,
             summary.previous_value,
@@ -160,14 +376,8 @@ async def build_executive_brief(
         if summary.latest_value is None:
             notes.append(f"No KPI data available for {metric_key} in the selected window.")
 
-    # Engagement insight and risk from the first signal (signals are minimal for CD5)
-    signal_key = signal_keys[0] if signal_keys else "touches"
-    engagement_summary = await get_engagement_summary(
-        db=db,
-        org_id=org_id,
-        signal_key=signal_key,
-        lookback_days=window_days,
-    )
+    # Engagement insight and risk
+    engagement_summary = inputs["engagement_summary"]
     engagement_interpretation = interpret_engagement(
         engagement_summary.health_score,
         engagement_summary.average_per_day,
@@ -195,13 +405,7 @@ async def build_executive_brief(
         )
 
     # Anomalies insight and risk (revenue focus by default)
-    anomalies_response = await get_anomalies(
-        db=db,
-        org_id=org_id,
-        metric_key="revenue",
-        signal_key=None,
-        lookback_days=window_days,
-    )
+    anomalies_response = inputs["anomalies"]
     anomaly_interpretation = interpret_anomalies(anomalies_response.anomalies)
     anomaly_severity = anomaly_interpretation["severity"]
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import os
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, List, Mapping, NamedTuple, Optional, Tuple
 
 from ..intelligence import correlate_signals
 from ..intelligence.drivers import DriverAttributionEngine
@@ -8,14 +11,55 @@ from ..intelligence.priority import Prioritizer
 from ..intelligence.synthesis import Synthesizer
 from ..intelligence.schemas import DriverAttribution, PrioritizedInsight, SignalCorrelation, SynthesisBlock
 from ..intelligence.narratives import build_executive_narrative
-from ..intelligence.demo_profiles import (
-    EXEC_STABLE_GROWTH,
-    EXEC_REVENUE_RISK,
-    EXEC_ENGAGEMENT_DROP,
-    EXEC_ANOMALY_SPIKE,
-)
+from ..intelligence import demo_profiles
 from ..schemas.insightops_analytics import AnomalyResponse, DeltaSummary, EngagementSummary
 
+INTELLIGENCE_CACHE_SIZE = int(os.getenv("INSIGHTOPS_INTELLIGENCE_CACHE_SIZE", "1024"))
+# Deltas are rounded in the cache key so float noise from upstream summaries does not
+# defeat memoization; the pipeline itself scores the unrounded values it was called with.
+DELTA_PRECISION = 6
+
+PipelineKey = Tuple[str, str, float, float, Tuple[str, ...]]
+
+
+class IntelligenceCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _PipelineCache:
+    """Bounded LRU of immutable pipeline bundles."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[PipelineKey, Mapping[str, object]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_run(self, key: PipelineKey, run: Callable[[], Mapping[str, object]]) -> Mapping[str, object]:
+        bundle = self._entries.get(key)
+        if bundle is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return bundle
+        self.misses += 1
+        bundle = self._entries[key] = run()
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return bundle
+
+    def info(self) -> IntelligenceCacheInfo:
+        return IntelligenceCacheInfo(self.hits, self.misses, self.max_entries, len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+_pipeline_cache = _PipelineCache(INTELLIGENCE_CACHE_SIZE)
+
 
 def _engagement_percent_delta(summary: EngagementSummary) -> float:
     if summary.average_per_day and summary.average_per_day != 0 and summary.last_day_value is not None:
@@ -23,37 +67,20 @@ def _engagement_percent_delta(summary: EngagementSummary) -> float:
     return 0.0
 
 
-def build_cross_domain_intelligence(
-    *,
+def _run_pipeline(
     kpi_key: str,
     engagement_key: str,
-    kpi_summary: DeltaSummary,
-    engagement_summary: EngagementSummary,
-    anomaly_summary: AnomalyResponse,
-    demo_profile: Optional[str] = None,
-    explain: bool = False,
-) -> Dict[str, object]:
-    # Demo presets short-circuit to deterministic outputs
-    if demo_profile:
-        profile_map = {
-            "EXEC_STABLE_GROWTH": EXEC_STABLE_GROWTH,
-            "EXEC_REVENUE_RISK": EXEC_REVENUE_RISK,
-            "EXEC_ENGAGEMENT_DROP": EXEC_ENGAGEMENT_DROP,
-            "EXEC_ANOMALY_SPIKE": EXEC_ANOMALY_SPIKE,
-        }
-        if demo_profile in profile_map:
-            return profile_map[demo_profile]()
-
-    kpi_percent_delta = kpi_summary.percent_delta or 0.0
-    engagement_delta = _engagement_percent_delta(engagement_summary)
-    anomalies_present = [a.type for a in anomaly_summary.anomalies]
-
+    kpi_percent_delta: float,
+    engagement_delta: float,
+    anomalies_present: Tuple[str, ...],
+) -> Mapping[str, object]:
+    """correlate -> attribute -> prioritize -> synthesize -> narrate, as a read-only bundle."""
     correlations: List[SignalCorrelation] = correlate_signals(
         kpi_key=kpi_key,
         engagement_signal_key=engagement_key,
         kpi_percent_delta=kpi_percent_delta,
         engagement_percent_delta=engagement_delta,
-        anomaly_flags=anomalies_present,
+        anomaly_flags=list(anomalies_present),
         anomaly_key=anomalies_present[0] if anomalies_present else None,
         volatility_score=abs(kpi_percent_delta),
     )
@@ -77,20 +104,64 @@ def build_cross_domain_intelligence(
         signal_key=engagement_key,
     )
 
+    narrative = build_executive_narrative(
+        synthesis=synthesis,
+        priorities=priorities,
+        driver=driver,
+    )
+
+    narrative["top_drivers"] = tuple(narrative["top_drivers"])
+    return MappingProxyType(
+        {
+            "correlations": tuple(correlations),
+            "driver": driver,
+            "priorities": tuple(priorities),
+            "synthesis": synthesis,
+            "narrative": MappingProxyType(narrative),
+        }
+    )
+
+
+def intelligence_cache_info() -> IntelligenceCacheInfo:
+    return _pipeline_cache.info()
+
+
+def clear_intelligence_cache() -> None:
+    _pipeline_cache.clear()
+
+
+def build_cross_domain_intelligence(
+    *,
+    kpi_key: str,
+    engagement_key: str,
+    kpi_summary: DeltaSummary,
+    engagement_summary: EngagementSummary,
+    anomaly_summary: AnomalyResponse,
+    demo_profile: Optional[str] = None,
+    explain: bool = False,
+) -> Mapping[str, object]:
+    # Demo presets short-circuit to deterministic outputs
+    if demo_profile and demo_profile in demo_profiles.DEMO_PROFILES:
+        return demo_profiles.get_demo_profile(demo_profile)
+
+    kpi_delta = kpi_summary.percent_delta or 0.0
+    engagement_delta = _engagement_percent_delta(engagement_summary)
+    anomaly_types = tuple(a.type for a in anomaly_summary.anomalies)
+    key = (
+        kpi_key,
+        engagement_key,
+        round(kpi_delta, DELTA_PRECISION),
+        round(engagement_delta, DELTA_PRECISION),
+        anomaly_types,
+    )
+    cached = _pipeline_cache.get_or_run(
+        key, lambda: _run_pipeline(kpi_key, engagement_key, kpi_delta, engagement_delta, anomaly_types)
+    )
+    priorities = cached["priorities"]
+    # The bundle is read-only and shared, so it is returned without copying;
+    # "narrative" and "executive_narrative" are the same narrative, built once.
     return {
-        "correlations": correlations,
-        "driver": driver,
-        "priorities": priorities,
-        "synthesis": synthesis,
-        "narrative": build_executive_narrative(
-            synthesis=synthesis,
-            priorities=priorities,
-            driver=driver,
-        ),
-        "executive_narrative": build_executive_narrative(
-            synthesis=synthesis,
-            priorities=priorities,
-            driver=driver,
-        ),
-        "explainability_notes": priorities[0].explainability_notes if (explain and priorities) else [],
+        **cached,
+        "executive_narrative": cached["narrative"],
+        "explainability_notes": priorities[0].explainability_notes if (explain and priorities) else (),
     }
@@ -0,0 +1,404 @@
+"""
+Live KPI/engagement updates for dashboards (server-sent events).
+
+One `StreamBroadcaster` per process polls for changed rows on behalf of every connected
+dashboard: each tick runs a single query per series kind for rows whose `updated_at` is
+past the broadcaster's cursor, restricted to the (org, key) series someone is watching.
+Each watched series keeps its window in memory (`SeriesWindow`, with a running total), so
+a new row only updates that state; the event carries the new points plus the delta,
+engagement summary and latest-point anomalies recomputed from it with the regular
+`compute_kpi_delta` / `aggregate_signals` / anomaly rules.
+
+Subscribers get a bounded queue; a slow client loses its oldest events instead of
+holding up the others. The poll loop starts with the first subscriber and stops when the
+last one disconnects.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import orjson
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..schemas.insightops_analytics import SeriesPoint
+from .insightops_analytics import (
+    ALLOWED_KPI_KEYS,
+    ALLOWED_SIGNAL_KEYS,
+    DEFAULT_LOOKBACK_DAYS,
+    RATIO_KPI_KEYS,
+    compute_kpi_delta,
+)
+from .insightops_analytics.rollups import ROLLING_WINDOW, ROLLUP_SOURCES
+from .insightops_analytics.time import default_window
+from .insightops_analytics.types import RollupWindow
+from .insightops_anomalies import FLATLINE_DAYS, compute_engagement_anomalies, compute_kpi_anomalies
+from .insightops_engagement import aggregate_signals, compute_engagement_health
+
+STREAM_POLL_SECONDS = float(os.getenv("INSIGHTOPS_STREAM_POLL_SECONDS", "2"))
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("INSIGHTOPS_STREAM_KEEPALIVE_SECONDS", "15"))
+STREAM_QUEUE_SIZE = int(os.getenv("INSIGHTOPS_STREAM_QUEUE_SIZE", "256"))
+# Re-read rows this far behind the cursor: updated_at is stamped at statement time, so a
+# slower transaction can commit a row older than one already seen. Re-reads are no-ops.
+STREAM_OVERLAP_SECONDS = 5
+
+logger = logging.getLogger("uvicorn")
+
+_ALLOWED_KEYS = {"kpi": ALLOWED_KPI_KEYS, "signal": ALLOWED_SIGNAL_KEYS}
+
+SeriesId = Tuple[str, str, str]  # (kind, org_id, key)
+
+
+def _changed_rows_statement(kind: str, since: Optional[datetime]):
+    table, date_col, key_col, value_col = ROLLUP_SOURCES[kind]
+    since_filter = "AND updated_at > :since" if since is not None else ""
+    return text(
+        f"""
+        SELECT id, org_id, {key_col} AS key, {date_col} AS date, {value_col} AS value, updated_at
+        FROM {table}
+        WHERE org_id IN :org_ids
+          AND {key_col} IN :keys
+          AND {date_col} >= :start_date
+          {since_filter}
+        ORDER BY {date_col}, id
+        """
+    ).bindparams(bindparam("org_ids", expanding=True), bindparam("keys", expanding=True))
+
+
+class SeriesWindow:
+    """The rows of one series inside the lookback window, ordered by (date, id), with a running total.
+
+    Summaries and anomalies read one value per date, like the raw series queries and the
+    rollups: same-day rows are summed, or averaged for ratio KPIs. `total` is the sum of
+    those daily values.
+    """
+
+    def __init__(self, kind: str, key: Optional[str] = None) -> None:
+        self.kind = kind
+        self.average = kind == "kpi" and key in RATIO_KPI_KEYS
+        self._entries: List[Tuple[date, str, float]] = []
+        self._values: Dict[str, float] = {}
+        self._day_sums: Dict[date, float] = {}
+        self._day_rows: Dict[date, int] = {}
+        self._dates: List[date] = []
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def day_value(self, point_date: date) -> float:
+        total = self._day_sums[point_date]
+        return total / self._day_rows[point_date] if self.average else total
+
+    def _add_to_day(self, point_date: date, value: float, rows: int) -> None:
+        if point_date not in self._day_sums:
+            self._day_sums[point_date], self._day_rows[point_date] = 0.0, 0
+            bisect.insort(self._dates, point_date)
+        else:
+            self.total -= self.day_value(point_date)
+        self._day_sums[point_date] += value
+        self._day_rows[point_date] += rows
+        self.total += self.day_value(point_date)
+
+    def apply(self, row_id: Any, point_date: date, value: float) -> bool:
+        """Insert or update one raw row; returns False when the row is already known as-is."""
+        row_id = str(row_id)
+        known = self._values.get(row_id)
+        if known is not None:
+            if known == value:
+                return False
+            index = next(i for i, entry in enumerate(self._entries) if entry[1] == row_id)
+            row_date = self._entries[index][0]
+            self._entries[index] = (row_date, row_id, value)
+            self._add_to_day(row_date, value - known, 0)
+        else:
+            entry = (point_date, row_id, value)
+            if not self._entries or entry >= self._entries[-1]:
+                self._entries.append(entry)
+            else:
+                bisect.insort(self._entries, entry)  # late or backfilled row
+            self._add_to_day(point_date, value, 1)
+        self._values[row_id] = value
+        return True
+
+    def evict_before(self, start_date: date) -> int:
+        stale = bisect.bisect_left(self._entries, (start_date,))
+        for _, row_id, _ in self._entries[:stale]:
+            del self._values[row_id]
+        del self._entries[:stale]
+        stale_days = bisect.bisect_left(self._dates, start_date)
+        for day in self._dates[:stale_days]:
+            self.total -= self.day_value(day)
+            del self._day_sums[day], self._day_rows[day]
+        del self._dates[:stale_days]
+        return stale
+
+    def tail(self, count: int) -> List[SeriesPoint]:
+        return [SeriesPoint(date=d, value=self.day_value(d)) for d in self._dates[-count:]] if count > 0 else []
+
+    def _baseline_pair(self) -> List[SeriesPoint]:
+        # The anomaly rules compare the latest point with the mean of every earlier point;
+        # a stand-in point at the previous date with that mean gives them the same inputs.
+        previous_date, latest_date = self._dates[-2:]
+        latest = self.day_value(latest_date)
+        baseline = (self.total - latest) / (len(self._dates) - 1)
+        return [SeriesPoint(date=previous_date, value=baseline), SeriesPoint(date=latest_date, value=latest)]
+
+    def summary(self) -> Dict[str, Any]:
+        if self.kind == "kpi":
+            return compute_kpi_delta(self.tail(ROLLING_WINDOW)).model_dump(mode="json")
+        if not self._dates:
+            return aggregate_signals([]).model_dump(mode="json")
+        latest_date = self._dates[-1]
+        rollup = RollupWindow(
+            start_date=self._dates[0],
+            end_date=latest_date,
+            days=len(self._dates),
+            total=self.total,
+            latest_date=latest_date,
+            latest_value=self.day_value(latest_date),
+        )
+        engagement = aggregate_signals([], rollup=rollup)
+        return engagement.model_copy(
+            update={"health_score": compute_engagement_health([], rollup=rollup)}
+        ).model_dump(mode="json")
+
+    def latest_anomalies(self) -> List[Dict[str, Any]]:
+        """Anomalies the window's latest point raises, as the full-window rules would report them."""
+        if len(self._dates) < 2:
+            return []
+        if self.kind == "kpi":
+            anomalies = compute_kpi_anomalies(self._baseline_pair())
+        else:
+            anomalies = [
+                a for a in compute_engagement_anomalies(self.tail(FLATLINE_DAYS)) if a["type"] == "engagement_flatline"
+            ]
+            anomalies += [
+                a for a in compute_engagement_anomalies(self._baseline_pair()) if a["type"] == "engagement_collapse"
+            ]
+        return [{**anomaly, "date": anomaly["date"].isoformat()} for anomaly in anomalies]
+
+
+@dataclass(eq=False)
+class Subscription:
+    org_id: str
+    series: Set[SeriesId]
+    queue: "asyncio.Queue[Tuple[str, Dict[str, Any]]]"
+    dropped: int = 0
+    event_ids: Any = field(default_factory=lambda: itertools.count(1), repr=False)
+
+    def offer(self, event: str, payload: Dict[str, Any]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((event, payload))
+
+
+def validate_stream_keys(metric_keys: Sequence[str], signal_keys: Sequence[str]) -> Set[Tuple[str, str]]:
+    keys = {("kpi", key) for key in metric_keys} | {("signal", key) for key in signal_keys}
+    if not keys:
+        raise ValueError("At least one metric or signal key is required.")
+    for kind, key in keys:
+        if key not in _ALLOWED_KEYS[kind]:
+            raise ValueError(f"Unsupported {kind} key '{key}'. Allowed: {sorted(_ALLOWED_KEYS[kind])}")
+    return keys
+
+
+@asynccontextmanager
+async def _default_session() -> AsyncIterator[AsyncSession]:
+    from ..core import database
+
+    if database.AsyncSessionLocal is None or database.DB_LOCKED_FOR_TESTS:
+        database._raise_db_disabled()
+    async with database.AsyncSessionLocal() as session:
+        yield session
+
+
+class StreamBroadcaster:
+    """Fan-out of incremental series updates: one poll loop and one window per series, shared by all subscribers."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] = _default_session,
+        poll_seconds: float = STREAM_POLL_SECONDS,
+        window_days: int = DEFAULT_LOOKBACK_DAYS,
+        queue_size: int = STREAM_QUEUE_SIZE,
+    ) -> None:
+        if poll_seconds <= 0 or window_days <= 0 or queue_size <= 0:
+            raise ValueError("poll_seconds, window_days and queue_size must be positive")
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.window_days = window_days
+        self.queue_size = queue_size
+        self._subscriptions: Set[Subscription] = set()
+        self._windows: Dict[SeriesId, SeriesWindow] = {}
+        self._cursor: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"subscribers": len(self._subscriptions), "series": len(self._windows)}
+
+    def _watched(self) -> Set[SeriesId]:
+        return set().union(*(sub.series for sub in self._subscriptions)) if self._subscriptions else set()
+
+    async def subscribe(
+        self,
+        org_id: str,
+        metric_keys: Sequence[str] = (),
+        signal_keys: Sequence[str] = (),
+        today: Optional[date] = None,
+    ) -> Subscription:
+        """Register a dashboard; its queue starts with one `snapshot` event per series.
+
+        Raises ValueError for unknown keys; a failed seeding load propagates and leaves nothing registered.
+        """
+        series = {(kind, org_id, key) for kind, key in validate_stream_keys(metric_keys, signal_keys)}
+        subscription = Subscription(org_id=org_id, series=series, queue=asyncio.Queue(maxsize=self.queue_size))
+        async with self._lock:
+            missing = series - self._windows.keys()
+            if missing:
+                for series_id in missing:
+                    self._windows[series_id] = SeriesWindow(series_id[0], series_id[2])
+                try:
+                    async with self.session_factory() as db:
+                        # Seeding must not move the cursor past rows other series have not polled yet.
+                        await self._load(db, missing, since=None, today=today, advance_cursor=False)
+                except BaseException:
+                    # An unseeded window would pass for an empty series to the next subscriber.
+                    for series_id in missing:
+                        del self._windows[series_id]
+                    raise
+            self._subscriptions.add(subscription)
+        for series_id in sorted(series):
+            subscription.offer("snapshot", self._event(series_id, []))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+        watched = self._watched()
+        for series_id in [s for s in self._windows if s not in watched]:
+            del self._windows[series_id]
+        if not self._subscriptions:
+            self._cursor = None
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    def _event(self, series_id: SeriesId, points: List[Dict[str, Any]]) -> Dict[str, Any]:
+        kind, org_id, key = series_id
+        window = self._windows[series_id]
+        return {
+            "kind": kind,
+            "org_id": org_id,
+            "key": key,
+            "points": points,
+            "summary": window.summary(),
+            "anomalies": window.latest_anomalies(),
+        }
+
+    async def _load(
+        self,
+        db: AsyncSession,
+        series: Set[SeriesId],
+        since: Optional[datetime],
+        today: Optional[date],
+        advance_cursor: bool = True,
+    ) -> Dict[SeriesId, List[Dict[str, Any]]]:
+        """Apply rows for `series` (changed since `since`, or the whole window) and return the new points per series.
+
+        A point is the day's value, so a changed row re-publishes its whole date.
+        """
+        start_date, _ = default_window(today, self.window_days)
+        changed: Dict[SeriesId, Set[date]] = {}
+        for kind in ROLLUP_SOURCES:
+            wanted = [s for s in series if s[0] == kind]
+            if not wanted:
+                continue
+            params: Dict[str, Any] = {
+                "org_ids": sorted({s[1] for s in wanted}),
+                "keys": sorted({s[2] for s in wanted}),
+                "start_date": start_date,
+            }
+            if since is not None:
+                params["since"] = since
+            result = await db.execute(_changed_rows_statement(kind, since), params)
+            for row in result.mappings().all():
+                series_id = (kind, row["org_id"], row["key"])
+                window = self._windows.get(series_id)
+                if series_id not in series or window is None:
+                    continue  # org/key cross product includes unwatched series
+                updated_at = row["updated_at"]
+                if advance_cursor and updated_at is not None and (self._cursor is None or updated_at > self._cursor):
+                    self._cursor = updated_at
+                value = float(row["value"])
+                if window.apply(row["id"], row["date"], value):
+                    changed.setdefault(series_id, set()).add(row["date"])
+        return {
+            series_id: [{"date": d.isoformat(), "value": self._windows[series_id].day_value(d)} for d in sorted(dates)]
+            for series_id, dates in changed.items()
+        }
+
+    async def poll_once(self, db: AsyncSession, today: Optional[date] = None) -> int:
+        """One tick: read changed rows for every watched series and publish an event per updated series."""
+        async with self._lock:
+            watched = self._watched()
+            if not watched:
+                return 0
+            start_date, _ = default_window(today, self.window_days)
+            for series_id in watched:
+                self._windows[series_id].evict_before(start_date)
+            since = self._cursor - timedelta(seconds=STREAM_OVERLAP_SECONDS) if self._cursor else None
+            changed = await self._load(db, watched, since=since, today=today)
+            events = {series_id: self._event(series_id, points) for series_id, points in changed.items()}
+        for subscription in list(self._subscriptions):
+            for series_id in sorted(subscription.series & events.keys()):
+                subscription.offer("update", events[series_id])
+        return len(events)
+
+    async def _run(self) -> None:
+        while self._subscriptions:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                async with self.session_factory() as db:
+                    await self.poll_once(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # keep streaming; the next tick retries from the same cursor
+                logger.warning("InsightOps stream poll failed: %s", exc)
+
+
+stream_broadcaster = StreamBroadcaster()
+
+
+def sse_frame(event: str, payload: Dict[str, Any], event_id: Optional[int] = None) -> bytes:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode() + b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def sse_events(
+    subscription: Subscription,
+    is_disconnected: Callable[[], Any],
+    keepalive_seconds: float = STREAM_KEEPALIVE_SECONDS,
+) -> AsyncIterator[bytes]:
+    """Encode a subscription's events as SSE frames, with comment keepalives while idle."""
+    while True:
+        try:
+            event, payload = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive_seconds)
+        except asyncio.TimeoutError:
+            if await is_disconnected():
+                return
+            yield b": keepalive\n\n"
+            continue
+        yield sse_frame(event, payload, next(subscription.event_ids))
@@ -0,0 +1,112 @@
+"""
+Cheap change tokens for InsightOps data.
+
+A watermark is an opaque string that changes whenever the rows behind a response change:
+MAX(updated_at) moves on inserts and updates, the row count also moves on deletes. Each
+lookup is an index-only probe, so callers can validate caches (brief snapshots, HTTP
+ETags) without running the real query.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+
+# Per-(org, keys) variants; served by the (org_id, key, updated_at) indexes, or by the
+# (org_id, key, date) series index when bounded to a window.
+SERIES_WATERMARK_SELECT = """
+    (SELECT MAX(updated_at) FROM {table}
+      WHERE org_id = :org_id AND {key_column} IN :{kind}_keys{window}) AS {kind}_updated_at,
+    (SELECT COUNT(*) FROM {table}
+      WHERE org_id = :org_id AND {key_column} IN :{kind}_keys{window}) AS {kind}_rows
+"""
+SERIES_WATERMARK_TABLES = {
+    "kpi": ("io_kpi_daily", "metric_key", "kpi_date"),
+    "signal": ("io_engagement_signal_daily", "signal_key", "signal_date"),
+}
+
+# Summaries served from rollups change when the rollup is refreshed, not when raw rows land.
+ROLLUP_WATERMARK_SELECT = """
+    (SELECT MAX(refreshed_at) FROM io_series_rollup_state
+      WHERE org_id = :org_id AND series_kind = '{kind}' AND series_key IN :{kind}_keys) AS {kind}_rollup_at
+"""
+
+EXEC_SUMMARY_WATERMARK_SQL = """
+    SELECT id, updated_at
+    FROM io_exec_summary
+    WHERE org_id = :org_id AND summary_type = :summary_type
+    ORDER BY created_at DESC, id DESC
+    LIMIT 1
+"""
+
+
+async def get_series_watermark(
+    db: AsyncSession,
+    org_id: str,
+    metric_keys: Sequence[str] = (),
+    signal_keys: Sequence[str] = (),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> str:
+    """Token for the given KPI/signal series of one org, fetched in a single round trip.
+
+    With `start_date`/`end_date` only rows inside that window count, so the probe reads the
+    window rather than the org's whole history.
+    """
+    keys_by_kind = {"kpi": sorted(set(metric_keys)), "signal": sorted(set(signal_keys))}
+    selects: List[str] = []
+    params: Dict[str, Any] = {"org_id": org_id}
+    bind_keys = []
+    include_rollups = get_settings().INSIGHTOPS_ROLLUPS_ENABLED
+    if start_date is not None and end_date is not None:
+        params.update(start_date=start_date, end_date=end_date)
+    for kind, keys in keys_by_kind.items():
+        if not keys:
+            continue
+        table, key_column, date_column = SERIES_WATERMARK_TABLES[kind]
+        window = f" AND {date_column} BETWEEN :start_date AND :end_date" if "start_date" in params else ""
+        selects.append(SERIES_WATERMARK_SELECT.format(table=table, key_column=key_column, kind=kind, window=window))
+        if include_rollups:
+            selects.append(ROLLUP_WATERMARK_SELECT.format(kind=kind))
+        params[f"{kind}_keys"] = keys
+        bind_keys.append(bindparam(f"{kind}_keys", expanding=True))
+    if not selects:
+        return "empty"
+
+    stmt = text("SELECT " + ",".join(selects)).bindparams(*bind_keys)
+    row = (await db.execute(stmt, params)).mappings().one()
+    parts = []
+    for kind, keys in keys_by_kind.items():
+        if keys:
+            rollup = f":{row[f'{kind}_rollup_at'] or '-'}" if include_rollups else ""
+            parts.append(f"{kind}[{','.join(keys)}]:{row[f'{kind}_updated_at'] or '-'}:{row[f'{kind}_rows']}{rollup}")
+    return "|".join(parts)
+
+
+async def get_exec_summary_watermark(db: AsyncSession, org_id: str, summary_type: str = "board") -> str:
+    """Token identifying the newest summary of a type (what `get_latest_exec_summary` returns)."""
+    result = await db.execute(text(EXEC_SUMMARY_WATERMARK_SQL), {"org_id": org_id, "summary_type": summary_type})
+    row = result.mappings().first()
+    return f"summary:{row['id']}:{row['updated_at']}" if row else "summary:-"
+
+
+def make_etag(watermark: str, *parts: Any, as_of: Optional[date] = None) -> str:
+    """Weak ETag over a watermark plus request identity (path, query); relative windows roll daily."""
+    material = "\n".join([watermark, (as_of or date.today()).isoformat(), *map(str, parts)])
+    return f'W/"{hashlib.sha1(material.encode()).hexdigest()[:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison as required for If-None-Match."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare for candidate in if_none_match.split(","))
@@ -0,0 +1,142 @@
+"""
+Dashboard aggregates over sales and campaigns in one round trip.
+
+`sales_aggregates_statement` groups `sales` by day once (CTE `daily`) and derives total
+revenue and order count from those day rows, takes the last `days` of them as the by-day
+series, and averages campaign ROI alongside; the result is one row per recent day with
+the totals repeated (a single row with a NULL day when there are no sales).
+
+`AggregatesCache` keeps the result in process for a short TTL. Concurrent requests for
+an expired entry share one load. Writes through the sales endpoints invalidate it;
+other workers see new rows once their TTL lapses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Select, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.marketing import CampaignORM
+from ..models.sales import SaleORM
+
+AGGREGATES_TTL_SECONDS = float(os.getenv("ANALYTICS_AGGREGATES_TTL_SECONDS", "15"))
+BY_DAY_POINTS = 7
+
+
+class DailyRevenue(BaseModel):
+    date: date
+    sales: float
+
+
+class SalesAggregates(BaseModel):
+    total_revenue: float
+    orders_count: int
+    avg_roi: float
+    by_day: List[DailyRevenue]
+
+    @property
+    def avg_order_value(self) -> float:
+        return self.total_revenue / self.orders_count if self.orders_count else 0.0
+
+    @property
+    def revenue_growth_pct(self) -> float:
+        """Change from the first to the last day of the by-day series."""
+        if len(self.by_day) < 2 or self.by_day[0].sales <= 0:
+            return 0.0
+        first, last = self.by_day[0].sales, self.by_day[-1].sales
+        return ((last - first) / first) * 100.0
+
+
+def sales_aggregates_statement(days: int = BY_DAY_POINTS) -> Select:
+    daily = (
+        select(
+            SaleORM.date.label("day"),
+            func.sum(SaleORM.revenue).label("sales"),
+            func.count(SaleORM.id).label("orders"),
+        )
+        .group_by(SaleORM.date)
+        .cte("daily")
+    )
+    totals = select(
+        func.coalesce(func.sum(daily.c.sales), 0.0).label("total_revenue"),
+        func.coalesce(func.sum(daily.c.orders), 0).label("orders_count"),
+    ).cte("totals")
+    recent = select(daily.c.day, daily.c.sales).order_by(daily.c.day.desc()).limit(days).cte("recent")
+    roi = select(func.coalesce(func.avg(CampaignORM.roi), 0.0).label("avg_roi")).cte("roi")
+    return (
+        select(totals.c.total_revenue, totals.c.orders_count, roi.c.avg_roi, recent.c.day, recent.c.sales)
+        .select_from(totals.join(roi, true()).outerjoin(recent, true()))
+        .order_by(recent.c.day.asc())
+    )
+
+
+async def fetch_sales_aggregates(db: AsyncSession, days: int = BY_DAY_POINTS) -> SalesAggregates:
+    rows = (await db.execute(sales_aggregates_statement(days))).all()
+    total_revenue, orders_count, avg_roi = rows[0][:3] if rows else (0.0, 0, 0.0)
+    return SalesAggregates(
+        total_revenue=float(total_revenue or 0.0),
+        orders_count=int(orders_count or 0),
+        avg_roi=float(avg_roi or 0.0),
+        by_day=[DailyRevenue(date=day, sales=float(sales or 0.0)) for *_, day, sales in rows if day is not None],
+    )
+
+
+class AggregatesCache:
+    """In-process TTL cache of `SalesAggregates`, keyed by the by-day window."""
+
+    def __init__(self, ttl_seconds: float = AGGREGATES_TTL_SECONDS, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: Dict[int, Tuple[float, SalesAggregates]] = {}
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, days: int = BY_DAY_POINTS) -> SalesAggregates:
+        entry = self._entries.get(days)
+        if entry is not None and self.clock() - entry[0] < self.ttl_seconds:
+            self.hits += 1
+            return entry[1]
+        pending = self._loading.get(days)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        generation = self._generation
+        pending = asyncio.get_running_loop().create_future()
+        self._loading[days] = pending
+        try:
+            aggregates = await fetch_sales_aggregates(db, days)
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(exc)
+                pending.exception()  # waiters re-raise it; avoid "never retrieved" noise
+            raise
+        finally:
+            self._loading.pop(days, None)
+        if self.ttl_seconds > 0 and generation == self._generation:
+            # Skipped when sales were written while this load ran.
+            self._entries[days] = (self.clock(), aggregates)
+        pending.set_result(aggregates)
+        return aggregates
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "ttl_seconds": self.ttl_seconds}
+
+
+sales_aggregates_cache = AggregatesCache()
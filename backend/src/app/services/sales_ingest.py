@@ -0,0 +1,307 @@
+"""
+Streaming bulk ingest for sales extracts.
+
+`ingest_sales_file` reads an uploaded CSV or NDJSON file in chunks of
+`SALES_INGEST_CHUNK_ROWS`, validates each chunk column-wise with pandas and loads the
+rows that pass. On Postgres (asyncpg) chunks go in through `COPY FROM STDIN`; other
+dialects get one batched executemany INSERT per chunk. Each chunk is committed on its
+own, so memory stays at one chunk however large the file is, and a failure part-way
+leaves the earlier chunks loaded (the report says how far it got).
+
+A plain `.json` array cannot be parsed incrementally; it is accepted for small files
+but read in full. Use CSV or NDJSON (`.ndjson` / `.jsonl`) for large extracts.
+
+With `upsert` set, reruns are idempotent. Each row gets a `dedup_key`: a hash of
+(product_id, date, region) for "natural", or of the whole row for "content". Rows
+go in through batched `INSERT ... ON CONFLICT (dedup_key, date)`. A natural-key conflict
+updates the measures only when they differ; a content-key conflict does nothing.
+`sales_ingest_manifest` keeps, per source file, the content hash last loaded for each
+dedup_key, so rerunning a file skips rows whose values it already loaded without touching
+`sales`; a key whose values changed (or changed back) is upserted and its hash replaced.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.sales import SaleORM, SalesIngestManifestORM
+
+SALES_INGEST_CHUNK_ROWS = int(os.getenv("SALES_INGEST_CHUNK_ROWS", "50000"))
+ERROR_SAMPLE_LIMIT = 20
+
+SALES_INGEST_COLUMNS = ("product_id", "date", "region", "units_sold", "revenue", "profit_margin")
+SALES_INGEST_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json"}
+UPSERT_KEYS = ("natural", "content")
+_UPSERT_MEASURES = ("units_sold", "revenue", "profit_margin")
+MANIFEST_LOOKUP_BATCH = 5000  # dedup keys per IN (...) lookup; asyncpg caps a statement at 32767 parameters
+
+
+class RowError(BaseModel):
+    row: int  # 1-based data row, header excluded
+    error: str
+
+
+class IngestReport(BaseModel):
+    loader: str
+    rows_read: int = 0
+    inserted: int = 0  # with upsert: rows inserted or updated
+    rejected: int = 0
+    unchanged: int = 0  # upsert: conflicting rows whose values already matched
+    skipped: int = 0  # upsert: in the file's manifest, or superseded later in the same chunk
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[RowError] = Field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.rows_read / self.elapsed_seconds, 1) if self.elapsed_seconds > 0 else 0.0
+
+    def summary(self) -> dict:
+        return {**self.model_dump(), "rows_per_second": self.rows_per_second}
+
+
+def sales_file_format(filename: str) -> str:
+    for suffix, fmt in SALES_INGEST_FORMATS.items():
+        if filename.lower().endswith(suffix):
+            return fmt
+    raise ValueError("Unsupported file type. Use .csv, .ndjson, .jsonl or .json")
+
+
+def iter_sales_frames(fileobj: IO[bytes], fmt: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield the file as DataFrames of at most `chunk_rows` rows."""
+    if fmt == "csv":
+        yield from pd.read_csv(fileobj, chunksize=chunk_rows, dtype=str, keep_default_na=False, encoding="utf-8")
+    elif fmt == "ndjson":
+        yield from pd.read_json(fileobj, lines=True, chunksize=chunk_rows, dtype=False, convert_dates=False)
+    elif fmt == "json":
+        payload = json.load(fileobj)
+        rows = payload if isinstance(payload, list) else [payload]
+        for start in range(0, len(rows), chunk_rows):
+            yield pd.DataFrame.from_records(rows[start : start + chunk_rows])
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _text(frame: pd.DataFrame, name: str) -> pd.Series:
+    if name not in frame.columns:
+        return pd.Series(pd.NA, index=frame.index, dtype="string")
+    return frame[name].astype("string").str.strip().replace("", pd.NA)
+
+
+def validate_sales_frame(
+    frame: pd.DataFrame, first_row: int = 1, sample_limit: int = ERROR_SAMPLE_LIMIT
+) -> Tuple[List[tuple], int, List[RowError]]:
+    """Split a parsed chunk into insertable rows and rejects.
+
+    Returns (rows in SALES_INGEST_COLUMNS order, reject count, the first `sample_limit`
+    rejects with the first failing column). Empty or missing units_sold / revenue
+    default to 0 and profit_margin to NULL; values that do not parse reject the row.
+    """
+    index = frame.index
+    product_id = _text(frame, "product_id")
+    sale_date = pd.to_datetime(_text(frame, "date"), format="%Y-%m-%d", errors="coerce")
+    region = _text(frame, "region")
+
+    def _number(name: str, default: Optional[float]) -> Tuple[pd.Series, pd.Series]:
+        raw = _text(frame, name)
+        values = pd.to_numeric(raw, errors="coerce").astype("Float64")
+        ok = raw.isna() | (values.notna() & np.isfinite(values.fillna(0)))
+        return (values if default is None else values.fillna(default)), ok
+
+    units, units_ok = _number("units_sold", 0)
+    units_ok &= (units.fillna(0) % 1 == 0)
+    revenue, revenue_ok = _number("revenue", 0.0)
+    margin, margin_ok = _number("profit_margin", None)
+
+    checks = [
+        ("product_id is required", product_id.notna()),
+        ("date must be YYYY-MM-DD", sale_date.notna()),
+        ("units_sold must be an integer", units_ok),
+        ("revenue must be a number", revenue_ok),
+        ("profit_margin must be a number", margin_ok),
+    ]
+    valid = np.logical_and.reduce([ok.to_numpy(dtype=bool) for _, ok in checks])
+    rejected = int((~valid).sum())
+
+    errors: List[RowError] = []
+    if rejected and sample_limit > 0:
+        for pos in np.flatnonzero(~valid)[:sample_limit]:
+            reason = next(message for message, ok in checks if not ok.iat[pos])
+            errors.append(RowError(row=first_row + int(pos), error=reason))
+
+    keep = pd.Series(valid, index=index)
+    rows = list(
+        zip(
+            product_id[keep].tolist(),
+            sale_date[keep].dt.date.tolist(),
+            region[keep].astype(object).where(region[keep].notna(), None).tolist(),
+            units[keep].astype("int64").tolist(),
+            revenue[keep].astype("float64").tolist(),
+            margin[keep].astype(object).where(margin[keep].notna(), None).tolist(),
+        )
+    )
+    return rows, rejected, errors
+
+
+def sales_loader(db: AsyncSession) -> str:
+    dialect = db.get_bind().dialect
+    return "copy" if dialect.name == "postgresql" and dialect.driver == "asyncpg" else "executemany"
+
+
+async def _load_chunk(db: AsyncSession, loader: str, rows: List[tuple]) -> None:
+    if loader == "copy":
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            SaleORM.__tablename__, records=rows, columns=list(SALES_INGEST_COLUMNS)
+        )
+    else:
+        await db.execute(insert(SaleORM), [dict(zip(SALES_INGEST_COLUMNS, row)) for row in rows])
+
+
+def sales_row_hash(values: Tuple) -> str:
+    """Stable 128-bit hash of a row (or key) in SALES_INGEST_COLUMNS order."""
+    raw = "\x1f".join("" if value is None else str(value) for value in values)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _dialect_insert(db: AsyncSession):
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise ValueError(f"Upsert ingest is not supported on {name}")
+    return dialect_insert
+
+
+def _rows_by_dedup_key(rows: List[tuple], key: str) -> Dict[str, Tuple[tuple, str]]:
+    """dedup_key -> (row, content hash); later rows in the chunk win."""
+    latest = {}
+    for row in rows:
+        content = sales_row_hash(row)
+        latest[sales_row_hash(row[:3]) if key == "natural" else content] = (row, content)
+    return latest
+
+
+async def upsert_sales_rows(db: AsyncSession, rows: List[tuple], key: str, source: str) -> Tuple[int, int, int]:
+    """Upsert validated rows keyed by `key`; returns (written, unchanged, skipped)."""
+    if key not in UPSERT_KEYS:
+        raise ValueError(f"upsert must be one of {list(UPSERT_KEYS)}")
+    dialect_insert = _dialect_insert(db)
+
+    latest = await asyncio.to_thread(_rows_by_dedup_key, rows, key)
+    manifest = SalesIngestManifestORM
+    dedup_keys = list(latest)
+    loaded: Dict[str, str] = {}  # dedup_key -> content hash this source last loaded for it
+    for start in range(0, len(dedup_keys), MANIFEST_LOOKUP_BATCH):
+        batch = dedup_keys[start : start + MANIFEST_LOOKUP_BATCH]
+        lookup = select(manifest.dedup_key, manifest.row_hash).where(
+            manifest.source == source, manifest.dedup_key.in_(batch)
+        )
+        loaded.update((await db.execute(lookup)).all())
+    pending = [(dedup, row, content) for dedup, (row, content) in latest.items() if loaded.get(dedup) != content]
+    if not pending:
+        return 0, 0, len(rows)
+
+    table = SaleORM.__table__
+    stmt = dialect_insert(table)
+    if key == "natural":
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.dedup_key, table.c.date],
+            set_={name: stmt.excluded[name] for name in _UPSERT_MEASURES},
+            where=or_(*(table.c[name].is_distinct_from(stmt.excluded[name]) for name in _UPSERT_MEASURES)),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[table.c.dedup_key, table.c.date])
+    written = (
+        await db.execute(
+            stmt.returning(table.c.id),
+            [{**dict(zip(SALES_INGEST_COLUMNS, row)), "dedup_key": dedup} for dedup, row, _ in pending],
+        )
+    ).all()
+    record = dialect_insert(manifest)
+    await db.execute(
+        record.on_conflict_do_update(
+            index_elements=[manifest.source, manifest.dedup_key],
+            set_={"row_hash": record.excluded.row_hash, "loaded_at": func.now()},
+        ),
+        [{"source": source, "dedup_key": dedup, "row_hash": content} for dedup, _, content in pending],
+    )
+    return len(written), len(pending) - len(written), len(rows) - len(pending)
+
+
+async def ingest_sales_file(
+    db: AsyncSession,
+    fileobj: IO[bytes],
+    filename: str,
+    chunk_rows: Optional[int] = None,
+    on_chunk: Optional[Callable[[IngestReport], None]] = None,
+    upsert: Optional[str] = None,
+    source: Optional[str] = None,
+) -> IngestReport:
+    """Parse, validate and load `fileobj` chunk by chunk, committing each chunk.
+
+    `on_chunk` is called with the running report after every committed chunk. With
+    `upsert` ("natural" or "content"), rows are upserted and recorded in the manifest
+    under `source` (default: `filename`).
+    """
+    fmt = sales_file_format(filename)
+    chunk_rows = chunk_rows or SALES_INGEST_CHUNK_ROWS
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+    if upsert is not None:
+        if upsert not in UPSERT_KEYS:
+            raise ValueError(f"upsert must be one of {list(UPSERT_KEYS)}")
+        _dialect_insert(db)
+
+    report = IngestReport(loader="upsert" if upsert else sales_loader(db))
+    started = time.perf_counter()
+    frames = iter_sales_frames(fileobj, fmt, chunk_rows)
+    while True:
+        # Parsing, validation and hashing are CPU-bound; keep them off the event loop.
+        try:
+            frame = await asyncio.to_thread(next, frames, None)
+        except ValueError as exc:  # ParserError, UnicodeDecodeError, JSONDecodeError
+            raise ValueError(
+                f"Failed to parse file after row {report.rows_read} ({report.inserted} rows already loaded): {exc}"
+            ) from exc
+        if frame is None:
+            break
+        rows, rejected, errors = await asyncio.to_thread(
+            validate_sales_frame,
+            frame,
+            first_row=report.rows_read + 1,
+            sample_limit=ERROR_SAMPLE_LIMIT - len(report.errors),
+        )
+        if rows and upsert:
+            written, unchanged, skipped = await upsert_sales_rows(db, rows, upsert, source or filename)
+            await db.commit()
+            report.inserted += written
+            report.unchanged += unchanged
+            report.skipped += skipped
+        elif rows:
+            await _load_chunk(db, report.loader, rows)
+            await db.commit()
+            report.inserted += len(rows)
+        report.rows_read += len(frame)
+        report.rejected += rejected
+        report.errors += errors
+        report.chunks += 1
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        if on_chunk is not None:
+            on_chunk(report)
+    report.elapsed_seconds = round(time.perf_counter() - started, 3)
+    return report
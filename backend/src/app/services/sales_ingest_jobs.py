@@ -0,0 +1,214 @@
+"""
+Background sales ingest jobs.
+
+`POST /api/data/upload?mode=async` spools the upload to `SALES_INGEST_SPOOL_DIR` and
+returns a job id straight away; `SALES_INGEST_WORKERS` asyncio workers per process take
+jobs off an in-memory queue and run the chunked `ingest_sales_file` load, updating the
+job after every committed chunk. Clients poll `GET /api/data/jobs/{id}` for rows
+processed, throughput and an ETA estimated from the bytes consumed so far.
+
+Jobs live in the process that accepted them (like the aggregates cache): poll the same
+worker, and re-upload anything that was queued or running when a process restarted
+(chunks it had already committed stay loaded). On shutdown `close` cancels the workers
+and deletes the spool files of jobs that never started. The newest
+`INGEST_JOB_HISTORY` finished jobs are kept for polling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import IO, Any, AsyncIterator, Callable, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .sales_aggregates import sales_aggregates_cache
+from .sales_ingest import UPSERT_KEYS, IngestReport, RowError, ingest_sales_file, sales_file_format
+
+SALES_INGEST_WORKERS = int(os.getenv("SALES_INGEST_WORKERS", "1"))
+SALES_INGEST_SPOOL_DIR = os.getenv("SALES_INGEST_SPOOL_DIR") or os.path.join(tempfile.gettempdir(), "sales-ingest")
+INGEST_JOB_HISTORY = 200
+SPOOL_COPY_BYTES = 1 << 20
+
+logger = logging.getLogger("uvicorn")
+
+
+class IngestJob(BaseModel):
+    id: str
+    filename: str
+    upsert: Optional[str] = None
+    status: Literal["queued", "running", "succeeded", "failed"] = "queued"
+    bytes_total: int = 0
+    bytes_read: int = 0
+    rows_processed: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    rows_per_second: float = 0.0
+    eta_seconds: Optional[float] = None
+    errors: List[RowError] = Field(default_factory=list)
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def record(self, report: IngestReport, bytes_read: int) -> None:
+        self.rows_processed = report.rows_read
+        self.inserted = report.inserted
+        self.rejected = report.rejected
+        self.unchanged = report.unchanged
+        self.skipped = report.skipped
+        self.chunks = report.chunks
+        self.rows_per_second = report.rows_per_second
+        self.errors = list(report.errors)
+        self.bytes_read = min(bytes_read, self.bytes_total)
+        if 0 < self.bytes_read and report.elapsed_seconds > 0:
+            remaining = self.bytes_total - self.bytes_read
+            self.eta_seconds = round(report.elapsed_seconds * remaining / self.bytes_read, 1)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@asynccontextmanager
+async def _default_session() -> AsyncIterator[AsyncSession]:
+    from ..core import database
+
+    if database.AsyncSessionLocal is None or database.DB_LOCKED_FOR_TESTS:
+        database._raise_db_disabled()
+    async with database.AsyncSessionLocal() as session:
+        yield session
+
+
+def _remove_spool(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class IngestJobQueue:
+    """In-process job broker: spooled files queue up for a small pool of asyncio workers."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] = _default_session,
+        workers: int = SALES_INGEST_WORKERS,
+        spool_dir: str = SALES_INGEST_SPOOL_DIR,
+        history: int = INGEST_JOB_HISTORY,
+        chunk_rows: Optional[int] = None,
+    ) -> None:
+        if workers <= 0 or history <= 0:
+            raise ValueError("workers and history must be positive")
+        self.session_factory = session_factory
+        self.workers = workers
+        self.spool_dir = spool_dir
+        self.history = history
+        self.chunk_rows = chunk_rows
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self._jobs.get(job_id)
+
+    async def spool(self, upload: IO[bytes], filename: str, upsert: Optional[str] = None) -> IngestJob:
+        """Copy an upload to the spool directory and queue it; returns the queued job."""
+        suffix = os.path.splitext(filename)[1].lower()
+        sales_file_format(filename)  # reject unsupported types before writing anything
+        if upsert is not None and upsert not in UPSERT_KEYS:
+            raise ValueError(f"upsert must be one of {list(UPSERT_KEYS)}")
+
+        def _copy() -> str:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.spool_dir, suffix=suffix, delete=False) as spooled:
+                shutil.copyfileobj(upload, spooled, SPOOL_COPY_BYTES)
+            return spooled.name
+
+        return self.submit(await asyncio.to_thread(_copy), filename, upsert)
+
+    def submit(self, path: str, filename: str, upsert: Optional[str] = None) -> IngestJob:
+        """Queue a file already on disk; the worker deletes it when the job ends."""
+        job = IngestJob(
+            id=uuid.uuid4().hex, filename=filename, upsert=upsert, bytes_total=os.path.getsize(path), created_at=_now()
+        )
+        self._jobs[job.id] = job
+        self._trim()
+        self._ensure_workers()
+        self._queue.put_nowait((job, path))
+        return job
+
+    async def join(self) -> None:
+        """Wait until every queued job has finished."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Cancel the workers and fail every job still queued, deleting its spool file."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while self._queue is not None and not self._queue.empty():
+            job, path = self._queue.get_nowait()
+            job.status, job.error, job.finished_at = "failed", "Cancelled", _now()
+            _remove_spool(path)
+        self._queue = None
+
+    def _trim(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None or not any(not task.done() for task in self._tasks):
+            self._queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            job, path = await queue.get()
+            try:
+                await self._run(job, path)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: IngestJob, path: str) -> None:
+        job.status = "running"
+        job.started_at = _now()
+        try:
+            with open(path, "rb") as fileobj:
+                async with self.session_factory() as db:
+                    report = await ingest_sales_file(
+                        db, fileobj, job.filename, chunk_rows=self.chunk_rows, upsert=job.upsert,
+                        on_chunk=lambda report: job.record(report, fileobj.tell()),
+                    )
+            job.record(report, job.bytes_total)
+            job.eta_seconds = 0.0
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status, job.error = "failed", "Cancelled"
+            raise
+        except Exception as exc:
+            logger.warning("Sales ingest job %s failed: %s", job.id, exc)
+            job.status, job.error = "failed", str(exc)
+        finally:
+            job.finished_at = _now()
+            if job.inserted:
+                sales_aggregates_cache.invalidate()
+            _remove_spool(path)
+
+
+ingest_jobs = IngestJobQueue()
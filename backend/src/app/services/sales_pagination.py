@@ -0,0 +1,112 @@
+"""
+Keyset pagination and NDJSON dumps over `sales`.
+
+Listings order by (date, id) and continue from an opaque cursor naming the last row of
+the previous page (returned in `X-Next-Cursor`), so every page is a range scan on the
+(date, id) index however deep it is. The cursor also bounds `date` directly, which
+lets Postgres prune the monthly partitions already paged past.
+
+`stream_sales_ndjson` walks the same keyset in pages of `chunk_rows` and writes one
+JSON object per line; each page is a short query on its own session, so a full-table
+pull holds neither a long transaction (or pooled connection) nor more than one page in
+memory.
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import date
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.sales import SaleORM
+
+NDJSON_CHUNK_ROWS = 5000
+
+SALE_COLUMNS = (
+    SaleORM.id,
+    SaleORM.product_id,
+    SaleORM.date,
+    SaleORM.region,
+    SaleORM.units_sold,
+    SaleORM.revenue,
+    SaleORM.profit_margin,
+)
+
+
+def encode_sales_cursor(sale_date: date, sale_id: int) -> str:
+    """Opaque cursor pointing just past the given sale in (date, id) order."""
+    raw = f"{sale_date.isoformat()}|{sale_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sales_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sale_date, sale_id = raw.split("|", 1)
+        return date.fromisoformat(sale_date), int(sale_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def keyset_page(stmt: Select, limit: int, cursor: Optional[str] = None, descending: bool = False) -> Select:
+    """Order `stmt` by (date, id) and restrict it to the page after `cursor`."""
+    if descending:
+        stmt = stmt.order_by(SaleORM.date.desc(), SaleORM.id.desc())
+    else:
+        stmt = stmt.order_by(SaleORM.date.asc(), SaleORM.id.asc())
+    if cursor:
+        sale_date, sale_id = decode_sales_cursor(cursor)
+        key = tuple_(SaleORM.date, SaleORM.id)
+        if descending:
+            stmt = stmt.where(SaleORM.date <= sale_date, key < tuple_(sale_date, sale_id))
+        else:
+            stmt = stmt.where(SaleORM.date >= sale_date, key > tuple_(sale_date, sale_id))
+    return stmt.limit(limit)
+
+
+def next_sales_cursor(rows: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if len(rows) < limit or not rows:
+        return None
+    last = rows[-1]
+    return encode_sales_cursor(last.date, last.id)
+
+
+def sale_record(row: Any) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "product_id": row.product_id,
+        "date": row.date.isoformat(),
+        "region": row.region,
+        "units_sold": row.units_sold,
+        "revenue": float(row.revenue),
+        "profit_margin": row.profit_margin,
+    }
+
+
+async def stream_sales_ndjson(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    conditions: Sequence[Any] = (),
+    cursor: Optional[str] = None,
+    chunk_rows: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Every matching sale as NDJSON in (date, id) order, one keyset page per query.
+
+    Validate `cursor` with `decode_sales_cursor` before streaming: errors raised here
+    surface after the response has started.
+    """
+    chunk_rows = chunk_rows or NDJSON_CHUNK_ROWS
+    while True:
+        # A session per page: the connection goes back to the pool while the client reads.
+        async with session_factory() as db:
+            stmt = keyset_page(select(*SALE_COLUMNS).where(*conditions), chunk_rows, cursor)
+            rows = (await db.execute(stmt)).all()
+        if rows:
+            yield b"".join(orjson.dumps(sale_record(row)) + b"\n" for row in rows)
+        cursor = next_sales_cursor(rows, chunk_rows)
+        if cursor is None:
+            return
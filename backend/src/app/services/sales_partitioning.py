@@ -0,0 +1,164 @@
+"""
+Backfill of the legacy text `sales.date` into the partitioned DATE table.
+
+migrations/sql/sales_date_partitioning.sql creates `sales_partitioned`, range-partitioned
+by month on a real DATE column. `backfill_sales_dates` copies `sales` into it in id
+order, one committed chunk at a time, creating the monthly partitions each chunk needs
+first; re-running resumes after the highest id already copied. Rows whose date is not
+a valid YYYY-MM-DD are left behind and counted as rejects.
+
+`swap_sales_tables` locks `sales`, copies whatever arrived since the last chunk and
+renames the tables so the partitioned one becomes `sales` (the old one is kept as
+`sales_legacy`). Sales rows are never updated in place, so copying by id is complete.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_CHUNK_SIZE = 5000
+REJECT_SAMPLE_SIZE = 20
+
+SOURCE_TABLE = "sales"
+TARGET_TABLE = "sales_partitioned"
+LEGACY_TABLE = "sales_legacy"
+
+_COLUMNS = "id, product_id, date, region, units_sold, revenue, profit_margin"
+
+_TARGET_HIGH_WATER_SQL = text(f"SELECT COALESCE(MAX(id), 0) FROM {TARGET_TABLE}")
+_SOURCE_MAX_ID_SQL = text(f"SELECT COALESCE(MAX(id), 0) FROM {SOURCE_TABLE}")
+
+# Upper id of the next chunk; a LIMIT over the id index keeps chunks even when ids are sparse.
+_CHUNK_END_SQL = text(
+    f"""
+    SELECT MAX(id) FROM (
+        SELECT id FROM {SOURCE_TABLE} WHERE id > :after_id ORDER BY id LIMIT :chunk_size
+    ) AS chunk
+    """
+)
+
+_CHUNK_MONTHS_SQL = text(
+    f"""
+    SELECT DISTINCT date_trunc('month', sales_try_date(date::text))::date AS month
+    FROM {SOURCE_TABLE}
+    WHERE id > :after_id AND id <= :through_id AND sales_try_date(date::text) IS NOT NULL
+    """
+)
+
+_ENSURE_PARTITIONS_SQL = text("SELECT ensure_sales_partitions(:parent, :from_month, :to_month)")
+
+_COPY_CHUNK_SQL = text(
+    f"""
+    INSERT INTO {TARGET_TABLE} ({_COLUMNS})
+    SELECT id, product_id, sales_try_date(date::text), region,
+           COALESCE(units_sold, 0), COALESCE(revenue, 0), profit_margin
+    FROM {SOURCE_TABLE}
+    WHERE id > :after_id AND id <= :through_id AND sales_try_date(date::text) IS NOT NULL
+    ON CONFLICT (id, date) DO NOTHING
+    """
+)
+
+_CHUNK_REJECTS_SQL = text(
+    f"""
+    SELECT id FROM {SOURCE_TABLE}
+    WHERE id > :after_id AND id <= :through_id AND sales_try_date(date::text) IS NULL
+    ORDER BY id
+    """
+)
+
+_REJECT_COUNT_SQL = text(f"SELECT COUNT(*) FROM {SOURCE_TABLE} WHERE sales_try_date(date::text) IS NULL")
+
+_LOCK_SOURCE_SQL = text(f"LOCK TABLE {SOURCE_TABLE} IN ACCESS EXCLUSIVE MODE")
+_SWAP_SQL = [
+    text(f"ALTER TABLE {SOURCE_TABLE} RENAME TO {LEGACY_TABLE}"),
+    text(f"ALTER TABLE {TARGET_TABLE} RENAME TO {SOURCE_TABLE}"),
+    text(f"ALTER SEQUENCE sales_id_seq OWNED BY {SOURCE_TABLE}.id"),
+    text(f"SELECT setval('sales_id_seq', GREATEST((SELECT COALESCE(MAX(id), 0) FROM {SOURCE_TABLE}), 1))"),
+]
+
+logger = logging.getLogger("uvicorn")
+
+
+async def _copy_chunk(
+    db: AsyncSession, after_id: int, through_id: int, known_months: Set[date], counts: Dict[str, Any]
+) -> None:
+    params = {"after_id": after_id, "through_id": through_id}
+    months = (await db.execute(_CHUNK_MONTHS_SQL, params)).scalars().all()
+    for month in sorted(set(months) - known_months):
+        created = (
+            await db.execute(_ENSURE_PARTITIONS_SQL, {"parent": TARGET_TABLE, "from_month": month, "to_month": month})
+        ).scalar()
+        counts["partitions_created"] += int(created or 0)
+        known_months.add(month)
+    result = await db.execute(_COPY_CHUNK_SQL, params)
+    counts["copied"] += max(result.rowcount or 0, 0)
+    rejected: List[int] = list((await db.execute(_CHUNK_REJECTS_SQL, params)).scalars().all())
+    counts["rejected"] += len(rejected)
+    room = REJECT_SAMPLE_SIZE - len(counts["reject_sample_ids"])
+    counts["reject_sample_ids"].extend(rejected[: max(room, 0)])
+    counts["chunks"] += 1
+    counts["last_id"] = through_id
+
+
+async def backfill_sales_dates(
+    db: AsyncSession,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_chunks: Optional[int] = None,
+    commit: bool = True,
+) -> Dict[str, Any]:
+    """Copy `sales` rows past the target's high-water id into `sales_partitioned`.
+
+    Each chunk is committed unless `commit` is false (the swap runs its final catch-up
+    inside the transaction holding the table lock).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+    counts: Dict[str, Any] = {
+        "chunks": 0,
+        "copied": 0,
+        "rejected": 0,
+        "reject_sample_ids": [],
+        "partitions_created": 0,
+    }
+    after_id = int((await db.execute(_TARGET_HIGH_WATER_SQL)).scalar() or 0)
+    counts["resumed_after_id"] = counts["last_id"] = after_id
+    known_months: Set[date] = set()
+    while max_chunks is None or counts["chunks"] < max_chunks:
+        through_id = (await db.execute(_CHUNK_END_SQL, {"after_id": after_id, "chunk_size": chunk_size})).scalar()
+        if through_id is None:
+            break
+        await _copy_chunk(db, after_id, int(through_id), known_months, counts)
+        if commit:
+            await db.commit()
+        logger.info(
+            "Sales backfill: copied through id %s (%s rows, %s rejects)", through_id, counts["copied"], counts["rejected"]
+        )
+        after_id = int(through_id)
+    counts["remaining"] = max(int((await db.execute(_SOURCE_MAX_ID_SQL)).scalar() or 0) - after_id, 0)
+    return counts
+
+
+async def swap_sales_tables(
+    db: AsyncSession, chunk_size: int = DEFAULT_CHUNK_SIZE, allow_rejects: bool = False
+) -> Dict[str, Any]:
+    """Final catch-up under an exclusive lock, then rename `sales_partitioned` to `sales`."""
+    catch_up = await backfill_sales_dates(db, chunk_size=chunk_size)
+    rejected = int((await db.execute(_REJECT_COUNT_SQL)).scalar() or 0)
+    await db.commit()
+    await db.execute(_LOCK_SOURCE_SQL)
+    final = await backfill_sales_dates(db, chunk_size=chunk_size, commit=False)
+    rejected += final["rejected"]
+    if rejected and not allow_rejects:
+        await db.rollback()
+        raise ValueError(
+            f"{rejected} sales rows have unparseable dates; fix them or allow rejects to leave them in {LEGACY_TABLE}."
+        )
+    for stmt in _SWAP_SQL:
+        await db.execute(stmt)
+    await db.commit()
+    return {"catch_up": catch_up, "final": final, "rejected": rejected, "swapped": True}
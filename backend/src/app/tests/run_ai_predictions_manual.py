@@ -37,7 +37,7 @@ async def main() -> None:
             sales.append(
                 SaleORM(
                     product_id="p1",
-                    date=str(d),
+                    date=d,
                     region="NA",
                     units_sold=2 + i,  # 2..8
                     revenue=100.0 + 15 * i,
@@ -1,3 +1,5 @@
+from datetime import date
+
 import pytest
 from sqlalchemy import text
 from src.app.core.database import AsyncSessionLocal
@@ -16,9 +18,9 @@ async def test_regression_forecast_shape_and_nonnegative(db_setup):
 
         # Seed minimal series
         session.add_all([
-            SaleORM(product_id="p1", date="2025-11-01", region="NA", units_sold=2, revenue=100.0),
-            SaleORM(product_id="p1", date="2025-11-02", region="NA", units_sold=3, revenue=115.0),
-            SaleORM(product_id="p1", date="2025-11-03", region="NA", units_sold=4, revenue=130.0),
+            SaleORM(product_id="p1", date=date(2025, 11, 1), region="NA", units_sold=2, revenue=100.0),
+            SaleORM(product_id="p1", date=date(2025, 11, 2), region="NA", units_sold=3, revenue=115.0),
+            SaleORM(product_id="p1", date=date(2025, 11, 3), region="NA", units_sold=4, revenue=130.0),
         ])
         await session.commit()
 
@@ -0,0 +1,133 @@
+import gzip
+import zlib
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.app.core.database import get_read_session_factory
+from src.app.main import app
+from src.app.routers import reports
+from src.app.services.csv_export import gzip_chunks, stream_query_csv
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+
+class _StreamResult:
+    def __init__(self, rows):
+        self.rows = rows
+        self.partition_sizes = []
+
+    async def partitions(self, size):
+        for start in range(0, len(self.rows), size):
+            chunk = self.rows[start : start + size]
+            self.partition_sizes.append(len(chunk))
+            yield chunk
+
+
+class _CursorSession:
+    """Serves `stream()` from a list of rows and records the cursor options it was given."""
+
+    def __init__(self, rows, scalar=None):
+        self.rows = rows
+        self.scalar = scalar
+        self.yield_per = []
+        self.results = []
+        self.opened = 0
+
+    async def stream(self, stmt):
+        self.yield_per.append(stmt.get_execution_options().get("yield_per"))
+        result = _StreamResult(self.rows)
+        self.results.append(result)
+        return result
+
+    async def execute(self, stmt, params=None):
+        return SimpleNamespace(scalar_one=lambda: self.scalar)
+
+    def factory(self):
+        @asynccontextmanager
+        async def _session():
+            self.opened += 1
+            yield self
+
+        return _session
+
+
+def _daily_rows(days):
+    first = date(2020, 1, 1)
+    return [(first + timedelta(days=i), i, float(i) * 1.5) for i in range(days)]
+
+
+@pytest.fixture
+def cursor_session():
+    session = _CursorSession(_daily_rows(12_000))
+    app.dependency_overrides[get_read_session_factory] = session.factory
+    try:
+        yield session
+    finally:
+        app.dependency_overrides.pop(get_read_session_factory, None)
+
+
+def test_sales_metrics_csv_streams_cursor_chunks(cursor_session):
+    resp = client.get("/sales/metrics.csv", params={"start": "2020-01-01", "end": "2053-01-01"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert "attachment" in resp.headers["content-disposition"]
+    lines = resp.text.splitlines()
+    assert lines[0] == "date,units_sold,revenue"
+    assert lines[1:3] == ["2020-01-01,0,0.0", "2020-01-02,1,1.5"]
+    assert len(lines) == 12_001
+    assert cursor_session.yield_per == [5000]
+    assert cursor_session.results[0].partition_sizes == [5000, 5000, 2000]
+
+
+def test_health_intel_csv_gzip_round_trips(cursor_session):
+    resp = client.get(
+        "/health-intel/products/metrics.csv",
+        params={"product_id": "p,1", "start": "2020-01-01", "end": "2053-01-01", "gzip": "true"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    lines = resp.text.splitlines()  # the client inflates Content-Encoding: gzip
+    assert lines[0] == "date,product_id,units_sold,revenue"
+    assert lines[2] == '2020-01-02,"p,1",1,1.5'
+    assert len(lines) == 12_001
+
+
+@pytest.mark.asyncio
+async def test_header_is_sent_before_the_query_and_gzip_flushes_per_chunk():
+    session = _CursorSession(_daily_rows(5))
+    chunks = stream_query_csv(session.factory(), object(), ["date", "units", "revenue"], lambda row: row, chunk_rows=2)
+    assert await chunks.__anext__() == b"date,units,revenue\n"
+    assert session.opened == 0
+
+    async def _lines():
+        yield b"a,b\n"
+        yield b"c,d\n"
+
+    inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pieces = [piece async for piece in gzip_chunks(_lines())]
+    assert inflate.decompress(pieces[0]) == b"a,b\n"  # readable before the stream ends
+    assert gzip.decompress(b"".join(pieces)) == b"a,b\nc,d\n"
+
+
+def test_report_csv_streams_sales_then_marketing_summary():
+    session = _CursorSession([(date(2025, 1, 1), 10.0, 2), (date(2025, 1, 2), 12.5, 3)], scalar=2.5)
+    report_app = FastAPI()
+    report_app.include_router(reports.router)
+    report_app.dependency_overrides[get_read_session_factory] = session.factory
+
+    report_client = TestClient(report_app)
+    resp = report_client.get("/api/reports/generate", params={"start_date": "2025-01-01", "end_date": "2025-12-31"})
+    assert resp.status_code == 200
+    lines = resp.text.splitlines()
+    assert lines[2:6] == ["Sales By Day", "date,total_revenue,orders", "2025-01-01,10.00,2", "2025-01-02,12.50,3"]
+    assert lines[-3:] == ["Marketing Summary", "avg_roi", "2.50"]
+    assert session.opened == 1
+
+    bad = report_client.get("/api/reports/generate", params={"start_date": "2025-02-01", "end_date": "2025-01-01"})
+    assert bad.status_code == 400
@@ -1,5 +1,6 @@
 import asyncio
 import os
+from datetime import date
 import pytest
 from sqlalchemy import select, text
 
@@ -22,8 +23,8 @@ async def test_crud_sales_and_queries(db_setup):
         session.add(p)
         await session.flush()
 
-        s1 = SaleORM(product_id=str(p.id), date="2025-11-01", region="NA", units_sold=5, revenue=49.95, profit_margin=25.0)
-        s2 = SaleORM(product_id=str(p.id), date="2025-11-02", region="EU", units_sold=3, revenue=29.97, profit_margin=22.0)
+        s1 = SaleORM(product_id=str(p.id), date=date(2025, 11, 1), region="NA", units_sold=5, revenue=49.95, profit_margin=25.0)
+        s2 = SaleORM(product_id=str(p.id), date=date(2025, 11, 2), region="EU", units_sold=3, revenue=29.97, profit_margin=22.0)
         session.add_all([s1, s2])
         await session.commit()
 
@@ -37,7 +38,7 @@ async def test_crud_sales_and_queries(db_setup):
         assert pytest.approx(total_rev, rel=1e-6) == 79.92
 
         # Filter by date
-        res2 = await session.execute(select(SaleORM).where(SaleORM.date >= "2025-11-02"))
+        res2 = await session.execute(select(SaleORM).where(SaleORM.date >= date(2025, 11, 2)))
         rows2 = res2.scalars().all()
         assert len(rows2) == 1
 
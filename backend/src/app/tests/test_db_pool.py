@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import NullPool
+
+from src.app.core.db_pool import TimedAsyncQueuePool, TimedQueuePool, WaitHistogram, engine_options, pool_stats
+
+pytestmark = pytest.mark.unit
+
+SETTINGS = SimpleNamespace(
+    DB_POOL_SIZE=8,
+    DB_MAX_OVERFLOW=4,
+    DB_POOL_TIMEOUT=2.5,
+    DB_POOL_RECYCLE=600,
+    DB_POOL_PRE_PING=True,
+    DB_STATEMENT_CACHE_SIZE=512,
+    DB_QUERY_CACHE_SIZE=2000,
+)
+
+
+def test_engine_options_follow_settings():
+    options = engine_options(SETTINGS, "postgresql+asyncpg://u:p@db/app")
+    assert options["poolclass"] is TimedAsyncQueuePool
+    assert (options["pool_size"], options["max_overflow"], options["pool_timeout"]) == (8, 4, 2.5)
+    assert (options["pool_recycle"], options["pool_pre_ping"], options["query_cache_size"]) == (600, True, 2000)
+    assert options["connect_args"] == {"prepared_statement_cache_size": 512}
+
+    null = engine_options(SETTINGS, "sqlite+aiosqlite:///x.db", use_null_pool=True)
+    assert null["poolclass"] is NullPool and "pool_size" not in null and "connect_args" not in null
+
+
+def test_histogram_buckets_waits():
+    histogram = WaitHistogram(buckets=(0.01, 0.1))
+    for seconds in (0.001, 0.05, 0.05, 3.0):
+        histogram.observe(seconds)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"le_0.01": 1, "le_0.1": 2, "le_inf": 1}
+    assert snapshot["count"] == 4 and snapshot["max_seconds"] == 3.0
+
+
+def test_pool_stats_report_checkouts_overflow_and_timeouts():
+    engine = create_engine(
+        "sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.05
+    )
+    first = engine.connect()
+    second = engine.connect()  # overflow connection
+    first.execute(text("SELECT 1"))
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    stats = pool_stats(engine)
+    assert stats["pool_class"] == "TimedQueuePool"
+    assert (stats["size"], stats["checked_out"], stats["overflow"], stats["max_overflow"]) == (1, 2, 1, 1)
+    assert stats["wait"]["count"] == 3 and stats["wait"]["timeouts"] == 1
+    assert stats["wait"]["max_seconds"] >= 0.05
+
+    second.close()
+    first.close()
+    assert pool_stats(engine)["checked_out"] == 0
+    engine.dispose()
+    assert pool_stats(None) == {"enabled": False}
@@ -0,0 +1,58 @@
+import pytest
+
+from src.optimization.index_advisor import (
+    _expand_in,
+    find_index_usage,
+    find_seq_scans,
+    insightops_query_shapes,
+)
+
+pytestmark = pytest.mark.unit
+
+PLAN = {
+    "Node Type": "Append",
+    "Plans": [
+        {
+            "Node Type": "Index Only Scan",
+            "Relation Name": "io_kpi_daily",
+            "Index Name": "ix_io_kpi_daily_org_metric_date",
+        },
+        {
+            "Node Type": "Sort",
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Relation Name": "io_engagement_signal_daily",
+                    "Filter": "(signal_key = 'touches'::text)",
+                    "Plan Rows": 12000,
+                    "Total Cost": 431.5,
+                }
+            ],
+        },
+    ],
+}
+
+
+def test_find_seq_scans_walks_nested_plans():
+    assert find_seq_scans(PLAN) == [
+        {
+            "relation": "io_engagement_signal_daily",
+            "filter": "(signal_key = 'touches'::text)",
+            "plan_rows": 12000,
+            "total_cost": 431.5,
+        }
+    ]
+    assert find_index_usage(PLAN) == ["ix_io_kpi_daily_org_metric_date"]
+
+
+def test_expand_in_inlines_expanding_binds():
+    sql, binds = _expand_in("WHERE metric_key IN :metric_keys", "metric_keys", ["revenue", "pipeline"])
+    assert sql == "WHERE metric_key IN (:metric_keys_0, :metric_keys_1)"
+    assert binds == {"metric_keys_0": "revenue", "metric_keys_1": "pipeline"}
+
+
+def test_query_shapes_bind_every_placeholder():
+    for name, (sql, params) in insightops_query_shapes().items():
+        for bind in params:
+            assert f":{bind}" in sql, name
+        assert "IN :" not in sql, name
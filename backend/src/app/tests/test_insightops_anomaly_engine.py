@@ -0,0 +1,56 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from src.app.schemas.insightops_analytics import SeriesPoint
+from src.app.services.insightops_anomalies import compute_engagement_anomalies, compute_kpi_anomalies
+from src.app.services.insightops_anomaly_engine import AnomalyScan, build_series_matrix, scan_series
+
+pytestmark = pytest.mark.unit
+
+START = date(2024, 3, 1)
+END = START + timedelta(days=20)
+
+
+def _random_series(rng: random.Random):
+    pairs = []
+    for offset in range(21):
+        if rng.random() < 0.2:
+            continue  # leave gaps
+        value = rng.choice([0.0, 0.0, rng.uniform(1, 200), rng.uniform(80, 120)])
+        pairs.append((START + timedelta(days=offset), round(value, 2)))
+    return pairs
+
+
+def test_latest_point_rules_match_point_based_functions():
+    rng = random.Random(7)
+    series = {f"s{i}": _random_series(rng) for i in range(200)}
+    keys, scan = scan_series(series, START, END)
+
+    for row, key in enumerate(keys):
+        points = [SeriesPoint(date=d, value=v) for d, v in series[key]]
+        assert scan.kpi_anomalies(row, START) == compute_kpi_anomalies(points), key
+        assert scan.engagement_anomalies(row, START) == compute_engagement_anomalies(points), key
+
+
+def test_every_point_is_scored():
+    values = np.array([[100.0, 100.0, 200.0, 100.0, 0.0, 0.0, 0.0, np.nan, np.nan, np.nan, 100.0]])
+    scan = AnomalyScan(values)
+
+    assert scan.spike[0].tolist() == [False, False, True, False, True, True, True, False, False, False, True]
+    assert scan.flatline[0, 6] and not scan.flatline[0, 5]
+    assert scan.gap_days[0, 10] == 4 and scan.gap[0, 10]
+    assert scan.collapse[0, 4]
+    assert len(scan.kpi_anomalies(0, START, latest_only=False)) == 6  # five spikes/drops and one gap
+
+
+def test_trailing_baseline_window_and_duplicate_days():
+    pairs = [(START, 10.0), (START, 5.0), (START + timedelta(days=1), 30.0)]
+    keys, values = build_series_matrix({"a": pairs}, START, START + timedelta(days=3))
+    assert values[0, :2].tolist() == [15.0, 30.0]
+    assert np.isnan(values[0, 2:]).all()
+
+    scan = AnomalyScan(np.array([[10.0, 10.0, 50.0, 50.0, 50.0]]), baseline_days=2)
+    assert scan.baseline[0].tolist()[1:] == [10.0, 10.0, 30.0, 50.0]
@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.app.schemas.insightops_analytics import SeriesPoint
+from src.app.services.insightops_anomalies import compute_engagement_anomalies, compute_kpi_anomalies
+from src.app.services.insightops_anomaly_sweep import run_anomaly_sweep
+
+pytestmark = pytest.mark.unit
+
+START = date(2024, 5, 1)
+END = START + timedelta(days=6)
+
+KPI_ROWS = [
+    ("org_a", "revenue", [100, 100, 100, 100, 100, 100, 250]),
+    ("org_a", "win_rate", [0.3, 0.3, 0.3, 0.3, 0.3, 0.3, 0.3]),
+    ("org_b", "pipeline", [50, 55, 60, 58, 61, 59, 20]),
+]
+SIGNAL_ROWS = [
+    ("org_a", "touches", [10, 12, 11, 0, 0, 0, 0]),
+    ("org_b", "replies", [5, 6, 5, 6, 5, 6, 1]),
+]
+
+
+def _rows(series):
+    return [
+        {"org_id": org, "key": key, "date": START + timedelta(days=i), "value": value}
+        for org, key, values in series
+        for i, value in enumerate(values)
+    ]
+
+
+class _StreamResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self._rows:
+            yield row
+
+
+class _ReadSession:
+    def __init__(self):
+        self.statements = []
+
+    async def stream(self, stmt, params=None):
+        self.statements.append((str(stmt), params, stmt.get_execution_options()))
+        table_rows = KPI_ROWS if "io_kpi_daily" in str(stmt) else SIGNAL_ROWS
+        return _StreamResult(_rows(table_rows))
+
+
+class _WriteSession:
+    def __init__(self):
+        self.batches = []
+        self.commits = 0
+
+    async def execute(self, stmt, params=None):
+        self.batches.append(params)
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.asyncio
+async def test_sweep_streams_each_kind_once_and_writes_in_batches():
+    read_db, write_db = _ReadSession(), _WriteSession()
+
+    report = await run_anomaly_sweep(read_db, write_db, START, END, latest_only=True, batch_series=2, fetch_rows=500)
+
+    assert len(read_db.statements) == 2
+    assert all(options["yield_per"] == 500 for _, _, options in read_db.statements)
+    assert report.series_scanned == 5
+    assert report.rows_read == 35
+    assert write_db.commits == 3  # KPI series flushed 2 + 1, signals 2
+
+    events = [event for batch in write_db.batches for event in batch]
+    assert report.anomalies_written == report.anomalies_found == len(events)
+
+    expected = []
+    for kind, series, compute in (
+        ("kpi", KPI_ROWS, compute_kpi_anomalies),
+        ("signal", SIGNAL_ROWS, compute_engagement_anomalies),
+    ):
+        for org, key, values in series:
+            points = [SeriesPoint(date=START + timedelta(days=i), value=v) for i, v in enumerate(values)]
+            expected += [(org, kind, key, a["type"], a["date"]) for a in compute(points)]
+    assert sorted((e["org_id"], e["series_kind"], e["series_key"], e["anomaly_type"], e["anomaly_date"]) for e in events) == sorted(expected)
+
+
+@pytest.mark.asyncio
+async def test_dry_run_scores_every_point_without_writing():
+    report = await run_anomaly_sweep(_ReadSession(), None, START, END, kinds=("signal",))
+
+    assert report.anomalies_written == 0
+    # touches flatlines on days 6 and 7 and collapses on days 4-7; replies collapses on day 7
+    assert report.by_kind == {"signal": 7}
+    assert report.series_per_second > 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_rejects_inverted_window():
+    with pytest.raises(ValueError):
+        await run_anomaly_sweep(_ReadSession(), None, END, START)
@@ -0,0 +1,139 @@
+import json
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.database import get_read_session_factory, get_session_factory
+from src.app.main import app
+from src.app.services import insightops_brief_batch, insightops_executive_brief
+from src.app.services.insightops_brief_batch import stream_executive_briefs
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+TODAY = date.today()
+SERIES = {
+    ("org_a", "revenue"): [100, 104, 98, 160],
+    ("org_a", "pipeline"): [50, 52, 51, 40],
+    ("org_a", "touches"): [10, 12, 11, 3],
+    ("org_b", "revenue"): [80, 80, 81, 79],
+    ("org_b", "touches"): [5, 6, 5, 6],
+}
+
+
+def _rows(org_id, key):
+    values = SERIES.get((org_id, key), [])
+    return [{"date": TODAY - timedelta(days=len(values) - 1 - i), "value": v} for i, v in enumerate(values)]
+
+
+class _BatchSession:
+    def __init__(self):
+        self.queries = []
+        self.inserted = []
+        self.commits = 0
+        self.closed = False
+
+    async def execute(self, stmt, params=None):
+        assert not self.closed, "session used after it was closed"
+        if "io_exec_summary" in str(stmt):
+            self.inserted.extend(params)
+            return SimpleNamespace()
+        self.queries.append(params)
+        rows = [
+            {"org_id": org_id, "kind": kind, "key": key, **row}
+            for org_id in params["org_ids"]
+            for kind, keys in (("kpi", params.get("metric_keys", [])), ("signal", params.get("signal_keys", [])))
+            for key in keys
+            for row in _rows(org_id, key)
+        ]
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: rows))
+
+    async def commit(self):
+        self.commits += 1
+
+
+class _SessionFactory:
+    """Hands out a fresh `_BatchSession` per `async with`, closing it on exit."""
+
+    def __init__(self):
+        self.sessions = []
+
+    @asynccontextmanager
+    async def __call__(self):
+        session = _BatchSession()
+        self.sessions.append(session)
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+    @property
+    def queries(self):
+        return [query for session in self.sessions for query in session.queries]
+
+    @property
+    def inserted(self):
+        return [row for session in self.sessions for row in session.inserted]
+
+
+def _comparable(brief):
+    return brief.model_dump(exclude={"generated_at"})
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_org_briefs(monkeypatch):
+    async def fake_fetch(db, org_id, start_date, end_date, metric_key=None, signal_key=None):
+        return _rows(org_id, metric_key or signal_key)
+
+    monkeypatch.setattr("src.app.services.insightops_analytics.cache.fetch_kpi_series", fake_fetch)
+    monkeypatch.setattr("src.app.services.insightops_analytics.cache.fetch_signal_series", fake_fetch)
+
+    factory = _SessionFactory()
+    briefs = [b async for b in stream_executive_briefs(factory, ["org_a", "org_b", "org_c", "org_a"], orgs_per_query=2)]
+
+    assert [b.org_id for b in briefs] == ["org_a", "org_b", "org_c"]
+    assert [q["org_ids"] for q in factory.queries] == [["org_a", "org_b"], ["org_c"]]
+    for brief in briefs:
+        single = await insightops_executive_brief.build_executive_brief(db=None, org_id=brief.org_id)
+        assert _comparable(brief) == _comparable(single)
+
+
+def _post_batch(factory, **payload):
+    app.dependency_overrides[get_read_session_factory] = lambda: factory
+    app.dependency_overrides[get_session_factory] = lambda: factory
+    try:
+        return client.post("/api/insightops/executive-brief:batch", json=payload)
+    finally:
+        app.dependency_overrides.pop(get_read_session_factory, None)
+        app.dependency_overrides.pop(get_session_factory, None)
+
+
+def test_batch_endpoint_streams_ndjson_and_bulk_inserts():
+    factory = _SessionFactory()
+    resp = _post_batch(factory, org_ids=["org_a", "org_b"], persist=True, summary_type="board_pack")
+    bad = _post_batch(_SessionFactory(), org_ids=[], persist=True)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["org_id"] for line in lines] == ["org_a", "org_b"]
+    assert all(line["saved"] and line["summary_type"] == "board_pack" for line in lines)
+    assert len(factory.queries) == 1 and [s.commits for s in factory.sessions] == [1]
+    assert [row["org_id"] for row in factory.inserted] == ["org_a", "org_b"]
+    assert [str(row["id"]) for row in factory.inserted] == [line["summary_id"] for line in lines]
+    assert bad.status_code == 400
+
+
+def test_batch_endpoint_opens_a_live_session_for_every_chunk(monkeypatch):
+    # Later chunks are fetched while the body streams, after request dependencies have closed.
+    monkeypatch.setattr(insightops_brief_batch, "ORGS_PER_QUERY", 2)
+    factory = _SessionFactory()
+    resp = _post_batch(factory, org_ids=["org_a", "org_b", "org_c", "org_d", "org_e"], persist=True)
+
+    assert resp.status_code == 200
+    assert [json.loads(line)["org_id"] for line in resp.text.splitlines()] == ["org_a", "org_b", "org_c", "org_d", "org_e"]
+    assert [q["org_ids"] for q in factory.queries] == [["org_a", "org_b"], ["org_c", "org_d"], ["org_e"]]
+    assert len(factory.sessions) == 3 and all(s.closed and s.commits == 1 for s in factory.sessions)
@@ -0,0 +1,189 @@
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.app.core.database import Base, get_db
+from src.app.main import app
+from src.app.models.insightops import IoEngagementSignalDailyORM, IoExecSummaryORM, IoKpiDailyORM
+from src.app.schemas.insightops_executive_brief import ExecutiveBriefResponse
+from src.app.services import insightops_brief_cache
+from src.app.services.insightops_brief_cache import BriefSnapshotCache, get_or_build_brief
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+
+def _brief(org_id="demo_org", score=55) -> ExecutiveBriefResponse:
+    return ExecutiveBriefResponse(
+        org_id=org_id,
+        generated_at=datetime.utcnow(),
+        window_days=14,
+        priority_score=score,
+        priority_level="medium",
+        insights=[],
+        risks=[],
+        opportunities=[],
+        notes=[],
+    )
+
+
+class _WatermarkSession:
+    def __init__(self, kpi_rows=10):
+        self.kpi_rows = kpi_rows
+        self.rollbacks = 0
+
+    async def execute(self, stmt, params=None):
+        row = {"kpi_updated_at": "2024-06-01", "kpi_rows": self.kpi_rows, "signal_updated_at": None, "signal_rows": 0}
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(one=lambda: row), rowcount=0)
+
+    async def commit(self):
+        return None
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def durable(monkeypatch):
+    store = {}
+
+    async def fake_get_latest(db, org_id, summary_type="board", include_payload=False):
+        payload = store.get((org_id, summary_type))
+        return SimpleNamespace(payload_json=payload) if payload else None
+
+    async def fake_save(db, org_id, brief, summary_type="board", **kwargs):
+        store[(org_id, summary_type)] = brief.model_dump(mode="json")
+        return SimpleNamespace(id="x")
+
+    monkeypatch.setattr("src.app.services.insightops_exec_persistence.get_latest_exec_summary", fake_get_latest)
+    monkeypatch.setattr("src.app.services.insightops_exec_persistence.save_exec_brief", fake_save)
+    return store
+
+
+def test_lru_evicts_oldest_and_invalidates_per_org():
+    cache = BriefSnapshotCache(max_entries=2)
+    cache.put(("a", 1), _brief("a"))
+    cache.put(("b", 1), _brief("b"))
+    assert cache.get(("a", 1)) is not None
+    cache.put(("c", 1), _brief("c"))
+
+    assert cache.get(("b", 1)) is None
+    assert cache.invalidate("a") == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_served_until_watermark_changes(durable):
+    cache = BriefSnapshotCache()
+    db = _WatermarkSession()
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return _brief(score=len(builds))
+
+    args = dict(org_id="demo_org", window_days=14, metric_keys=["revenue"], signal_keys=["touches"], build=build, cache=cache)
+    first = await get_or_build_brief(db, **args)
+    second = await get_or_build_brief(db, **args)
+    assert len(builds) == 1 and second is first
+    assert len(durable) == 1 and next(iter(durable))[1].startswith("snapshot:")
+
+    # A fresh process misses the LRU but reuses the durable snapshot.
+    restored = await get_or_build_brief(db, **{**args, "cache": BriefSnapshotCache()})
+    assert len(builds) == 1 and restored.priority_score == first.priority_score
+
+    db.kpi_rows = 11
+    rebuilt = await get_or_build_brief(db, **args)
+    assert len(builds) == 2 and rebuilt.priority_score == 2
+
+
+class _SqliteSession:
+    """Async facade over a sync ORM session on in-memory SQLite."""
+
+    def __init__(self, session):
+        self.session = session
+
+    def add(self, instance):
+        self.session.add(instance)
+
+    async def execute(self, stmt, params=None):
+        return self.session.execute(stmt, params)
+
+    async def commit(self):
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+    async def refresh(self, instance):
+        self.session.refresh(instance)
+
+
+@pytest.fixture
+def sqlite_db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    tables = [IoKpiDailyORM.__table__, IoEngagementSignalDailyORM.__table__, IoExecSummaryORM.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield _SqliteSession(session)
+    engine.dispose()
+
+
+async def _add_revenue(db, day):
+    await db.execute(insert(IoKpiDailyORM).values(org_id="demo_org", metric_key="revenue", kpi_date=day, metric_value=10))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_snapshots_round_trip_through_a_json_column_and_keep_one_version(sqlite_db):
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return _brief(score=len(builds))
+
+    args = dict(org_id="demo_org", window_days=14, metric_keys=["revenue"], signal_keys=["touches"], build=build)
+    await _add_revenue(sqlite_db, date.today())
+    first = await get_or_build_brief(sqlite_db, **args, cache=BriefSnapshotCache())
+
+    # Rows outside the brief window leave the watermark alone.
+    await _add_revenue(sqlite_db, date.today() - timedelta(days=90))
+    restored = await get_or_build_brief(sqlite_db, **args, cache=BriefSnapshotCache())
+    assert len(builds) == 1 and restored == first
+
+    await _add_revenue(sqlite_db, date.today())
+    rebuilt = await get_or_build_brief(sqlite_db, **args, cache=BriefSnapshotCache())
+    assert len(builds) == 2 and rebuilt.priority_score == 2
+
+    rows = (await sqlite_db.execute(select(IoExecSummaryORM.summary_type, IoExecSummaryORM.payload_json))).all()
+    assert len(rows) == 1 and rows[0].summary_type.startswith("snapshot:")
+    assert ExecutiveBriefResponse.model_validate(rows[0].payload_json) == rebuilt
+
+
+def test_invalidate_endpoint_drops_hot_and_durable_snapshots(monkeypatch):
+    insightops_brief_cache.brief_snapshot_cache.put(("org_x", 14), _brief("org_x"))
+
+    class _DeleteSession:
+        async def execute(self, stmt, params=None):
+            assert "io_exec_summary" in str(stmt)
+            return SimpleNamespace(rowcount=3)
+
+        async def commit(self):
+            return None
+
+    async def _db():
+        yield _DeleteSession()
+
+    app.dependency_overrides[get_db] = _db
+    try:
+        resp = client.post("/api/insightops/executive-brief/invalidate", params={"org_id": "org_x"})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert resp.status_code == 200
+    assert resp.json() == {"org_id": "org_x", "removed": {"hot": 1, "durable": 3}}
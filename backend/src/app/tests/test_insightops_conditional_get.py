@@ -0,0 +1,74 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.database import get_db
+from src.app.main import app
+from src.app.schemas.insightops_analytics import SeriesPoint, SeriesResponse
+from src.app.services.insightops_watermarks import etag_matches
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+
+class _WatermarkSession:
+    def __init__(self):
+        self.kpi_rows = 10
+        self.watermark_queries = []
+
+    async def execute(self, stmt, params=None):
+        self.watermark_queries.append(params)
+        row = {"kpi_updated_at": "2024-06-01 10:00", "kpi_rows": self.kpi_rows}
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(one=lambda: row))
+
+
+@pytest.fixture
+def session(monkeypatch):
+    db = _WatermarkSession()
+    series_calls = []
+
+    async def fake_kpi_series(**kwargs):
+        series_calls.append(kwargs)
+        today = date.today()
+        return SeriesResponse(
+            org_id=kwargs["org_id"], key="revenue", start_date=today, end_date=today,
+            points=[SeriesPoint(date=today, value=1.0)],
+        )
+
+    async def _db():
+        yield db
+
+    monkeypatch.setattr("src.app.services.insightops_analytics.get_kpi_series", fake_kpi_series)
+    app.dependency_overrides[get_db] = _db
+    db.series_calls = series_calls
+    yield db
+    app.dependency_overrides.pop(get_db, None)
+
+
+def test_unchanged_series_returns_304_without_querying(session):
+    url = "/api/insightops/analytics/kpis/series"
+    first = client.get(url, params={"metric_key": "revenue"})
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith('W/"')
+    assert session.watermark_queries[0]["kpi_keys"] == ["revenue"]
+
+    cached = client.get(url, params={"metric_key": "revenue"}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["ETag"] == etag and cached.content == b""
+    assert len(session.series_calls) == 1
+
+    other_window = client.get(url, params={"metric_key": "revenue", "lookback_days": 30}, headers={"If-None-Match": etag})
+    assert other_window.status_code == 200
+
+    session.kpi_rows = 11
+    changed = client.get(url, params={"metric_key": "revenue"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    assert etag_matches('"abc", W/"def"', 'W/"def"')
+    assert etag_matches('"def"', 'W/"def"')
+    assert etag_matches("*", 'W/"def"')
+    assert not etag_matches(None, 'W/"def"')
+    assert not etag_matches('W/"xyz"', 'W/"def"')
@@ -142,3 +142,76 @@ def test_list_executive_summaries_endpoint(monkeypatch):
   assert isinstance(body, list)
   assert len(body) == 2
   assert body[0]["summary_text"] == "Summary A"
+
+
+class _CapturingSession:
+  def __init__(self, rows):
+    self.rows = rows
+    self.statements = []
+
+  async def execute(self, stmt, params=None):
+    self.statements.append(stmt)
+    return SimpleNamespace(all=lambda: self.rows, first=lambda: self.rows[0] if self.rows else None)
+
+
+def _sql(stmt) -> str:
+  from sqlalchemy.dialects import postgresql
+
+  return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_list_exec_summaries_projects_and_pages_by_keyset():
+  from src.app.services import insightops_exec_persistence as exec_persistence
+
+  db = _CapturingSession([])
+  await exec_persistence.list_exec_summaries(db, org_id="demo_org", limit=5)
+  first_page = _sql(db.statements[-1])
+  assert "io_exec_summary.payload_json" not in first_page
+  assert "NULL AS payload_json" in first_page
+  assert "ORDER BY io_exec_summary.created_at DESC, io_exec_summary.id DESC" in first_page
+
+  cursor = exec_persistence.encode_summary_cursor(datetime(2024, 6, 1, 12, 0), uuid4())
+  await exec_persistence.list_exec_summaries(db, org_id="demo_org", cursor=cursor, include_payload=True)
+  next_page = _sql(db.statements[-1])
+  assert "io_exec_summary.payload_json" in next_page
+  assert "(io_exec_summary.created_at, io_exec_summary.id) < (" in next_page
+
+  with pytest.raises(ValueError):
+    exec_persistence.decode_summary_cursor("not-a-cursor")
+
+
+def test_list_executive_summaries_returns_next_cursor(monkeypatch):
+  from src.app.services import insightops_exec_persistence as exec_persistence
+
+  created = datetime(2024, 6, 1, 12, 0)
+  rows = [
+    SimpleNamespace(
+      id=uuid4(),
+      period_start=date(2024, 5, 18),
+      period_end=date(2024, 6, 1),
+      org_id="demo_org",
+      summary_type="board",
+      summary_text=f"Summary {i}",
+      payload_json=None,
+      model_name=None,
+      created_at=created - timedelta(hours=i),
+      updated_at=created,
+    )
+    for i in range(2)
+  ]
+  seen = {}
+
+  async def fake_list(*args, **kwargs):
+    seen.update(kwargs)
+    return rows[: kwargs["limit"]]
+
+  monkeypatch.setattr("src.app.services.insightops_exec_persistence.list_exec_summaries", fake_list)
+
+  resp = client.get("/api/insightops/executive-summaries", params={"limit": 2, "cursor": "abc"})
+  assert resp.status_code == 200
+  assert seen["cursor"] == "abc"
+  assert exec_persistence.decode_summary_cursor(resp.headers["X-Next-Cursor"]) == (rows[1].created_at, rows[1].id)
+
+  resp = client.get("/api/insightops/executive-summaries", params={"limit": 3})
+  assert "X-Next-Cursor" not in resp.headers
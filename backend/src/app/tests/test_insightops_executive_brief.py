@@ -114,3 +114,96 @@ def test_executive_brief_handles_missing_data(monkeypatch):
     # No anomalies + limited signals should still return a payload
     assert body["risks"] == []
     assert body["opportunities"] == []
+
+
+class _FakeSession:
+    pass
+
+
+class _FakeSessionFactory:
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self):
+        factory = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                session = _FakeSession()
+                factory.opened.append(session)
+                return session
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+@pytest.mark.asyncio
+async def test_fan_out_uses_one_session_per_load_and_degrades_on_timeout(monkeypatch):
+    import asyncio
+
+    from src.app.services import insightops_executive_brief
+
+    seen_sessions = []
+
+    async def fake_kpi_summary(db, **kwargs):
+        seen_sessions.append(db)
+        return DeltaSummary(
+            latest_value=120.0,
+            previous_value=100.0,
+            absolute_delta=20.0,
+            percent_delta=20.0,
+            rolling_avg_7d_latest=110.0,
+        )
+
+    async def fake_engagement_summary(db, **kwargs):
+        seen_sessions.append(db)
+        return EngagementSummary(total=100.0, average_per_day=10.0, last_day_value=12.0, health_score=85.0)
+
+    async def slow_anomalies(db, **kwargs):
+        seen_sessions.append(db)
+        await asyncio.sleep(1)
+        return AnomalyResponse(org_id="demo_org", anomalies=[])
+
+    monkeypatch.setattr("src.app.services.insightops_executive_brief.get_kpi_summary", fake_kpi_summary)
+    monkeypatch.setattr("src.app.services.insightops_executive_brief.get_engagement_summary", fake_engagement_summary)
+    monkeypatch.setattr("src.app.services.insightops_executive_brief.get_anomalies", slow_anomalies)
+
+    factory = _FakeSessionFactory()
+    brief = await insightops_executive_brief.build_executive_brief(
+        db=None,
+        org_id="demo_org",
+        fan_out=True,
+        session_factory=factory,
+        timeout_seconds=0.05,
+    )
+
+    assert len(factory.opened) == 5
+    assert len({id(s) for s in seen_sessions}) == 5
+    assert any("Anomaly scan unavailable (timed out" in note for note in brief.notes)
+    assert any(insight.category == "kpi" for insight in brief.insights)
+    assert not any(risk.title == "Anomalies detected" for risk in brief.risks)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_propagates_invalid_keys(monkeypatch):
+    from src.app.services import insightops_executive_brief
+
+    async def bad_kpi_summary(db, **kwargs):
+        raise ValueError("Unsupported metric_key")
+
+    async def fake_engagement_summary(db, **kwargs):
+        return EngagementSummary(total=0.0, average_per_day=0.0, last_day_value=None, health_score=0.0)
+
+    async def no_anomalies(db, **kwargs):
+        return AnomalyResponse(org_id="demo_org", anomalies=[])
+
+    monkeypatch.setattr("src.app.services.insightops_executive_brief.get_kpi_summary", bad_kpi_summary)
+    monkeypatch.setattr("src.app.services.insightops_executive_brief.get_engagement_summary", fake_engagement_summary)
+    monkeypatch.setattr("src.app.services.insightops_executive_brief.get_anomalies", no_anomalies)
+
+    with pytest.raises(ValueError):
+        await insightops_executive_brief.build_executive_brief(
+            db=None, fan_out=True, session_factory=_FakeSessionFactory(), timeout_seconds=0.5
+        )
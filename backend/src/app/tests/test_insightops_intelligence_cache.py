@@ -0,0 +1,65 @@
+import pytest
+from pydantic import ValidationError
+
+from src.app.intelligence import demo_profiles
+from src.app.schemas.insightops_analytics import AnomalyResponse, DeltaSummary, EngagementSummary
+from src.app.services import insightops_intelligence
+from src.app.services.insightops_intelligence import build_cross_domain_intelligence
+
+pytestmark = pytest.mark.unit
+
+
+def _intel(percent_delta: float, explain: bool = True):
+    return build_cross_domain_intelligence(
+        kpi_key="revenue",
+        engagement_key="touches",
+        kpi_summary=DeltaSummary(latest_value=100, previous_value=120, absolute_delta=-20, percent_delta=percent_delta, rolling_avg_7d_latest=110),
+        engagement_summary=EngagementSummary(total=100, average_per_day=10, last_day_value=8, health_score=70),
+        anomaly_summary=AnomalyResponse(org_id="demo", anomalies=[]),
+        explain=explain,
+    )
+
+
+def test_pipeline_runs_once_per_normalized_input():
+    insightops_intelligence.clear_intelligence_cache()
+    first = _intel(-0.1666667)
+    second = _intel(-0.16666670000001, explain=False)
+
+    info = insightops_intelligence.intelligence_cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert first["narrative"] == first["executive_narrative"] == second["narrative"]
+    assert first["explainability_notes"] and second["explainability_notes"] == ()
+
+
+def test_pipeline_scores_unrounded_deltas(monkeypatch):
+    insightops_intelligence.clear_intelligence_cache()
+    seen = []
+    run = insightops_intelligence._run_pipeline
+    monkeypatch.setattr(insightops_intelligence, "_run_pipeline", lambda *args: seen.append(args) or run(*args))
+
+    _intel(-0.49999996)
+    _intel(-0.49999997)
+    assert [args[2] for args in seen] == [-0.49999996]
+
+
+def test_cached_bundles_are_read_only():
+    insightops_intelligence.clear_intelligence_cache()
+    intel = _intel(0.05)
+    with pytest.raises(ValidationError):
+        intel["priorities"][0].title = "changed"
+    with pytest.raises(TypeError):
+        intel["narrative"]["headline"] = "changed"
+
+    assert _intel(0.05)["priorities"] is intel["priorities"]
+
+
+def test_demo_profiles_are_precomputed_and_shared():
+    assert demo_profiles.precompute_demo_profiles() == len(demo_profiles.DEMO_PROFILES)
+    bundle = demo_profiles.get_demo_profile("EXEC_ANOMALY_SPIKE")
+    assert bundle["priorities"][0].title == "Anomaly spike"
+    with pytest.raises(TypeError):
+        bundle["priorities"] = ()
+
+    assert demo_profiles.get_demo_profile("EXEC_ANOMALY_SPIKE") is bundle
+    with pytest.raises(ValueError):
+        demo_profiles.get_demo_profile("EXEC_UNKNOWN")
@@ -0,0 +1,69 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from src.app.core.database import get_db
+from src.app.main import app
+from src.app.services.insightops_analytics import kpi_breakdown_statement
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+START, END = date(2024, 6, 1), date(2024, 6, 14)
+
+
+def _sql(**kwargs) -> str:
+    args = dict(group_by=["region"], filters={}, aggregation="sum", granularity="total")
+    args.update(kwargs)
+    stmt = kpi_breakdown_statement("demo_org", "revenue", START, END, **args)
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_breakdown_pushes_aggregation_into_sql():
+    summed = _sql(filters={"channel": ["web", "partner"]})
+    assert "sum(io_kpi_daily.metric_value) AS value" in summed
+    assert "GROUP BY io_kpi_daily.region" in summed
+    assert "io_kpi_daily.channel IN" in summed
+
+    daily_avg = _sql(group_by=["region", "segment"], aggregation="avg", granularity="day")
+    assert "GROUP BY io_kpi_daily.region, io_kpi_daily.segment, io_kpi_daily.kpi_date" in daily_avg
+
+    last = _sql(aggregation="last")
+    assert "max(io_kpi_daily.kpi_date) OVER (PARTITION BY io_kpi_daily.region)" in last
+    assert "CASE WHEN (anon_1.kpi_date = anon_1.latest_date)" in last
+
+
+def test_breakdown_endpoint_returns_columns():
+    statements = []
+
+    class _Session:
+        async def execute(self, stmt, params=None):
+            statements.append(str(stmt))
+            rows = [
+                {"region": "eu", "value": 12, "rows": 2},
+                {"region": None, "value": 3.5, "rows": 1},
+            ]
+            return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: rows))
+
+    async def _db():
+        yield _Session()
+
+    app.dependency_overrides[get_db] = _db
+    try:
+        resp = client.get(
+            "/api/insightops/analytics/kpis/breakdown",
+            params={"group_by": "region", "segment": ["smb"], "start_date": "2024-06-01", "end_date": "2024-06-14"},
+        )
+        bad = client.get("/api/insightops/analytics/kpis/breakdown", params={"group_by": "source"})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["columns"] == {"region": ["eu", None], "value": [12.0, 3.5], "rows": [2, 1]}
+    assert body["filters"] == {"segment": ["smb"]}
+    assert any("GROUP BY" in sql for sql in statements)
+    assert bad.status_code == 400
@@ -0,0 +1,209 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.app.core.database import Base
+from src.app.models.insightops import IoKpiDailyORM, IoSeriesRollupDailyORM, IoSeriesRollupStateORM
+from src.app.schemas.insightops_analytics import SeriesPoint
+from src.app.services import insightops
+from src.app.services.insightops_analytics import rollups
+from src.app.services.insightops_analytics import (
+    build_rollup_rows,
+    compute_kpi_delta,
+    fetch_rollup_window,
+    refresh_rollups,
+    window_from_rollups,
+)
+from src.app.services.insightops_engagement import aggregate_signals, compute_engagement_health
+
+pytestmark = pytest.mark.unit
+
+START = date(2024, 1, 1)
+VALUES = [120.0, 80.0, 95.0, 0.0, 140.0, 60.0, 75.0, 110.0, 90.0, 30.0, 100.0, 105.0]
+DAILY = [(START + timedelta(days=i), v) for i, v in enumerate(VALUES)]
+
+
+def _window(rows, start, end):
+    inside = [r for r in rows if start <= r["rollup_date"] <= end]
+    before = [r for r in rows if r["rollup_date"] < start]
+    return window_from_rollups(start, end, inside[-1] if inside else None, before[-1] if before else None)
+
+
+def _points(start, end):
+    return [SeriesPoint(date=d, value=v) for d, v in DAILY if start <= d <= end]
+
+
+@pytest.mark.parametrize("offset,length", [(0, 12), (3, 9), (5, 1), (2, 2), (4, 7), (20, 3)])
+def test_rollup_window_matches_point_summaries(offset, length):
+    rows = build_rollup_rows("org", "kpi", "revenue", DAILY)
+    start = START + timedelta(days=offset)
+    end = start + timedelta(days=length - 1)
+
+    window = _window(rows, start, end)
+    points = _points(start, end)
+
+    assert compute_kpi_delta([], rollup=window) == compute_kpi_delta(points)
+    assert aggregate_signals([], rollup=window) == aggregate_signals(points)
+    assert compute_engagement_health([], rollup=window) == compute_engagement_health(points)
+
+
+def test_incremental_rebuild_matches_full_build():
+    full = build_rollup_rows("org", "signal", "touches", DAILY)
+
+    head = build_rollup_rows("org", "signal", "touches", DAILY[:8])
+    tail = build_rollup_rows("org", "signal", "touches", DAILY[8:], seed=head[-6:])
+
+    assert head + tail == full
+
+
+def test_rollup_rejects_non_default_rolling_window():
+    rows = build_rollup_rows("org", "kpi", "revenue", DAILY)
+    window = _window(rows, START, START + timedelta(days=11))
+
+    with pytest.raises(ValueError):
+        compute_kpi_delta([], rolling_avg_window=3, rollup=window)
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, stmt, params=None):
+        return _FakeResult(self.rows)
+
+
+@pytest.mark.asyncio
+async def test_fetch_rollup_window_is_none_until_series_is_rolled_up():
+    assert await fetch_rollup_window(_FakeSession([]), "kpi", "org", "revenue", START, START) is None
+
+    state_only = _FakeSession([{"slot": "state"}])
+    window = await fetch_rollup_window(state_only, "kpi", "org", "revenue", START, START)
+    assert window.days == 0 and window.latest_value is None
+
+
+class _SqliteSession:
+    """Async facade over a sync ORM session on in-memory SQLite."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def execute(self, stmt, params=None):
+        return self.session.execute(stmt, params)
+
+    async def commit(self):
+        self.session.commit()
+
+
+@pytest.fixture
+def kpi_db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    tables = [IoKpiDailyORM.__table__, IoSeriesRollupDailyORM.__table__, IoSeriesRollupStateORM.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield _SqliteSession(session)
+    engine.dispose()
+
+
+def _add_kpi(db, day, value, region, updated_at, metric_key="revenue"):
+    db.session.execute(
+        insert(IoKpiDailyORM),
+        [{"id": uuid.uuid4(), "org_id": "org", "metric_key": metric_key, "kpi_date": day, "metric_value": value,
+          "region": region, "updated_at": updated_at}],
+    )
+    db.session.commit()
+
+
+def _rollups_enabled(monkeypatch, enabled):
+    settings = SimpleNamespace(INSIGHTOPS_ROLLUPS_ENABLED=enabled, INSIGHTOPS_ROLLUP_RESCAN_SECONDS=900)
+    monkeypatch.setattr(rollups, "get_settings", lambda: settings)
+
+
+@pytest.mark.asyncio
+async def test_rollup_and_raw_summaries_agree_with_several_rows_per_day(kpi_db, monkeypatch):
+    today = date.today()
+    old = datetime.now(timezone.utc) - timedelta(hours=1)
+    for offset, values in enumerate([(10.0,), (20.0, 5.0), (7.0,), (30.0, 12.0, 1.0)][::-1]):
+        for i, value in enumerate(values):
+            _add_kpi(kpi_db, today - timedelta(days=offset), value, f"r{i}", old)
+
+    assert await refresh_rollups(kpi_db, kinds=("kpi",)) == {"series": 1, "rows": 4}
+
+    _rollups_enabled(monkeypatch, False)
+    raw = await insightops.get_kpi_summary(db=kpi_db, org_id="org", metric_key="revenue", lookback_days=14)
+    _rollups_enabled(monkeypatch, True)
+    rolled = await insightops.get_kpi_summary(db=kpi_db, org_id="org", metric_key="revenue", lookback_days=14)
+
+    assert raw == rolled
+    assert (raw.latest_value, raw.previous_value) == (43.0, 7.0)
+
+
+@pytest.mark.asyncio
+async def test_ratio_kpis_average_same_day_rows_in_raw_and_rollup_paths(kpi_db, monkeypatch):
+    today = date.today()
+    old = datetime.now(timezone.utc) - timedelta(hours=1)
+    for offset, rates in enumerate([(0.2, 0.4), (0.5,), (0.1, 0.3, 0.8)][::-1]):
+        for i, rate in enumerate(rates):
+            _add_kpi(kpi_db, today - timedelta(days=offset), rate, f"r{i}", old, metric_key="win_rate")
+
+    await refresh_rollups(kpi_db, kinds=("kpi",))
+
+    _rollups_enabled(monkeypatch, False)
+    raw = await insightops.get_kpi_summary(db=kpi_db, org_id="org", metric_key="win_rate", lookback_days=14)
+    _rollups_enabled(monkeypatch, True)
+    rolled = await insightops.get_kpi_summary(db=kpi_db, org_id="org", metric_key="win_rate", lookback_days=14)
+
+    assert raw == rolled
+    assert (raw.latest_value, raw.previous_value) == (pytest.approx(0.4), pytest.approx(0.5))
+
+
+@pytest.mark.asyncio
+async def test_refresh_rescans_rows_committed_late_behind_the_watermark(kpi_db):
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    _add_kpi(kpi_db, today, 10.0, "a", now)
+    await refresh_rollups(kpi_db, kinds=("kpi",), rescan_seconds=60)
+    state = kpi_db.session.scalars(select(IoSeriesRollupStateORM)).one()
+    assert state.source_watermark.replace(tzinfo=timezone.utc) < now  # held back by the rescan window
+
+    # A load transaction that started 30s ago commits a row stamped behind the newest one seen.
+    _add_kpi(kpi_db, today, 5.0, "b", now - timedelta(seconds=30))
+    assert await refresh_rollups(kpi_db, kinds=("kpi",), rescan_seconds=60) == {"series": 1, "rows": 1}
+    day_value = kpi_db.session.scalars(select(IoSeriesRollupDailyORM.day_value)).one()
+    assert float(day_value) == 15.0
+
+    # Once rows are older than the rescan window, an idle series is no longer rescanned.
+    kpi_db.session.query(IoKpiDailyORM).update({"updated_at": now - timedelta(minutes=5)})
+    kpi_db.session.commit()
+    await refresh_rollups(kpi_db, kinds=("kpi",), full=True, rescan_seconds=60)
+    assert await refresh_rollups(kpi_db, kinds=("kpi",), rescan_seconds=60) == {"series": 0, "rows": 0}
+
+
+@pytest.mark.asyncio
+async def test_summaries_fall_back_to_raw_rows_newer_than_the_rollup(kpi_db, monkeypatch):
+    today = date.today()
+    _add_kpi(kpi_db, today - timedelta(days=1), 10.0, "a", datetime.now(timezone.utc) - timedelta(hours=1))
+    await refresh_rollups(kpi_db, kinds=("kpi",))
+    assert await fetch_rollup_window(kpi_db, "kpi", "org", "revenue", today - timedelta(days=14), today) is not None
+
+    # Loaded after the refresh: the rollup no longer covers the series.
+    _add_kpi(kpi_db, today, 25.0, "a", datetime.now(timezone.utc))
+    assert await fetch_rollup_window(kpi_db, "kpi", "org", "revenue", today - timedelta(days=14), today) is None
+    _rollups_enabled(monkeypatch, True)
+    summary = await insightops.get_kpi_summary(db=kpi_db, org_id="org", metric_key="revenue", lookback_days=14)
+    assert (summary.latest_value, summary.previous_value) == (25.0, 10.0)
@@ -0,0 +1,107 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.app.schemas.insightops_analytics import SeriesPoint
+from src.app.services.insightops_analytics import (
+    RunningStats,
+    compute_kpi_delta,
+    compute_rolling_average,
+    default_window,
+    load_running_stats,
+    save_running_stats,
+)
+from src.app.services.insightops_anomalies import compute_engagement_anomalies, compute_kpi_anomalies
+from src.app.services.insightops_engagement import aggregate_signals, compute_engagement_health
+
+pytestmark = pytest.mark.unit
+
+
+def _series(seed: int, length: int = 30):
+    rng = random.Random(seed)
+    day = date(2024, 5, 1)
+    points = []
+    for _ in range(length):
+        day += timedelta(days=rng.choice([0, 1, 1, 1, 4]))
+        points.append(SeriesPoint(date=day, value=float(rng.choice([0, 0, 10, 40, 100, 120, 300]))))
+    return points
+
+
+def _latest_point_anomalies(seen):
+    # The full-series scan also reports gaps between earlier pairs; stats only see the last one.
+    spikes = [a for a in compute_kpi_anomalies(seen) if a["type"] != "kpi_missing_data"]
+    return spikes + [a for a in compute_kpi_anomalies(seen[-2:]) if a["type"] == "kpi_missing_data"]
+
+
+def _window(points, end, lookback_days=14):
+    start, end = default_window(end, lookback_days)
+    return [p for p in points if start <= p.date <= end]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_running_stats_match_full_window_summaries(seed):
+    points = _series(seed, length=60)
+    stats = RunningStats()
+    for index, point in enumerate(points):
+        stats.push(point.date, point.value)
+        seen = _window(points[: index + 1], point.date)
+
+        assert compute_kpi_delta([], stats=stats) == compute_kpi_delta(seen)
+        assert compute_rolling_average([], window=3, stats=stats) == compute_rolling_average(seen, window=3)
+        assert aggregate_signals([], stats=stats) == aggregate_signals(seen)
+        assert compute_engagement_health([], stats=stats) == compute_engagement_health(seen)
+        assert compute_kpi_anomalies([], stats=stats) == _latest_point_anomalies(seen)
+        assert compute_engagement_anomalies([], stats=stats) == compute_engagement_anomalies(seen)
+
+    # The series spans far more than the window, so old points were evicted.
+    last = _window(points, points[-1].date)
+    assert len(last) < len(points)
+    assert (stats.count, stats.total) == (len(last), sum(p.value for p in last))
+
+
+def test_running_stats_evict_up_to_a_later_window_start():
+    points = _series(11, length=20)
+    stats = RunningStats.from_points(points)
+    today = points[-1].date + timedelta(days=5)
+
+    assert stats.evict_before(default_window(today, 14)[0]) > 0
+    assert aggregate_signals([], stats=stats) == aggregate_signals(_window(points, today))
+    assert stats.evict_before(today + timedelta(days=1)) == len(_window(points, today))
+    assert (stats.count, stats.total, stats.latest) == (0, 0.0, None)
+
+
+def test_running_stats_guard_order_and_round_trip_json():
+    stats = RunningStats.from_points(_series(7, length=10), lookback_days=3)
+    with pytest.raises(ValueError):
+        stats.push(date(2000, 1, 1), 1.0)
+    assert RunningStats.model_validate(stats.model_dump(mode="json")) == stats
+    assert compute_kpi_delta([], stats=RunningStats()).latest_value is None
+
+
+class _CaptureSession:
+    def __init__(self, payload=None):
+        self.payload = payload
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        payload = self.payload
+        return type("Result", (), {"scalar_one_or_none": staticmethod(lambda: payload)})()
+
+
+@pytest.mark.asyncio
+async def test_running_stats_persist_per_series():
+    stats = RunningStats.from_points(_series(3, length=4))
+    db = _CaptureSession()
+    await save_running_stats(db, "kpi", "org_a", "revenue", stats)
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO io_series_stats_state" in sql
+    assert "ON CONFLICT (org_id, series_kind, series_key) DO UPDATE" in sql
+
+    restored = await load_running_stats(_CaptureSession(stats.model_dump(mode="json")), "kpi", "org_a", "revenue")
+    assert restored == stats
+    assert await load_running_stats(_CaptureSession(), "signal", "org_a", "touches") is None
+    with pytest.raises(ValueError):
+        await load_running_stats(db, "kpi", "org_a", "churn")
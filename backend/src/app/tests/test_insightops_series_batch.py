@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.database import get_db
+from src.app.main import app
+from src.app.schemas.insightops_analytics import SeriesBatchResponse, SeriesPoint, SeriesResponse
+from src.app.services.insightops_analytics import get_series_batch
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _RecordingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append((str(stmt), params))
+        return _FakeResult(self.rows)
+
+
+@pytest.fixture(autouse=True)
+def override_db_dependency():
+    async def _dummy_db():
+        class _DummySession:
+            pass
+
+        yield _DummySession()
+
+    app.dependency_overrides[get_db] = _dummy_db
+    yield
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.mark.asyncio
+async def test_series_batch_issues_one_query_and_splits_rows():
+    day = date(2024, 1, 10)
+    rows = [
+        {"kind": "kpi", "key": "revenue", "date": day, "value": 100},
+        {"kind": "kpi", "key": "revenue", "date": day + timedelta(days=1), "value": 110},
+        {"kind": "kpi", "key": "pipeline", "date": day, "value": 5},
+        {"kind": "signal", "key": "touches", "date": day, "value": 12},
+    ]
+    session = _RecordingSession(rows)
+
+    batch = await get_series_batch(
+        db=session,
+        org_id="acme",
+        metric_keys=["revenue", "pipeline", "win_rate"],
+        signal_keys=["touches"],
+        start_date="2024-01-01",
+        end_date="2024-01-14",
+    )
+
+    assert len(session.statements) == 1
+    sql, params = session.statements[0]
+    assert "UNION ALL" in sql
+    assert params["metric_keys"] == ["revenue", "pipeline", "win_rate"]
+    assert [p.value for p in batch.kpis["revenue"].points] == [100.0, 110.0]
+    assert batch.kpis["win_rate"].points == []
+    assert batch.signals["touches"].points[0].value == 12.0
+    assert batch.kpis["pipeline"].start_date == date(2024, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_series_batch_rejects_unknown_keys():
+    with pytest.raises(ValueError):
+        await get_series_batch(db=_RecordingSession([]), metric_keys=["margin"])
+
+
+def test_series_batch_endpoint(monkeypatch):
+    today = date.today()
+    captured = {}
+
+    async def fake_batch(**kwargs):
+        captured.update(kwargs)
+        series = SeriesResponse(
+            org_id=kwargs["org_id"],
+            key="revenue",
+            start_date=today,
+            end_date=today,
+            points=[SeriesPoint(date=today, value=1.0)],
+        )
+        return SeriesBatchResponse(
+            org_id=kwargs["org_id"], start_date=today, end_date=today, kpis={"revenue": series}, signals={}
+        )
+
+    monkeypatch.setattr("src.app.services.insightops_analytics.get_series_batch", fake_batch)
+
+    resp = client.get(
+        "/api/insightops/analytics/kpis/series:batch",
+        params=[("org_id", "acme"), ("metric_keys", "revenue"), ("metric_keys", "pipeline"), ("signal_keys", "touches")],
+    )
+    assert resp.status_code == 200
+    assert captured["metric_keys"] == ["revenue", "pipeline"]
+    assert captured["signal_keys"] == ["touches"]
+    assert resp.json()["kpis"]["revenue"]["points"][0]["value"] == 1.0
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from src.app.services import insightops
+from src.app.services.insightops_analytics import SeriesCache
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _CountingSession:
+    def __init__(self, rows, delay=0.0):
+        self.rows = rows
+        self.delay = delay
+        self.calls = 0
+
+    async def execute(self, stmt, params=None):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return _FakeResult(self.rows)
+
+
+def _rows():
+    start = date.today() - timedelta(days=3)
+    return [{"date": start + timedelta(days=i), "value": v} for i, v in enumerate([100.0, 102.0, 101.0, 180.0])]
+
+
+@pytest.mark.asyncio
+async def test_summary_and_anomalies_share_one_revenue_load():
+    db = _CountingSession(_rows())
+    cache = SeriesCache()
+
+    summary = await insightops.get_kpi_summary(db=db, metric_key="revenue", lookback_days=14, cache=cache)
+    anomalies = await insightops.get_anomalies(db=db, metric_key="revenue", lookback_days=14, cache=cache)
+
+    assert db.calls == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "series": 1}
+    assert summary.latest_value == 180.0
+    assert any(a.type == "kpi_spike" for a in anomalies.anomalies)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_wait_on_in_flight_load():
+    db = _CountingSession(_rows(), delay=0.01)
+    cache = SeriesCache()
+
+    first, second = await asyncio.gather(
+        insightops.get_kpi_series(db=db, metric_key="revenue", cache=cache),
+        insightops.get_kpi_series(db=db, metric_key="revenue", cache=cache),
+    )
+
+    assert db.calls == 1
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_distinct_windows_and_kinds_are_cached_separately():
+    db = _CountingSession(_rows())
+    cache = SeriesCache()
+
+    await insightops.get_kpi_series(db=db, metric_key="revenue", lookback_days=7, cache=cache)
+    await insightops.get_kpi_series(db=db, metric_key="revenue", lookback_days=14, cache=cache)
+    await insightops.get_engagement_series(db=db, signal_key="touches", lookback_days=14, cache=cache)
+
+    assert db.calls == 3
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+@pytest.mark.asyncio
+async def test_brief_inputs_load_in_one_batched_round_trip():
+    from src.app.services.insightops_executive_brief import _load_brief_inputs
+
+    batch_rows = [{"kind": "kpi", "key": "revenue", **row} for row in _rows()]
+    batch_rows += [{"kind": "signal", "key": "touches", "date": date.today(), "value": 5.0}]
+    db = _CountingSession(batch_rows)
+    cache = SeriesCache()
+
+    inputs = await _load_brief_inputs(db, "demo_org", 14, ["revenue", "pipeline", "win_rate"], "touches", cache=cache)
+
+    assert db.calls == 1
+    assert cache.stats() == {"hits": 5, "misses": 4, "series": 4}
+    assert inputs["kpi_summaries"]["revenue"].latest_value == 180.0
+    assert inputs["kpi_summaries"]["pipeline"].latest_value is None
+    assert inputs["engagement_summary"].total == 5.0
+    assert any(a.type == "kpi_spike" for a in inputs["anomalies"].anomalies)
@@ -0,0 +1,68 @@
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.database import get_db
+from src.app.main import app
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+ROWS = [
+    {"date": date(2024, 6, 1), "value": Decimal("100.5")},
+    {"date": date(2024, 6, 2), "value": Decimal("98")},
+]
+WINDOW = {"start_date": "2024-06-01", "end_date": "2024-06-02"}
+
+
+class _Session:
+    async def execute(self, stmt, params=None):
+        rows = ROWS
+        if params and "metric_keys" in params:
+            rows = [{"kind": "kpi", "key": "revenue", **row} for row in ROWS]
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: rows))
+
+
+@pytest.fixture(autouse=True)
+def fake_db():
+    async def _db():
+        yield _Session()
+
+    app.dependency_overrides[get_db] = _db
+    yield
+    app.dependency_overrides.pop(get_db, None)
+
+
+def test_columnar_series_matches_json_points():
+    json_body = client.get("/api/insightops/analytics/kpis/series", params=WINDOW).json()
+    resp = client.get("/api/insightops/analytics/kpis/series", params={**WINDOW, "format": "columnar"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["dates"] == [p["date"] for p in json_body["points"]]
+    assert body["values"] == [p["value"] for p in json_body["points"]]
+    assert (body["org_id"], body["key"], body["start_date"]) == ("demo_org", "revenue", "2024-06-01")
+
+    bad = client.get("/api/insightops/analytics/kpis/series", params={"format": "xml"})
+    assert bad.status_code == 400
+
+
+def test_batch_columnar_groups_arrays_per_key():
+    resp = client.get("/api/insightops/analytics/kpis/series:batch", params={**WINDOW, "format": "columnar"})
+    assert resp.status_code == 200
+    assert resp.json()["kpis"] == {"revenue": {"dates": ["2024-06-01", "2024-06-02"], "values": [100.5, 98.0]}}
+
+
+def test_arrow_stream_round_trips():
+    pa = pytest.importorskip("pyarrow")
+    resp = client.get("/api/insightops/analytics/engagement/series", params={**WINDOW, "format": "arrow"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(resp.content).read_all()
+    assert table.column("date").to_pylist() == [date(2024, 6, 1), date(2024, 6, 2)]
+    assert table.column("value").to_pylist() == [100.5, 98.0]
+    assert table.schema.metadata[b"key"] == b"touches"
@@ -0,0 +1,204 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+from src.app.schemas.insightops_analytics import SeriesPoint
+from src.app.services.insightops_analytics import compute_kpi_delta
+from src.app.services.insightops_anomalies import compute_engagement_anomalies, compute_kpi_anomalies
+from src.app.services.insightops_engagement import aggregate_signals, compute_engagement_health
+from src.app.services.insightops_stream import SeriesWindow, StreamBroadcaster, Subscription, sse_frame
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+TODAY = date(2024, 6, 14)
+
+
+class _RowsSession:
+    """Answers the broadcaster's changed-rows query from in-memory rows."""
+
+    def __init__(self):
+        self.rows = {"kpi": [], "signal": []}
+        self.queries = []
+        self.clock = datetime(2024, 6, 14, 12, 0, 0)
+
+    def add(self, kind, key, day, value, org_id="org_a"):
+        self.clock += timedelta(seconds=30)
+        row = {"id": uuid.uuid4(), "org_id": org_id, "key": key, "date": day, "value": value, "updated_at": self.clock}
+        self.rows[kind].append(row)
+        return row
+
+    async def execute(self, stmt, params=None):
+        kind = "kpi" if "io_kpi_daily" in str(stmt) else "signal"
+        self.queries.append((kind, dict(params)))
+        rows = [
+            row
+            for row in sorted(self.rows[kind], key=lambda r: (r["date"], str(r["id"])))
+            if row["org_id"] in params["org_ids"]
+            and row["key"] in params["keys"]
+            and row["date"] >= params["start_date"]
+            and ("since" not in params or row["updated_at"] > params["since"])
+        ]
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(all=lambda: rows))
+
+    def factory(self):
+        @asynccontextmanager
+        async def _session():
+            yield self
+
+        return _session
+
+
+def _drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_series_window_matches_full_window_rules():
+    values = [100, 104, 98, 0, 103, 97, 101, 180, 95, 40]
+    days = [TODAY - timedelta(days=offset) for offset in (13, 12, 11, 10, 9, 5, 4, 3, 1, 0)]
+    kpi, signal = SeriesWindow("kpi"), SeriesWindow("signal")
+    points = []
+    for day, value in zip(days, values):
+        points.append(SeriesPoint(date=day, value=value))
+        kpi.apply(uuid.uuid4(), day, float(value))
+        signal.apply(uuid.uuid4(), day, float(value))
+
+        assert kpi.summary() == compute_kpi_delta(points).model_dump(mode="json")
+        latest = [a for a in compute_kpi_anomalies(points) if a["date"] == day]
+        assert kpi.latest_anomalies() == [{**a, "date": a["date"].isoformat()} for a in latest]
+
+        expected = aggregate_signals(points).model_copy(update={"health_score": compute_engagement_health(points)})
+        assert signal.summary() == pytest.approx(expected.model_dump(mode="json"))
+        assert signal.latest_anomalies() == [
+            {**a, "date": a["date"].isoformat()} for a in compute_engagement_anomalies(points)
+        ]
+
+    # Eviction and in-place updates keep the running total exact.
+    first_id = str(uuid.uuid4())
+    window = SeriesWindow("signal")
+    window.apply(first_id, TODAY - timedelta(days=20), 5.0)
+    window.apply("b", TODAY, 7.0)
+    assert window.apply("b", TODAY, 7.0) is False
+    assert window.apply("b", TODAY, 9.0) is True
+    assert window.evict_before(TODAY - timedelta(days=13)) == 1
+    assert (len(window), window.total) == (1, 9.0)
+
+
+def test_series_window_averages_same_day_ratio_rows():
+    window = SeriesWindow("kpi", "win_rate")
+    window.apply("a", TODAY - timedelta(days=1), 0.5)
+    window.apply("b", TODAY, 0.2)
+    window.apply("c", TODAY, 0.4)
+    assert window.day_value(TODAY) == pytest.approx(0.3)
+    window.apply("c", TODAY, 0.6)
+    assert window.day_value(TODAY) == pytest.approx(0.4)
+    assert window.total == pytest.approx(0.9)
+    assert window.summary()["latest_value"] == pytest.approx(0.4)
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_fans_out_only_new_points():
+    db = _RowsSession()
+    for offset in range(5, 0, -1):
+        db.add("kpi", "revenue", TODAY - timedelta(days=offset), 100.0)
+    broadcaster = StreamBroadcaster(session_factory=db.factory(), poll_seconds=3600)
+
+    first = await broadcaster.subscribe("org_a", metric_keys=["revenue"], today=TODAY)
+    second = await broadcaster.subscribe("org_a", metric_keys=["revenue"], signal_keys=["touches"], today=TODAY)
+    try:
+        assert broadcaster.stats() == {"subscribers": 2, "series": 2}
+        [(event, snapshot)] = _drain(first)
+        assert event == "snapshot" and snapshot["points"] == []
+        assert snapshot["summary"]["latest_value"] == 100.0
+        assert len(_drain(second)) == 2
+
+        # First tick has no cursor yet: it re-reads the window, which changes nothing.
+        assert await broadcaster.poll_once(db, today=TODAY) == 0
+        db.add("kpi", "revenue", TODAY, 200.0)
+        db.add("kpi", "revenue", TODAY, 50.0, org_id="org_b")
+        db.queries.clear()
+        assert await broadcaster.poll_once(db, today=TODAY) == 1
+
+        # One query per kind per tick, whatever the number of dashboards.
+        assert [kind for kind, _ in db.queries] == ["kpi", "signal"]
+        assert "since" in db.queries[0][1]
+        for subscription in (first, second):
+            [(event, update)] = _drain(subscription)
+            assert event == "update"
+            assert update["points"] == [{"date": TODAY.isoformat(), "value": 200.0}]
+            assert update["summary"]["percent_delta"] == pytest.approx(100.0)
+            assert [a["type"] for a in update["anomalies"]] == ["kpi_spike"]
+
+        # Rows re-read inside the overlap window are not re-sent.
+        assert await broadcaster.poll_once(db, today=TODAY) == 0
+    finally:
+        broadcaster.unsubscribe(first)
+        broadcaster.unsubscribe(second)
+    assert broadcaster.stats() == {"subscribers": 0, "series": 0}
+
+
+class _FlakySession(_RowsSession):
+    """Fails the first `failures` queries, like a database that is briefly unreachable."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    async def execute(self, stmt, params=None):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("connection refused")
+        return await super().execute(stmt, params)
+
+
+@pytest.mark.asyncio
+async def test_failed_seeding_leaves_no_empty_window_behind():
+    db = _FlakySession(failures=1)
+    db.add("kpi", "revenue", TODAY - timedelta(days=1), 100.0)
+    broadcaster = StreamBroadcaster(session_factory=db.factory(), poll_seconds=3600)
+
+    with pytest.raises(OSError):
+        await broadcaster.subscribe("org_a", metric_keys=["revenue"], today=TODAY)
+    assert broadcaster.stats() == {"subscribers": 0, "series": 0}
+
+    # The retry seeds the window again instead of reusing an empty one.
+    subscription = await broadcaster.subscribe("org_a", metric_keys=["revenue"], today=TODAY)
+    try:
+        [(_, snapshot)] = _drain(subscription)
+        assert snapshot["summary"]["latest_value"] == 100.0
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+def test_stream_endpoint_returns_503_when_seeding_fails(monkeypatch):
+    broadcaster = StreamBroadcaster(session_factory=_FlakySession(failures=1).factory(), poll_seconds=3600)
+    monkeypatch.setattr("src.app.services.insightops_stream.stream_broadcaster", broadcaster)
+
+    resp = client.get("/api/insightops/stream", params={"org_id": "org_a", "metric_keys": "revenue"})
+    assert resp.status_code == 503
+    assert broadcaster.stats() == {"subscribers": 0, "series": 0}
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_events():
+    subscription = Subscription(org_id="org_a", series=set(), queue=asyncio.Queue(maxsize=2))
+    for index in range(3):
+        subscription.offer("update", {"n": index})
+    assert [payload["n"] for _, payload in _drain(subscription)] == [1, 2]
+    assert subscription.dropped == 1
+    assert sse_frame("update", {"n": 1}, 7) == b'id: 7\nevent: update\ndata: {"n":1}\n\n'
+
+
+def test_stream_endpoint_rejects_unknown_keys():
+    resp = client.get("/api/insightops/stream", params={"org_id": "org_a", "metric_keys": "churn"})
+    assert resp.status_code == 400
+    assert "Unsupported kpi key" in resp.json()["detail"]
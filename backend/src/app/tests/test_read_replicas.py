@@ -0,0 +1,133 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core import database
+from src.app.core.database import get_db
+from src.app.core.read_replicas import ReadReplicaRouter, mark_read_only
+from src.app.main import app
+from src.app.models.insightops import IoSeriesRollupStateORM
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+
+class _StandIn:
+    """A database stand-in: reports a lag and records which statements it served."""
+
+    def __init__(self, name, lag=0.0):
+        self.name = name
+        self.lag = lag
+        self.statements = []
+        self.info = {}
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt))
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []))
+
+    def factory(self):
+        @asynccontextmanager
+        async def _session():
+            yield self
+
+        return _session
+
+
+async def _probe(session):
+    if session.lag is None:
+        raise ConnectionError("replica down")
+    return session.lag
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _router(*stand_ins, **kwargs):
+    kwargs.setdefault("lag_probe", _probe)
+    return ReadReplicaRouter([(s.name, s.factory()) for s in stand_ins], **kwargs)
+
+
+async def _pick(router):
+    async with router.session() as session:
+        return session.name if session is not None else "primary"
+
+
+@pytest.mark.asyncio
+async def test_round_robin_skips_lagging_replicas_and_falls_back_to_primary():
+    a, b = _StandIn("a"), _StandIn("b", lag=60.0)
+    clock = _Clock()
+    router = _router(a, b, max_lag_seconds=10, lag_check_seconds=5, clock=clock)
+
+    assert [await _pick(router) for _ in range(3)] == ["a", "a", "a"]
+
+    b.lag = 1.0
+    clock.now = 2.0  # lag is cached between checks
+    assert await _pick(router) == "a"
+    clock.now = 6.0
+    assert sorted([await _pick(router) for _ in range(4)]) == ["a", "a", "b", "b"]
+
+    a.lag, b.lag = 30.0, None
+    clock.now = 12.0
+    assert await _pick(router) == "primary"
+    stats = router.stats()
+    assert stats["primary_fallbacks"] == 1
+    assert [(r["name"], r["healthy"], r["lag_seconds"]) for r in stats["replicas"]] == [
+        ("a", False, 30.0),
+        ("b", False, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_least_connections_prefers_idle_replica():
+    a, b = _StandIn("a"), _StandIn("b")
+    router = _router(a, b, strategy="least_connections")
+    async with router.session() as held:
+        assert held.name == "a" and held.info["read_only"] is True
+        assert await _pick(router) == "b"
+    assert await _pick(router) == "a"
+
+    with pytest.raises(ValueError):
+        _router(a, strategy="random")
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_refuses_to_flush():
+    session = mark_read_only(AsyncSession())
+    session.add(IoSeriesRollupStateORM(org_id="o", series_kind="kpi", series_key="revenue"))
+    with pytest.raises(RuntimeError, match="read-only"):
+        await session.flush()
+    await session.close()
+
+
+def test_read_endpoints_use_replica_and_writes_stay_on_primary(monkeypatch):
+    primary, replica = _StandIn("primary"), _StandIn("replica")
+    monkeypatch.setattr(database, "read_router", _router(replica))
+
+    opened = []
+
+    async def _db():
+        opened.append(primary)
+        yield primary
+
+    app.dependency_overrides[get_db] = _db
+    try:
+        resp = client.get("/api/insightops/kpis", params={"org_id": "org_a"})
+        assert resp.status_code == 200
+        assert replica.statements and not primary.statements
+        assert opened == []  # no primary session when a replica serves the read
+
+        replica.lag = 999.0
+        database.read_router.targets[0].checked_at = None
+        resp = client.get("/api/insightops/kpis", params={"org_id": "org_a"})
+        assert resp.status_code == 200 and len(primary.statements) == 1
+        assert opened == [primary]
+    finally:
+        app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,118 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.pool import StaticPool
+
+from src.app.main import app
+from src.app.models.marketing import CampaignORM
+from src.app.models.sales import SaleORM
+from src.app.routers import analytics
+from src.app.services.sales_aggregates import AggregatesCache, fetch_sales_aggregates
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+
+class _SqliteSession:
+    """Runs statements on an in-memory SQLite connection and counts round trips."""
+
+    def __init__(self, connection, delay=0.0):
+        self.connection = connection
+        self.delay = delay
+        self.round_trips = 0
+
+    async def execute(self, stmt, params=None):
+        self.round_trips += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.connection.execute(stmt, params or {})
+
+
+@pytest.fixture
+def sqlite_session():
+    # The TestClient serves requests from another thread.
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    tables = [SaleORM.__table__, CampaignORM.__table__]
+    SaleORM.metadata.create_all(engine, tables=tables)
+    with engine.connect() as connection:
+        yield _SqliteSession(connection)
+    engine.dispose()
+
+
+def _seed(session, days=9):
+    first = date(2025, 3, 1)
+    sales = []
+    for i in range(days):
+        sales.append({"product_id": "p1", "date": first + timedelta(days=i), "units_sold": 1, "revenue": 10.0 * (i + 1)})
+        sales.append({"product_id": "p2", "date": first + timedelta(days=i), "units_sold": 1, "revenue": 1.0})
+    session.connection.execute(insert(SaleORM), sales)
+    session.connection.execute(
+        insert(CampaignORM),
+        [{"campaign_name": "a", "channel": "search", "roi": 2.0}, {"campaign_name": "b", "channel": "social", "roi": 4.0}],
+    )
+
+
+@pytest.mark.asyncio
+async def test_single_statement_returns_totals_recent_days_and_roi(sqlite_session):
+    empty = await fetch_sales_aggregates(sqlite_session)
+    assert (empty.total_revenue, empty.orders_count, empty.avg_roi, empty.by_day) == (0.0, 0, 0.0, [])
+
+    _seed(sqlite_session)
+    sqlite_session.round_trips = 0
+    aggregates = await fetch_sales_aggregates(sqlite_session)
+    assert sqlite_session.round_trips == 1
+    assert aggregates.total_revenue == pytest.approx(sum(10.0 * (i + 1) + 1.0 for i in range(9)))
+    assert aggregates.orders_count == 18 and aggregates.avg_roi == pytest.approx(3.0)
+    assert [p.date for p in aggregates.by_day] == [date(2025, 3, 1) + timedelta(days=i) for i in range(2, 9)]
+    assert aggregates.by_day[0].sales == pytest.approx(31.0)
+    assert aggregates.revenue_growth_pct == pytest.approx((91.0 - 31.0) / 31.0 * 100.0)
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_coalesces_and_respects_invalidation(sqlite_session):
+    _seed(sqlite_session, days=2)
+    now = [0.0]
+    cache = AggregatesCache(ttl_seconds=10, clock=lambda: now[0])
+
+    sqlite_session.delay = 0.01
+    results = await asyncio.gather(*(cache.get(sqlite_session) for _ in range(5)))
+    assert sqlite_session.round_trips == 1 and len({r.total_revenue for r in results}) == 1
+
+    now[0] = 5.0
+    await cache.get(sqlite_session)
+    assert sqlite_session.round_trips == 1
+    now[0] = 11.0
+    await cache.get(sqlite_session)
+    assert sqlite_session.round_trips == 2
+
+    # A write landing while a load runs keeps that (possibly stale) load out of the cache.
+    cache.invalidate()
+    load = asyncio.create_task(cache.get(sqlite_session))
+    await asyncio.sleep(0)
+    cache.invalidate()
+    await load
+    assert cache.stats()["entries"] == 0
+
+
+def test_aggregate_endpoints_share_one_cached_query(sqlite_session, monkeypatch):
+    _seed(sqlite_session)
+    monkeypatch.setattr(analytics, "sales_aggregates_cache", AggregatesCache(ttl_seconds=30))
+
+    async def _db():
+        yield sqlite_session
+
+    app.dependency_overrides[analytics.get_db_optional] = _db
+    try:
+        body = client.get("/api/analytics/aggregate").json()
+        assert body["orders_count"] == 18 and body["avg_roi"] == pytest.approx(3.0)
+        assert body["revenue_by_day"][-1] == {"date": "2025-03-09", "sales": 91.0}
+
+        overview = client.get("/api/analytics/").json()
+        assert overview["total_sales"] == body["total_revenue"]
+        assert overview["avg_order_value"] == pytest.approx(body["total_revenue"] / 18)
+        assert sqlite_session.round_trips == 1
+    finally:
+        app.dependency_overrides.pop(analytics.get_db_optional, None)
@@ -0,0 +1,179 @@
+import re
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from src.app.core.database import get_db
+from src.app.main import app
+from src.app.services import sales_partitioning
+from src.app.services.sales_partitioning import backfill_sales_dates, swap_sales_tables
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+
+class _Result:
+    def __init__(self, rows=(), scalar=None, rowcount=0):
+        self.rows = list(rows)
+        self._scalar = scalar
+        self.rowcount = rowcount
+
+    def all(self):
+        return self.rows
+
+    def scalar(self):
+        return self._scalar
+
+    def scalars(self):
+        return SimpleNamespace(all=lambda: list(self.rows))
+
+
+class _CapturingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return _Result(self.rows)
+
+
+def _override(session):
+    async def _db():
+        yield session
+
+    app.dependency_overrides[get_db] = _db
+
+
+def test_sales_metrics_filter_on_date_bounds():
+    session = _CapturingSession([(date(2025, 3, 1), 4, 40.0), (date(2025, 3, 2), 1, 10.0)])
+    _override(session)
+    try:
+        resp = client.get("/sales/metrics", params={"start": "2025-01-01", "end": "2025-12-31"})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["filters"]["start"] == "2025-01-01"
+        assert [p["date"] for p in body["timeseries"]] == ["2025-03-01", "2025-03-02"]
+
+        compiled = session.statements[0].compile(dialect=postgresql.dialect())
+        assert "sales.date BETWEEN" in str(compiled)
+        assert {v for v in compiled.params.values() if isinstance(v, date)} == {date(2025, 1, 1), date(2025, 12, 31)}
+
+        assert client.get("/sales/metrics", params={"start": "2025-13-01"}).status_code == 400
+        assert client.get("/sales/metrics", params={"start": "2025-02-01", "end": "2025-01-01"}).status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def test_health_intel_product_window_is_typed():
+    session = _CapturingSession([(date(2025, 6, 30), 2, 5.0)])
+    _override(session)
+    try:
+        resp = client.get("/health-intel/products/metrics", params={"product_id": "p1", "start": "2025-06-01", "end": "2025-06-30"})
+        assert resp.status_code == 200
+        assert resp.json()["window"] == {"start": "2025-06-01", "end": "2025-06-30"}
+        compiled = session.statements[0].compile(dialect=postgresql.dialect())
+        assert date(2025, 6, 1) in compiled.params.values()
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def _try_date(value):
+    match = re.match(r"^\d{4}-\d{2}-\d{2}", (value or "").strip())
+    if not match:
+        return None
+    try:
+        return date.fromisoformat(match.group(0))
+    except ValueError:
+        return None
+
+
+class _BackfillSession:
+    """Plays the backfill SQL against an in-memory legacy table keyed by id."""
+
+    def __init__(self, source):
+        self.source = dict(source)
+        self.target = {}
+        self.partitions = set()
+        self.commits = 0
+        self.statements = []
+
+    def _window(self, params):
+        return [i for i in sorted(self.source) if params["after_id"] < i <= params["through_id"]]
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.statements.append(sql)
+        if stmt is sales_partitioning._TARGET_HIGH_WATER_SQL:
+            return _Result(scalar=max(self.target, default=0))
+        if stmt is sales_partitioning._SOURCE_MAX_ID_SQL:
+            return _Result(scalar=max(self.source, default=0))
+        if stmt is sales_partitioning._CHUNK_END_SQL:
+            ids = [i for i in sorted(self.source) if i > params["after_id"]][: params["chunk_size"]]
+            return _Result(scalar=ids[-1] if ids else None)
+        if stmt is sales_partitioning._CHUNK_MONTHS_SQL:
+            dates = [_try_date(self.source[i]) for i in self._window(params)]
+            return _Result({d.replace(day=1) for d in dates if d})
+        if stmt is sales_partitioning._ENSURE_PARTITIONS_SQL:
+            created = params["from_month"] not in self.partitions
+            self.partitions.add(params["from_month"])
+            return _Result(scalar=int(created))
+        if stmt is sales_partitioning._COPY_CHUNK_SQL:
+            copied = 0
+            for i in self._window(params):
+                parsed = _try_date(self.source[i])
+                if parsed and i not in self.target:
+                    assert parsed.replace(day=1) in self.partitions
+                    self.target[i] = parsed
+                    copied += 1
+            return _Result(rowcount=copied)
+        if stmt is sales_partitioning._CHUNK_REJECTS_SQL:
+            return _Result([i for i in self._window(params) if _try_date(self.source[i]) is None])
+        if stmt is sales_partitioning._REJECT_COUNT_SQL:
+            return _Result(scalar=sum(_try_date(v) is None for v in self.source.values()))
+        return _Result()
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_backfill_copies_in_chunks_and_resumes():
+    source = {1: "2025-01-05", 2: "2025-01-20", 3: "2025-02-01T10:00:00", 5: "not a date", 6: "2025-02-30", 7: "2025-03-03"}
+    session = _BackfillSession(source)
+
+    first = await backfill_sales_dates(session, chunk_size=2, max_chunks=2)
+    assert (first["chunks"], first["copied"], first["last_id"]) == (2, 3, 5)
+    assert first["rejected"] == 1 and first["reject_sample_ids"] == [5]
+    assert session.commits == 2
+
+    second = await backfill_sales_dates(session, chunk_size=2)
+    assert second["resumed_after_id"] == 3  # the rejected id 5 is re-checked, not skipped
+    assert second["copied"] == 1 and second["rejected"] == 2 and second["remaining"] == 0
+    assert session.target == {1: date(2025, 1, 5), 2: date(2025, 1, 20), 3: date(2025, 2, 1), 7: date(2025, 3, 3)}
+    assert session.partitions == {date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)}
+
+    with pytest.raises(ValueError):
+        await backfill_sales_dates(session, chunk_size=0)
+
+
+@pytest.mark.asyncio
+async def test_swap_refuses_rejects_unless_allowed():
+    session = _BackfillSession({1: "2025-01-05", 2: "bad"})
+    with pytest.raises(ValueError, match="unparseable"):
+        await swap_sales_tables(session)
+    assert not any("RENAME" in sql for sql in session.statements)
+
+    session.source[3] = "2025-04-01"
+    result = await swap_sales_tables(session, allow_rejects=True)
+    assert result["swapped"] and result["rejected"] == 1
+    assert session.target[3] == date(2025, 4, 1)
+    lock_at = next(i for i, sql in enumerate(session.statements) if sql.startswith("LOCK TABLE sales"))
+    rename_at = next(i for i, sql in enumerate(session.statements) if "RENAME TO sales_legacy" in sql)
+    assert lock_at < rename_at
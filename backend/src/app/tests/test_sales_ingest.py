@@ -0,0 +1,238 @@
+import io
+import threading
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.app.models.sales import SaleORM, SalesIngestManifestORM
+from src.app.services import sales_ingest
+from src.app.services.sales_ingest import ingest_sales_file, upsert_sales_rows
+
+pytestmark = pytest.mark.unit
+
+
+class _SqliteSession:
+    """Async facade over a sync ORM session on in-memory SQLite; counts commits."""
+
+    def __init__(self, session):
+        self.session = session
+        self.commits = 0
+
+    def get_bind(self):
+        return self.session.get_bind()
+
+    async def execute(self, stmt, params=None):
+        return self.session.execute(stmt, params)
+
+    async def commit(self):
+        self.commits += 1
+        self.session.commit()
+
+
+@pytest.fixture
+def sales_db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SaleORM.metadata.create_all(engine, tables=[SaleORM.__table__, SalesIngestManifestORM.__table__])
+    with Session(engine) as session:
+        yield _SqliteSession(session)
+    engine.dispose()
+
+
+def _csv(rows):
+    lines = ["product_id,date,region,units_sold,revenue,profit_margin"] + rows
+    return io.BytesIO("\n".join(lines).encode())
+
+
+@pytest.mark.asyncio
+async def test_csv_streams_in_committed_chunks_and_samples_rejects(sales_db):
+    good = [f"p{i},2025-01-{i % 28 + 1:02d},EU,{i},{i * 1.5},0.2" for i in range(23)]
+    bad = ["p,2025-02-30,EU,1,1,", ",2025-01-01,EU,1,1,", "p,2025-01-01,EU,1.5,1,", "p,2025-01-01,EU,1,abc,"]
+    report = await ingest_sales_file(sales_db, _csv(good[:10] + bad + good[10:]), "extract.CSV", chunk_rows=5)
+
+    assert report.loader == "executemany"
+    assert (report.rows_read, report.inserted, report.rejected, report.chunks) == (27, 23, 4, 6)
+    assert [(e.row, e.error) for e in report.errors] == [
+        (11, "date must be YYYY-MM-DD"),
+        (12, "product_id is required"),
+        (13, "units_sold must be an integer"),
+        (14, "revenue must be a number"),
+    ]
+    assert sales_db.commits == 6
+    assert report.summary()["rows_per_second"] >= 0
+
+    session = sales_db.session
+    assert session.scalar(select(func.count()).select_from(SaleORM)) == 23
+    last = session.scalars(select(SaleORM).order_by(SaleORM.id.desc())).first()
+    assert (last.product_id, last.date, last.units_sold, last.revenue) == ("p22", date(2025, 1, 23), 22, 33.0)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_defaults_missing_numbers_and_caps_error_samples(sales_db, monkeypatch):
+    monkeypatch.setattr(sales_ingest, "ERROR_SAMPLE_LIMIT", 3)
+    lines = [b'{"product_id": "a", "date": "2025-03-01", "region": null, "units_sold": 2, "revenue": 9.5}']
+    lines += [b'{"product_id": "b", "date": "March 1"}'] * 5
+    lines += [b'{"product_id": 7, "date": "2025-03-02"}']
+    report = await ingest_sales_file(sales_db, io.BytesIO(b"\n".join(lines)), "extract.ndjson", chunk_rows=2)
+
+    assert (report.inserted, report.rejected, len(report.errors)) == (2, 5, 3)
+    rows = sales_db.session.execute(select(SaleORM.product_id, SaleORM.region, SaleORM.units_sold, SaleORM.revenue)).all()
+    assert rows == [("a", None, 2, 9.5), ("7", None, 0, 0.0)]
+
+
+@pytest.mark.asyncio
+async def test_postgres_loads_through_copy():
+    copied = []
+
+    class _Driver:
+        async def copy_records_to_table(self, table, records, columns):
+            copied.append((table, list(records), columns))
+
+    class _Connection:
+        async def get_raw_connection(self):
+            return SimpleNamespace(driver_connection=_Driver())
+
+    class _PgSession:
+        commits = 0
+
+        def get_bind(self):
+            return SimpleNamespace(dialect=SimpleNamespace(name="postgresql", driver="asyncpg"))
+
+        async def connection(self):
+            return _Connection()
+
+        async def commit(self):
+            self.commits += 1
+
+    session = _PgSession()
+    report = await ingest_sales_file(session, _csv(["p1,2025-01-02,NA,3,10.5,", "p2,2025-01-03,,1,2,0.1"]), "x.csv")
+    assert report.loader == "copy" and report.inserted == 2 and session.commits == 1
+    assert copied == [
+        (
+            "sales",
+            [("p1", date(2025, 1, 2), "NA", 3, 10.5, None), ("p2", date(2025, 1, 3), None, 1, 2.0, 0.1)],
+            ["product_id", "date", "region", "units_sold", "revenue", "profit_margin"],
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unsupported_and_malformed_files_raise_value_error(sales_db):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        await ingest_sales_file(sales_db, io.BytesIO(b""), "extract.xlsx")
+    with pytest.raises(ValueError, match="after row 2"):
+        await ingest_sales_file(sales_db, io.BytesIO(b'{"product_id": "a", "date": "2025-01-01"}\n' * 2 + b"{oops\n"), "x.jsonl", chunk_rows=2)
+    assert sales_db.commits == 1
+
+
+def _sales(session):
+    return session.execute(
+        select(SaleORM.id, SaleORM.product_id, SaleORM.region, SaleORM.units_sold, SaleORM.revenue).order_by(SaleORM.id)
+    ).all()
+
+
+@pytest.mark.asyncio
+async def test_natural_key_upsert_reruns_only_touch_changed_rows(sales_db):
+    rows = [f"p{i},2025-04-0{i + 1},{'EU' if i % 2 else ''},{i},{i}.5," for i in range(6)]
+    first = await ingest_sales_file(sales_db, _csv(rows), "extract.csv", chunk_rows=4, upsert="natural")
+    assert (first.loader, first.inserted, first.skipped) == ("upsert", 6, 0)
+    before = _sales(sales_db.session)
+
+    rerun = await ingest_sales_file(sales_db, _csv(rows), "extract.csv", chunk_rows=4, upsert="natural")
+    assert (rerun.inserted, rerun.unchanged, rerun.skipped) == (0, 0, 6)
+    assert _sales(sales_db.session) == before
+
+    rows[1] = "p1,2025-04-02,EU,1,99.0,"  # changed measure: updated in place
+    rows.append("p9,2025-04-09,,1,1,")
+    changed = await ingest_sales_file(sales_db, _csv(rows), "extract.csv", chunk_rows=4, upsert="natural")
+    assert (changed.inserted, changed.unchanged, changed.skipped) == (2, 0, 5)
+    after = _sales(sales_db.session)
+    assert len(after) == 7 and after[1] == (before[1][0], "p1", "EU", 1, 99.0)
+
+    # Same rows from another file miss the manifest but match what is stored.
+    other = await ingest_sales_file(sales_db, _csv(rows), "other.csv", upsert="natural")
+    assert (other.inserted, other.unchanged, other.skipped) == (0, 7, 0)
+    assert sales_db.session.scalar(select(func.count()).select_from(SalesIngestManifestORM)) == 7 + 7  # one per key
+
+
+@pytest.mark.asyncio
+async def test_natural_key_rerun_restores_reverted_values(sales_db):
+    runs = []
+    for revenue in (10, 20, 10):
+        report = await ingest_sales_file(sales_db, _csv([f"p1,2025-04-01,EU,1,{revenue},"]), "nightly.csv", upsert="natural")
+        runs.append((report.inserted, report.skipped))
+        assert [r.revenue for r in _sales(sales_db.session)] == [revenue]
+    assert runs == [(1, 0), (1, 0), (1, 0)]
+
+    rerun = await ingest_sales_file(sales_db, _csv(["p1,2025-04-01,EU,1,10,"]), "nightly.csv", upsert="natural")
+    assert (rerun.inserted, rerun.skipped) == (0, 1)
+    assert sales_db.session.scalar(select(func.count()).select_from(SalesIngestManifestORM)) == 1
+
+
+@pytest.mark.asyncio
+async def test_validation_and_hashing_run_off_the_event_loop(sales_db, monkeypatch):
+    threads = {"validate": set(), "hash": set()}
+    validate, row_hash = sales_ingest.validate_sales_frame, sales_ingest.sales_row_hash
+
+    def tracked_validate(*args, **kwargs):
+        threads["validate"].add(threading.get_ident())
+        return validate(*args, **kwargs)
+
+    def tracked_hash(values):
+        threads["hash"].add(threading.get_ident())
+        return row_hash(values)
+
+    monkeypatch.setattr(sales_ingest, "validate_sales_frame", tracked_validate)
+    monkeypatch.setattr(sales_ingest, "sales_row_hash", tracked_hash)
+    rows = [f"p{i},2025-04-0{i + 1},EU,{i},{i}.5," for i in range(5)]
+    report = await ingest_sales_file(sales_db, _csv(rows), "extract.csv", chunk_rows=2, upsert="natural")
+
+    assert report.inserted == 5
+    assert threads["validate"] and threads["hash"]
+    assert threading.get_ident() not in threads["validate"] | threads["hash"]
+
+
+@pytest.mark.asyncio
+async def test_content_key_upsert_and_in_chunk_duplicates(sales_db):
+    rows = ["a,2025-05-01,EU,1,1.0,", "a,2025-05-01,EU,1,1.0,", "a,2025-05-01,EU,2,2.0,"]
+    report = await ingest_sales_file(sales_db, _csv(rows), "x.csv", upsert="content")
+    assert (report.inserted, report.skipped) == (2, 1)
+
+    natural = await ingest_sales_file(sales_db, _csv(["b,2025-05-01,,1,1,", "b,2025-05-01,,3,3,"]), "y.csv", upsert="natural")
+    assert (natural.inserted, natural.skipped) == (1, 1)
+    assert [(r.product_id, r.units_sold) for r in _sales(sales_db.session)] == [("a", 1), ("a", 2), ("b", 3)]
+
+    with pytest.raises(ValueError, match="upsert must be one of"):
+        await ingest_sales_file(sales_db, _csv(rows), "x.csv", upsert="fuzzy")
+
+
+@pytest.mark.asyncio
+async def test_postgres_upsert_statement():
+    statements = []
+
+    class _Result:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def all(self):
+            return self.rows
+
+    class _PgSession:
+        def get_bind(self):
+            return SimpleNamespace(dialect=postgresql.dialect())
+
+        async def execute(self, stmt, params=None):
+            statements.append(stmt)
+            return _Result([(1,)] if len(statements) > 1 else [])  # empty manifest, one row written
+
+    written = await upsert_sales_rows(_PgSession(), [("p1", date(2025, 1, 2), None, 3, 10.5, None)], "natural", "x.csv")
+    assert written == (1, 0, 0)
+    sql = str(statements[1].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (dedup_key, date) DO UPDATE" in sql
+    assert "IS DISTINCT FROM" in sql and "RETURNING sales.id" in sql
+    manifest_sql = str(statements[2].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (source, dedup_key) DO UPDATE SET row_hash = excluded.row_hash" in manifest_sql
@@ -0,0 +1,132 @@
+import asyncio
+import io
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.app.models.sales import SaleORM
+from src.app.services.sales_ingest_jobs import IngestJobQueue
+
+pytestmark = pytest.mark.unit
+
+
+class _SqliteSession:
+    """Async facade over a sync ORM session on in-memory SQLite; runs a hook on each commit."""
+
+    def __init__(self, session):
+        self.session = session
+        self.on_commit = lambda: None
+
+    def get_bind(self):
+        return self.session.get_bind()
+
+    async def execute(self, stmt, params=None):
+        return self.session.execute(stmt, params)
+
+    async def commit(self):
+        self.session.commit()
+        self.on_commit()
+
+    def factory(self):
+        @asynccontextmanager
+        async def _session():
+            yield self
+
+        return _session
+
+
+@pytest.fixture
+def sales_db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SaleORM.metadata.create_all(engine, tables=[SaleORM.__table__])
+    with Session(engine) as session:
+        yield _SqliteSession(session)
+    engine.dispose()
+
+
+# Workers are tasks on the loop that creates them; keep the fixture on the tests' loop
+# whatever asyncio_default_fixture_loop_scope says, so teardown can cancel them.
+@pytest_asyncio.fixture(loop_scope="function")
+async def jobs(sales_db, tmp_path):
+    queue = IngestJobQueue(session_factory=sales_db.factory(), spool_dir=str(tmp_path), chunk_rows=4)
+    yield queue
+    await queue.close()
+
+
+def _csv(n):
+    lines = ["product_id,date,region,units_sold,revenue"] + [f"p{i},2025-02-{i % 28 + 1:02d},EU,{i},1.5" for i in range(n)]
+    return io.BytesIO("\n".join(lines).encode())
+
+
+@pytest.mark.asyncio
+async def test_spooled_job_reports_progress_then_completes(jobs, sales_db, tmp_path):
+    snapshots = []
+    job = await jobs.spool(_csv(10), "extract.csv")
+    assert job.status == "queued" and job.bytes_total > 0
+    assert len(os.listdir(tmp_path)) == 1
+    sales_db.on_commit = lambda: snapshots.append(jobs.get(job.id).model_copy())
+
+    await jobs.join()
+    # Each snapshot is taken at commit time, before the chunk's counts are recorded.
+    assert [(s.status, s.rows_processed) for s in snapshots] == [("running", 0), ("running", 4), ("running", 8)]
+
+    done = jobs.get(job.id)
+    assert done.status == "succeeded" and done.error is None
+    assert (done.rows_processed, done.inserted, done.chunks) == (10, 10, 3)
+    assert done.bytes_read == done.bytes_total and done.eta_seconds == 0.0
+    assert done.started_at <= done.finished_at
+    assert os.listdir(tmp_path) == []
+    assert sales_db.session.scalar(select(func.count()).select_from(SaleORM)) == 10
+
+
+@pytest.mark.asyncio
+async def test_failed_job_keeps_committed_chunks_and_the_error(jobs, sales_db, tmp_path):
+    good = b'{"product_id": "a", "date": "2025-01-01"}\n' * 4
+    job = await jobs.spool(io.BytesIO(good + b"{broken\n"), "extract.jsonl")
+    await jobs.join()
+
+    failed = jobs.get(job.id)
+    assert failed.status == "failed" and "after row 4" in failed.error
+    assert failed.inserted == 4 and failed.finished_at is not None
+    assert os.listdir(tmp_path) == []
+
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        await jobs.spool(io.BytesIO(b"x"), "extract.xlsx")
+    assert os.listdir(tmp_path) == [] and jobs.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_jobs_queue_behind_a_single_worker(jobs):
+    first = await jobs.spool(_csv(3), "a.csv")
+    second = await jobs.spool(_csv(5), "b.csv")
+    assert jobs.get(second.id).status == "queued"
+    await jobs.join()
+    assert [jobs.get(j.id).inserted for j in (first, second)] == [3, 5]
+    assert jobs.get(first.id).finished_at <= jobs.get(second.id).started_at
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_workers_and_deletes_unstarted_spool_files(sales_db, tmp_path):
+    gate = asyncio.Event()
+
+    @asynccontextmanager
+    async def _blocked_session():
+        await gate.wait()  # the running job holds here until it is cancelled
+        yield sales_db
+
+    queue = IngestJobQueue(session_factory=_blocked_session, spool_dir=str(tmp_path))
+    running = await queue.spool(_csv(3), "a.csv")
+    pending = await queue.spool(_csv(5), "b.csv")
+    await asyncio.sleep(0)
+    assert queue.get(running.id).status == "running" and queue.get(pending.id).status == "queued"
+
+    await queue.close()
+    for job in (running, pending):
+        closed = queue.get(job.id)
+        assert (closed.status, closed.error) == ("failed", "Cancelled") and closed.finished_at is not None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,132 @@
+import json
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.app.core.database import get_db, get_read_session_factory
+from src.app.main import app
+from src.app.models.sales import SaleORM
+from src.app.services import sales_pagination
+from src.app.services.sales_pagination import decode_sales_cursor, encode_sales_cursor
+
+pytestmark = pytest.mark.unit
+client = TestClient(app)
+
+
+class _SqliteSession:
+    """Async facade over a sync ORM session on in-memory SQLite; counts queries and opened sessions."""
+
+    def __init__(self, session):
+        self.session = session
+        self.queries = 0
+        self.opened = 0
+
+    async def execute(self, stmt, params=None):
+        self.queries += 1
+        return self.session.execute(stmt, params or {})
+
+    def factory(self):
+        @asynccontextmanager
+        async def _session():
+            self.opened += 1
+            yield self
+
+        return _session
+
+
+@pytest.fixture
+def sales_db():
+    # The TestClient serves requests from another thread.
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SaleORM.metadata.create_all(engine, tables=[SaleORM.__table__])
+    first = date(2025, 1, 1)
+    with Session(engine) as session:
+        # Three sales per day so pages split inside a date.
+        session.execute(
+            insert(SaleORM),
+            [
+                {"product_id": f"p{i % 3}", "date": first + timedelta(days=i // 3), "region": "NA" if i % 2 else "EU",
+                 "units_sold": 1, "revenue": float(i)}
+                for i in range(25)
+            ],
+        )
+        session.commit()
+        facade = _SqliteSession(session)
+
+        async def _db():
+            yield facade
+
+        app.dependency_overrides[get_db] = _db
+        app.dependency_overrides[get_read_session_factory] = facade.factory
+        try:
+            yield facade
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_session_factory, None)
+    engine.dispose()
+
+
+def _pages(path, params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        resp = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert resp.status_code == 200
+        ids += [row["id"] for row in resp.json()]
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_round_trip_and_validation():
+    token = encode_sales_cursor(date(2025, 3, 9), 42)
+    assert "|" not in token and decode_sales_cursor(token) == (date(2025, 3, 9), 42)
+    with pytest.raises(ValueError):
+        decode_sales_cursor("not-a-cursor")
+
+
+def test_api_sales_pages_newest_first_without_gaps(sales_db):
+    ids, pages = _pages("/api/sales/", {"limit": 10})
+    expected = [r.id for r in sales_db.session.query(SaleORM).order_by(SaleORM.date.desc(), SaleORM.id.desc())]
+    assert ids == expected and pages == 3
+
+    assert client.get("/api/sales/", params={"cursor": "bogus"}).status_code == 400
+    assert client.get("/api/sales/", params={"cursor": encode_sales_cursor(date(2025, 1, 5), 14), "offset": 5}).status_code == 400
+
+
+def test_sales_metrics_listing_pages_oldest_first(sales_db):
+    ids, _ = _pages("/sales", {"start": "2025-01-01", "end": "2025-01-31", "region": "NA", "limit": 4})
+    expected = [
+        r.id
+        for r in sales_db.session.query(SaleORM).filter(SaleORM.region == "NA").order_by(SaleORM.date, SaleORM.id)
+    ]
+    assert ids == expected
+
+
+def test_ndjson_export_walks_keyset_pages(sales_db, monkeypatch):
+    monkeypatch.setattr(sales_pagination, "NDJSON_CHUNK_ROWS", 10)
+
+    resp = client.get("/api/sales/export")
+    assert resp.status_code == 200  # routed before /{sale_id}
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["id"] for r in records] == list(range(1, 26))
+    assert records[0] == {
+        "id": 1, "product_id": "p0", "date": "2025-01-01", "region": "EU", "units_sold": 1, "revenue": 0.0, "profit_margin": None,
+    }
+    assert sales_db.queries == 3 and sales_db.opened == 3  # one short session per page
+
+    since = client.get("/api/sales/export", params={"start_date": "2025-01-05", "region": "EU"})
+    expected = [
+        r.id
+        for r in sales_db.session.query(SaleORM)
+        .filter(SaleORM.date >= date(2025, 1, 5), SaleORM.region == "EU")
+        .order_by(SaleORM.date, SaleORM.id)
+    ]
+    assert [json.loads(line)["id"] for line in since.text.splitlines()] == expected and len(expected) == 7
+    assert client.get("/api/sales/export", params={"cursor": "bogus"}).status_code == 400
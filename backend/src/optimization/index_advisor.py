@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from .db_query_tuner import _to_session, analyze_query_latency
+from ..app.services.insightops_analytics.db import (
+    KPI_BATCH_SELECT_SQL,
+    KPI_SERIES_SQL,
+    SIGNAL_SERIES_SQL,
+)
+from ..app.services.insightops_analytics.rollups import ROLLUP_WINDOW_SQL
+
+QueryShape = Tuple[str, Dict[str, Any]]
+
+_SCAN_NODE_TYPES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def _expand_in(sql: str, name: str, values: List[Any]) -> QueryShape:
+    """Inline an expanding `IN :name` bind as individual binds so raw-SQL EXPLAIN can run it."""
+    binds = {f"{name}_{i}": value for i, value in enumerate(values)}
+    placeholders = ", ".join(f":{bind}" for bind in binds)
+    return sql.replace(f"IN :{name}", f"IN ({placeholders})"), binds
+
+
+def insightops_query_shapes(org_id: str = "demo_org", window_days: int = 14) -> Dict[str, QueryShape]:
+    """The InsightOps hot read paths with representative bind values."""
+    end = date.today()
+    window = {"org_id": org_id, "start_date": end - timedelta(days=window_days), "end_date": end}
+    batch_sql, batch_binds = _expand_in(KPI_BATCH_SELECT_SQL, "metric_keys", ["revenue", "pipeline", "win_rate"])
+    return {
+        "kpi_series": (KPI_SERIES_SQL, {**window, "metric_key": "revenue"}),
+        "signal_series": (SIGNAL_SERIES_SQL, {**window, "signal_key": "touches"}),
+        "kpi_series_batch": (batch_sql, {**window, **batch_binds}),
+        "rollup_window": (ROLLUP_WINDOW_SQL, {**window, "kind": "kpi", "key": "revenue"}),
+    }
+
+
+def explain_query(
+    engine_or_session: Any, sql: str, *, params: Optional[Dict[str, Any]] = None, analyze: bool = False
+) -> Dict[str, Any]:
+    """Return the top-level Postgres plan node from `EXPLAIN (FORMAT JSON)`.
+
+    `analyze=True` executes the statement (EXPLAIN ANALYZE); only use it on read queries.
+    """
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    stmt = text(f"EXPLAIN ({options}) {sql}")
+    sess, eng = _to_session(engine_or_session)
+    if sess is not None:
+        raw = sess.execute(stmt, params or {}).scalar()
+    else:
+        assert eng is not None
+        with eng.connect() as conn:
+            raw = conn.execute(stmt, params or {}).scalar()
+    document = json.loads(raw) if isinstance(raw, str) else raw
+    return document[0]["Plan"]
+
+
+def iter_plan_nodes(plan: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Depth-first walk over a plan node and its children."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def find_seq_scans(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Sequential scans in a plan, with the relation, filter and planner row estimate."""
+    return [
+        {
+            "relation": node.get("Relation Name"),
+            "filter": node.get("Filter"),
+            "plan_rows": node.get("Plan Rows"),
+            "total_cost": node.get("Total Cost"),
+        }
+        for node in iter_plan_nodes(plan)
+        if node.get("Node Type") == "Seq Scan"
+    ]
+
+
+def find_index_usage(plan: Dict[str, Any]) -> List[str]:
+    """Names of indexes the plan reads from."""
+    return [
+        node["Index Name"]
+        for node in iter_plan_nodes(plan)
+        if node.get("Node Type") in _SCAN_NODE_TYPES and node.get("Index Name")
+    ]
+
+
+def advise_indexes(
+    engine_or_session: Any,
+    shapes: Optional[Dict[str, QueryShape]] = None,
+    *,
+    samples: int = 3,
+    analyze: bool = False,
+) -> List[Dict[str, Any]]:
+    """EXPLAIN each query shape, flag sequential scans and attach measured latency.
+
+    Each entry reports the shape name, `ok` (no sequential scans), the scans found, the
+    indexes used and `analyze_query_latency` stats. Defaults to the InsightOps shapes.
+    On small tables the planner prefers sequential scans anyway; judge on realistic volumes.
+    """
+    report: List[Dict[str, Any]] = []
+    for name, (sql, params) in (shapes or insightops_query_shapes()).items():
+        plan = explain_query(engine_or_session, sql, params=params, analyze=analyze)
+        seq_scans = find_seq_scans(plan)
+        report.append(
+            {
+                "query": name,
+                "ok": not seq_scans,
+                "seq_scans": seq_scans,
+                "indexes": find_index_usage(plan),
+                "latency": analyze_query_latency(engine_or_session, sql, params=params, samples=samples),
+            }
+        )
+    return report
@@ -0,0 +1,5 @@
+import { proxyGet } from "../../../_proxy";
+
+export async function GET(req: Request) {
+  return proxyGet("/api/insightops/analytics/kpis/breakdown", req);
+}